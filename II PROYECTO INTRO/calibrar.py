@@ -0,0 +1,184 @@
+# calibrar.py
+
+import argparse
+import itertools
+import os
+import time
+from multiprocessing import Pool
+import numpy as np
+from laberinto import generar_mapa, construir_grilla
+from motor import EstadoJuego, dificultades, movimientos_accion
+from rutas import CampoDistancias
+
+# Objetivo:
+#   Calibrar las dificultades jugando miles de partidas sin ventana.
+#   Se barren combinaciones de modo, cantidad de enemigos, ticks entre
+#   movimientos, límite de trampas y tamaño de mapa; cada combinación
+#   (preset) se juega con las mismas semillas, así las diferencias entre
+#   presets no son suerte del mapa. Cada partida es una tarea
+#   independiente del pool de procesos: solo viajan la tarea y cuatro
+#   números de vuelta, por eso escala con la cantidad de núcleos.
+#   Ejemplo:
+#     python calibrar.py --enemigos 2,3,4 --velocidades 12,8,4 --partidas 500
+# Restricciones:
+#   Sin pygame. Los jugadores son bots (ver BotJugador), no personas:
+#   sirven para comparar presets entre sí, no como tasa de victoria real.
+
+# Acción de movimiento para cada desplazamiento (df, dc)
+accion_movimiento = {desplazamiento: accion for accion, desplazamiento in movimientos_accion.items()}
+
+
+class BotJugador:
+    """
+    Objetivo:
+        Jugador automático que decide una acción cada cierta cantidad
+        de ticks (como alguien que presiona teclas).
+        - "ruta": en escapa baja por el campo de distancias hacia la
+          salida; en cazador persigue al enemigo más cercano. Pone una
+          trampa si hay enemigos cerca. Con probabilidad error hace un
+          movimiento al azar.
+        - "azar": solo movimientos y trampas al azar.
+    Entrada: estado - EstadoJuego, tipo - "ruta" o "azar",
+             cada - ticks entre acciones, error - probabilidad de fallar
+    """
+    def __init__(self, estado, tipo="ruta", cada=6, error=0.2):
+        self.estado = estado
+        self.tipo = tipo
+        self.cada = cada
+        self.error = error
+        # Azar propio del bot, derivado de la semilla de la partida
+        self.rng = np.random.default_rng([estado.semilla, 1])
+        self.campo = CampoDistancias(estado.grilla.paso_jugador)
+
+    def acciones(self):
+        """Retorna la lista de acciones para el próximo tick."""
+        estado = self.estado
+        if (estado.ticks + 1) % self.cada:
+            return []
+        if self.tipo == "azar" or self.rng.random() < self.error:
+            return [self.accion_azar()]
+
+        jugador = estado.jugador
+        if estado.trampas.disponibles() and estado.enemigos.contar_cerca(jugador.fila, jugador.col, 1).sum():
+            return ["trampa"]
+        if estado.modo == "escapa":
+            objetivo = estado.salida
+        else:
+            objetivo = self.enemigo_cercano()
+            if objetivo is None:
+                return []
+        paso = self.campo.siguiente_paso(jugador, objetivo)
+        if paso is None:
+            return [self.accion_azar()]
+        return [accion_movimiento[(paso[0] - jugador.fila, paso[1] - jugador.col)]]
+
+    def accion_azar(self):
+        """Un movimiento al azar, o a veces una trampa."""
+        opciones = list(movimientos_accion) + ["trampa"]
+        return opciones[self.rng.integers(len(opciones))]
+
+    def enemigo_cercano(self):
+        """Celda del enemigo más cercano al jugador (distancia Manhattan)."""
+        enemigos = self.estado.enemigos
+        if not len(enemigos.fila):
+            return None
+        jugador = self.estado.jugador
+        distancias = np.abs(enemigos.fila - jugador.fila) + np.abs(enemigos.col - jugador.col)
+        indice = int(np.argmin(distancias))
+        return int(enemigos.fila[indice]), int(enemigos.col[indice])
+
+
+def jugar_partida(tarea):
+    """
+    Objetivo:
+        Jugar una partida completa con un bot (corre en un proceso del pool).
+    Entrada: tarea - (preset, semilla, bot, max_ticks); preset es
+             (modo, enemigos, velocidad, trampas, tamaño)
+    Salida: (preset, resultado, puntuacion, ticks); resultado es
+            "victoria", "derrota" o "tiempo" si llegó a max_ticks
+    """
+    preset, semilla, bot, max_ticks = tarea
+    modo, cantidad, velocidad, limite_trampas, tamaño = preset
+    grilla = construir_grilla(generar_mapa(tamaño, tamaño, semilla))
+    estado = EstadoJuego(grilla, modo, cantidad, velocidad, semilla=semilla, limite_trampas=limite_trampas)
+    jugador = BotJugador(estado, bot)
+    while not estado.terminado() and estado.ticks < max_ticks:
+        estado.paso(jugador.acciones())
+    return preset, estado.resultado or "tiempo", estado.puntuacion, estado.ticks
+
+
+def nombre_preset(preset):
+    """Nombre de la dificultad si el preset coincide con una, o cadena vacía."""
+    _, cantidad, velocidad, _, _ = preset
+    for nombre, valores in dificultades.items():
+        if valores == (cantidad, velocidad):
+            return nombre
+    return ""
+
+
+def resumir(preset, resultados):
+    """
+    Objetivo:
+        Una línea del reporte: tasas de resultado y distribución de puntos.
+    Entrada: resultados - lista de (resultado, puntuacion, ticks)
+    """
+    total = len(resultados)
+    puntos = np.array([puntuacion for _, puntuacion, _ in resultados])
+    ticks = np.array([t for _, _, t in resultados])
+    tasas = [sum(r == resultado for r, _, _ in resultados) / total
+             for resultado in ("victoria", "derrota", "tiempo")]
+    p10, p50, p90 = np.percentile(puntos, [10, 50, 90])
+    modo, cantidad, velocidad, trampas, tamaño = preset
+    return (f"{modo:8}{nombre_preset(preset):>8}{cantidad:>5}{velocidad:>5}{trampas:>5}{tamaño:>6}"
+            f"{total:>7}{tasas[0]:>7.0%}{tasas[1]:>7.0%}{tasas[2]:>7.0%}"
+            f"{puntos.mean():>8.0f}{puntos.std():>7.0f}{p10:>7.0f}{p50:>7.0f}{p90:>7.0f}{ticks.mean():>8.0f}")
+
+
+def lista_enteros(texto):
+    """Convierte "2,3,4" en [2, 3, 4] (para argparse)."""
+    return [int(parte) for parte in texto.split(",")]
+
+
+def leer_argumentos():
+    """Opciones de línea de comandos del barrido."""
+    parser = argparse.ArgumentParser(description="Calibrar dificultades con partidas simuladas")
+    parser.add_argument("--modos", type=lambda texto: texto.split(","), default=["escapa", "cazador"])
+    parser.add_argument("--enemigos", type=lista_enteros, default=[2, 3, 4])
+    parser.add_argument("--velocidades", type=lista_enteros, default=[12, 8, 4],
+                        help="ticks entre movimientos de los enemigos")
+    parser.add_argument("--trampas", type=lista_enteros, default=[3], help="límites de trampas")
+    parser.add_argument("--tamaños", type=lista_enteros, default=[15], help="lados del mapa")
+    parser.add_argument("--partidas", type=int, default=200, help="partidas por preset")
+    parser.add_argument("--bot", choices=["ruta", "azar"], default="ruta")
+    parser.add_argument("--max-ticks", type=int, default=30 * 300, help="tope por partida (5 min)")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de la primera partida")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count())
+    return parser.parse_args()
+
+
+def main():
+    argumentos = leer_argumentos()
+    presets = list(itertools.product(argumentos.modos, argumentos.enemigos, argumentos.velocidades,
+                                     argumentos.trampas, argumentos.tamaños))
+    # Las mismas semillas para todos los presets
+    tareas = [(preset, argumentos.semilla + i, argumentos.bot, argumentos.max_ticks)
+              for preset in presets for i in range(argumentos.partidas)]
+
+    inicio = time.perf_counter()
+    resultados = {preset: [] for preset in presets}
+    # Tareas en bloques para que el costo de enviarlas no domine
+    bloque = max(1, len(tareas) // (argumentos.procesos * 8))
+    with Pool(argumentos.procesos) as pool:
+        for preset, resultado, puntuacion, ticks in pool.imap_unordered(jugar_partida, tareas, bloque):
+            resultados[preset].append((resultado, puntuacion, ticks))
+    duracion = time.perf_counter() - inicio
+
+    print(f"{'modo':8}{'nivel':>8}{'enem':>5}{'vel':>5}{'tram':>5}{'mapa':>6}{'n':>7}"
+          f"{'gana':>7}{'pierde':>7}{'tiempo':>7}{'media':>8}{'desv':>7}{'p10':>7}{'p50':>7}{'p90':>7}{'ticks':>8}")
+    for preset in presets:
+        print(resumir(preset, resultados[preset]))
+    print(f"{len(tareas)} partidas en {duracion:.1f} s con {argumentos.procesos} procesos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# camara.py
+
+# Objetivo:
+#   Definir qué parte del mapa se ve en la ventana.
+#   La cámara trabaja en celdas (no en píxeles) y sigue al jugador,
+#   así el costo de dibujar depende del tamaño de la pantalla y no
+#   del tamaño del mapa.
+# Restricciones:
+#   La vista nunca se sale de los bordes del mapa.
+
+
+class Camara:
+    """
+    Objetivo:
+        Guardar la celda superior-izquierda visible y el tamaño de la vista.
+    """
+    def __init__(self, filas_mapa, columnas_mapa, filas_vista, columnas_vista, tam_tile, margen=4):
+        self.filas_mapa = filas_mapa
+        self.columnas_mapa = columnas_mapa
+
+        # La vista no puede ser más grande que el mapa
+        self.filas_vista = min(filas_vista, filas_mapa)
+        self.columnas_vista = min(columnas_vista, columnas_mapa)
+        self.tam_tile = tam_tile
+
+        # Tamaño de la vista en píxeles
+        self.ancho = self.columnas_vista * tam_tile
+        self.alto = self.filas_vista * tam_tile
+
+        # Celdas libres entre el jugador y el borde antes de desplazar
+        self.margen = margen
+
+        # Primera celda visible
+        self.fila0 = 0
+        self.col0 = 0
+
+    def ajustar_eje(self, inicio, pos, vista, total):
+        """Mueve el inicio de un eje para dejar pos dentro del margen."""
+        margen = min(self.margen, (vista - 1) // 2)
+        if pos < inicio + margen:
+            inicio = pos - margen
+        elif pos > inicio + vista - 1 - margen:
+            inicio = pos - vista + 1 + margen
+        return max(0, min(inicio, total - vista))
+
+    def seguir(self, fila, col):
+        """
+        Objetivo:
+            Desplazar la vista para que la celda siga visible.
+        Salida: True si la vista cambió (hay que redibujar el fondo)
+        """
+        nueva_fila0 = self.ajustar_eje(self.fila0, fila, self.filas_vista, self.filas_mapa)
+        nueva_col0 = self.ajustar_eje(self.col0, col, self.columnas_vista, self.columnas_mapa)
+        cambio = nueva_fila0 != self.fila0 or nueva_col0 != self.col0
+        self.fila0 = nueva_fila0
+        self.col0 = nueva_col0
+        return cambio
+
+    def centrar(self, fila, col):
+        """Coloca la celda lo más al centro posible de la vista."""
+        self.fila0 = max(0, min(fila - self.filas_vista // 2, self.filas_mapa - self.filas_vista))
+        self.col0 = max(0, min(col - self.columnas_vista // 2, self.columnas_mapa - self.columnas_vista))
+
+    def visible(self, fila, col):
+        """Retorna True si la celda está dentro de la vista."""
+        return (self.fila0 <= fila < self.fila0 + self.filas_vista
+                and self.col0 <= col < self.col0 + self.columnas_vista)
+
+    def a_pantalla(self, fila, col):
+        """Convierte una celda del mapa a coordenadas (x, y) en píxeles."""
+        return (col - self.col0) * self.tam_tile, (fila - self.fila0) * self.tam_tile
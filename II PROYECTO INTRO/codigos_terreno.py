@@ -0,0 +1,22 @@
+# codigos_terreno.py
+
+import numpy as np
+
+# Objetivo:
+#   Códigos numéricos de los terrenos y sus tablas de paso, sin nada de
+#   pygame, para que la lógica del juego (laberinto, conectividad, motor)
+#   se pueda usar sin pantalla. Se importan de aquí, también desde el
+#   código que dibuja.
+
+# Códigos numéricos de cada terreno (los que usa generar_mapa)
+codigo_camino = 0
+codigo_muro = 1
+codigo_liana = 2
+codigo_tunel = 3
+
+# Tablas indexadas por código de terreno.
+# Con ellas una matriz uint8 de códigos se traduce en una sola
+# operación a máscaras booleanas de paso: tabla[celdas]
+nombres_por_codigo = ("camino", "muro", "liana", "tunel")
+paso_jugador_por_codigo = np.array([True, False, False, True])
+paso_enemigo_por_codigo = np.array([True, False, True, False])
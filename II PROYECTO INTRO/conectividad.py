@@ -0,0 +1,234 @@
+# conectividad.py
+
+from collections import deque
+import numpy as np
+from codigos_terreno import (codigo_camino, codigo_muro, codigo_liana, codigo_tunel,
+                             paso_jugador_por_codigo, paso_enemigo_por_codigo)
+
+# Objetivo:
+#   Revisar que un mapa generado se pueda jugar: que el jugador llegue
+#   a la salida y que los túneles y lianas formen regiones alcanzables.
+#   Todo se hace en tiempo lineal y sin recursión de Python:
+#   - alcanzables: BFS desde una celda con cada fila guardada como un
+#     entero de Python (bit c = columna c). Un paso de la cola procesa
+#     una fila entera a la vez: llena los tramos de las celdas nuevas con
+#     aritmética de bits y baja o sube las nuevas a las filas vecinas.
+#     Cada celda entra una sola vez. Es lo que usa revisar_mapa.
+#   - etiquetar_componentes: todas las regiones, con union-find sobre
+#     los tramos (celdas seguidas de una fila). test_conectividad.py lo
+#     usa para revisar que revisar_mapa deje una sola región.
+# Restricciones:
+#   La conexión es en 4 direcciones (sin diagonales), igual que el movimiento.
+
+# Byte con los bits al revés, para invertir filas con bytes.translate
+tabla_reversa = bytes(int(f"{byte:08b}"[::-1], 2) for byte in range(256))
+
+# Reparación de revisar_mapa: código nuevo según
+# [código, llega el jugador, llegan los enemigos]
+reparacion = np.empty((len(paso_jugador_por_codigo), 2, 2), dtype=np.uint8)
+reparacion[:] = np.arange(len(paso_jugador_por_codigo), dtype=np.uint8)[:, None, None]
+reparacion[codigo_tunel, 0, :] = codigo_muro
+reparacion[codigo_liana, :, 0] = codigo_muro
+reparacion[codigo_camino, 0, 0] = codigo_muro
+reparacion[codigo_camino, 1, 0] = codigo_tunel
+reparacion[codigo_camino, 0, 1] = codigo_liana
+
+
+class FilasBits:
+    """
+    Objetivo:
+        Máscara booleana 2D guardada como un entero por fila, también
+        con los bits al revés: la aritmética solo propaga acarreos hacia
+        los bits altos, así que para llenar hacia la izquierda se usa la
+        fila invertida.
+    Entrada: filas, invertidas - listas de enteros, ancho_bytes - bytes
+             por fila, columnas - ancho de la máscara
+    """
+    def __init__(self, filas, invertidas, ancho_bytes, columnas):
+        self.filas = filas
+        self.invertidas = invertidas
+        self.ancho_bytes = ancho_bytes
+        self.columnas = columnas
+
+    def unir(self, otra):
+        """Retorna las celdas de las dos máscaras (OR por fila)."""
+        return FilasBits([a | b for a, b in zip(self.filas, otra.filas)],
+                         [a | b for a, b in zip(self.invertidas, otra.invertidas)],
+                         self.ancho_bytes, self.columnas)
+
+    def invertir(self, bits):
+        """Invierte el orden de los bits de una fila."""
+        return int.from_bytes(bits.to_bytes(self.ancho_bytes, "little").translate(tabla_reversa), "big")
+
+    def llenar_tramos(self, fila, semillas):
+        """
+        Objetivo:
+            Extender las semillas a los tramos completos que las contienen.
+            Sumar las semillas a la fila acarrea cada una hasta el final de
+            su tramo; lo que cambió (XOR) es el tramo desde la semilla.
+        Entrada: semillas - bits de la fila (deben estar en la máscara)
+        """
+        mascara = self.filas[fila]
+        derecha = (((mascara + semillas) ^ mascara) & mascara) | semillas
+        invertida = self.invertidas[fila]
+        semillas_inv = self.invertir(semillas)
+        izquierda = (((invertida + semillas_inv) ^ invertida) & invertida) | semillas_inv
+        return derecha | self.invertir(izquierda)
+
+
+def mascara_codigos(celdas, permitidos):
+    """Celdas cuyo código tiene True en la tabla permitidos (una comparación por código)."""
+    mascara = np.zeros(celdas.shape, dtype=bool)
+    for codigo in np.flatnonzero(permitidos):
+        mascara |= celdas == codigo
+    return mascara
+
+
+def filas_bits(mascara):
+    """Convierte un arreglo booleano 2D en FilasBits."""
+    filas_mascara, columnas = mascara.shape
+    ancho_bytes = (columnas + 7) // 8
+    datos = np.packbits(mascara, axis=1, bitorder="little").tobytes()
+    invertidos = datos.translate(tabla_reversa)
+    filas = []
+    invertidas = []
+    for inicio in range(0, filas_mascara * ancho_bytes, ancho_bytes):
+        filas.append(int.from_bytes(datos[inicio:inicio + ancho_bytes], "little"))
+        invertidas.append(int.from_bytes(invertidos[inicio:inicio + ancho_bytes], "big"))
+    return FilasBits(filas, invertidas, ancho_bytes, columnas)
+
+
+def alcanzables(mascara, inicio):
+    """
+    Objetivo:
+        Celdas a las que se llega desde inicio (BFS por filas).
+    Entrada: mascara - FilasBits, inicio - (fila, col)
+    Salida: arreglo booleano 2D (todo False si inicio está bloqueado)
+    Restricciones:
+        Cada celda se agrega una vez; un paso cuesta una operación sobre
+        la fila entera, que en un pasillo vertical es de una sola celda.
+    """
+    filas = mascara.filas
+    cantidad = len(filas)
+    alcanzado = [0] * cantidad
+    fila0, col0 = inicio
+    if (filas[fila0] >> col0) & 1:
+        alcanzado[fila0] = mascara.llenar_tramos(fila0, 1 << col0)
+        pendientes = {fila0: alcanzado[fila0]}  # Celdas nuevas de cada fila en la cola
+        cola = deque([fila0])
+        while cola:
+            fila = cola.popleft()
+            nuevas = pendientes.pop(fila)
+            for vecina in (fila - 1, fila + 1):
+                if not 0 <= vecina < cantidad:
+                    continue
+                libres = filas[vecina] & ~alcanzado[vecina]
+                semillas = nuevas & libres
+                if not semillas:
+                    continue
+                # Solo hace falta llenar si al lado de las semillas quedan celdas libres
+                if ((semillas << 1) | (semillas >> 1)) & libres & ~semillas:
+                    semillas = mascara.llenar_tramos(vecina, semillas) & libres
+                alcanzado[vecina] |= semillas
+                if vecina in pendientes:
+                    pendientes[vecina] |= semillas
+                else:
+                    pendientes[vecina] = semillas
+                    cola.append(vecina)
+
+    ancho_bytes = mascara.ancho_bytes
+    datos = b"".join(bits.to_bytes(ancho_bytes, "little") for bits in alcanzado)
+    empacado = np.frombuffer(datos, dtype=np.uint8).reshape(cantidad, ancho_bytes)
+    return np.unpackbits(empacado, axis=1, count=mascara.columnas, bitorder="little").view(bool)
+
+
+def etiquetar_componentes(mascara):
+    """
+    Objetivo:
+        Etiquetar las regiones conectadas de celdas transitables.
+    Entrada: mascara - arreglo booleano 2D (True = se puede pasar)
+    Salida: (etiquetas, tamaños)
+        etiquetas - arreglo int32 con 0 en celdas bloqueadas y 1..k en
+                    las transitables (misma etiqueta = misma región)
+        tamaños - arreglo con la cantidad de celdas de cada etiqueta
+                  (tamaños[0] = 0)
+    """
+    mascara = np.asarray(mascara, dtype=bool)
+
+    # 1. Tramos: celdas transitables seguidas en una misma fila.
+    #    Ya están conectadas entre sí, así que se trabaja por tramo.
+    inicio = mascara.copy()
+    inicio[:, 1:] &= ~mascara[:, :-1]
+    tramo = (np.cumsum(inicio.ravel(), dtype=np.int32) - 1).reshape(mascara.shape)
+    total = int(tramo[-1, -1]) + 1 if mascara.size else 0
+
+    # 2. Uniones verticales entre tramos, una por par: la celda abre un
+    #    par nuevo si empieza la unión o empieza alguno de los dos tramos
+    vertical = mascara[:-1, :] & mascara[1:, :]
+    nuevo = vertical.copy()
+    nuevo[:, 1:] &= ~vertical[:, :-1] | inicio[:-1, 1:] | inicio[1:, 1:]
+    a = tramo[:-1, :][nuevo].tolist()
+    b = tramo[1:, :][nuevo].tolist()
+
+    # 3. Union-find con compresión a la mitad (tiempo casi lineal, sin recursión)
+    padre = list(range(total))
+    for x, y in zip(a, b):
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        while padre[y] != y:
+            padre[y] = padre[padre[y]]
+            y = padre[y]
+        if x < y:
+            padre[y] = x
+        elif y < x:
+            padre[x] = y
+    # Las raíces son siempre el tramo menor: en orden, cada padre ya es raíz
+    for x in range(total):
+        padre[x] = padre[padre[x]]
+
+    # 4. Numerar las raíces 1..k en orden y contar sus celdas
+    raiz_celda = np.array(padre, dtype=np.int32)[tramo[mascara]]
+    por_raiz = np.bincount(raiz_celda, minlength=total)
+    es_raiz = por_raiz > 0
+    numero = np.cumsum(es_raiz, dtype=np.int32)
+    etiquetas = np.zeros(mascara.shape, dtype=np.int32)
+    etiquetas[mascara] = numero[raiz_celda]
+    tamaños = np.concatenate([[0], por_raiz[es_raiz]])
+    return etiquetas, tamaños
+
+
+def revisar_mapa(celdas, inicio, salida):
+    """
+    Objetivo:
+        Validar y reparar un mapa recién generado.
+        Se rechaza si el jugador no puede ir del inicio a la salida.
+        Si se acepta, se quitan las regiones que nadie puede usar para
+        que toda celda transitable esté conectada con el inicio:
+        - túneles fuera de la región del jugador -> muro
+        - lianas fuera de la región de los enemigos -> muro
+        - caminos fuera de las dos regiones -> muro; si solo uno de los
+          dos llega, pasa a túnel (jugador) o liana (enemigos)
+    Entrada: celdas - arreglo uint8 (se modifica), inicio/salida - (fila, col)
+    Salida: True si el mapa es jugable (ya reparado), False si hay que rechazarlo
+    Restricciones:
+        Las dos máscaras salen de las mismas filas de bits: los terrenos
+        que pisan los dos (camino) se convierten una sola vez.
+    """
+    comun = filas_bits(mascara_codigos(celdas, paso_jugador_por_codigo & paso_enemigo_por_codigo))
+    paso_jugador = comun.unir(filas_bits(
+        mascara_codigos(celdas, paso_jugador_por_codigo & ~paso_enemigo_por_codigo)))
+    llega_j = alcanzables(paso_jugador, inicio)
+    if not llega_j[salida]:
+        return False
+
+    paso_enemigo = comun.unir(filas_bits(
+        mascara_codigos(celdas, paso_enemigo_por_codigo & ~paso_jugador_por_codigo)))
+    llega_e = alcanzables(paso_enemigo, inicio)
+
+    # Toda la reparación en una sola pasada por la tabla
+    indice = celdas << 2
+    indice |= llega_j.view(np.uint8) << 1
+    indice |= llega_e.view(np.uint8)
+    np.take(reparacion.ravel(), indice, out=celdas)
+    return True
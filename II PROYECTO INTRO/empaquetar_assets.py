@@ -0,0 +1,93 @@
+# empaquetar_assets.py
+
+import argparse
+import os
+import struct
+import pygame
+from recursos import (archivo_paquete, firma_paquete, version_paquete, formato_cabecera_paquete,
+                      formato_ruta_paquete, formato_entrada_paquete, clave_ruta, crc_archivo)
+from terrenos import ruta_imagen
+from codigos_terreno import nombres_por_codigo
+from mapa import tam_tile
+
+# Objetivo:
+#   Paso de build de los assets: decodificar los JPEG una sola vez, aquí,
+#   escalarlos al tamaño del tile y guardar los píxeles RGBA crudos en un
+#   solo archivo con índice (formato en recursos.py). Al arrancar, el
+#   juego mapea ese archivo y crea las superficies sin decodificar nada.
+#     python empaquetar_assets.py
+#   El paquete es un archivo generado y no va en git. main.py lo arma solo
+#   si falta o si le falta alguna imagen (un JPEG cuyo contenido cambió
+#   cuenta como faltante); este script sirve para armarlo a mano, por
+#   ejemplo en otros tamaños.
+# Restricciones:
+#   Se ejecuta desde cualquier carpeta: trabaja junto a este archivo.
+#   Escala con pygame.transform.scale, igual que recursos.obtener_escalada,
+#   para que los píxeles sean los mismos con o sin paquete.
+
+# Imágenes que el juego dibuja del tamaño del tile
+imagenes_tile = [os.path.join("assets", nombre)
+                 for nombre in ("jugador.jpeg", "enemigo.jpeg", "trampa.jpeg", "salida.jpeg")]
+imagenes_tile += [ruta_imagen(f"{nombre}.jpeg") for nombre in nombres_por_codigo]
+
+
+def empaquetar(rutas, tamaños, nombre_archivo=archivo_paquete):
+    """
+    Objetivo:
+        Escribir el paquete con cada imagen en cada tamaño pedido.
+    Entrada: rutas - JPEG de origen, tamaños - lados en píxeles,
+             nombre_archivo - paquete de salida
+    Salida: cantidad de bytes escritos
+    Restricciones:
+        Se escribe a un archivo temporal y se reemplaza al final: un
+        juego que arranca a la vez nunca ve un paquete a medias.
+    """
+    entradas = []  # (ruta, ancho, alto, CRC-32 del JPEG, píxeles)
+    for ruta in rutas:
+        imagen = pygame.image.load(ruta)
+        crc = crc_archivo(ruta)
+        for lado in tamaños:
+            escalada = pygame.transform.scale(imagen, (lado, lado))
+            pixeles = pygame.image.tobytes(escalada, "RGBA")
+            entradas.append((clave_ruta(ruta), lado, lado, crc, pixeles))
+
+    # Primero el tamaño del índice, para saber dónde empiezan los píxeles
+    tam_indice = struct.calcsize(formato_cabecera_paquete)
+    for ruta, _, _, _, _ in entradas:
+        tam_indice += (struct.calcsize(formato_ruta_paquete) + len(ruta.encode("utf-8"))
+                       + struct.calcsize(formato_entrada_paquete))
+
+    indice = bytearray(struct.pack(formato_cabecera_paquete, firma_paquete, version_paquete, len(entradas)))
+    desplazamiento = tam_indice
+    for ruta, ancho, alto, crc, pixeles in entradas:
+        ruta_bytes = ruta.encode("utf-8")
+        indice += struct.pack(formato_ruta_paquete, len(ruta_bytes)) + ruta_bytes
+        indice += struct.pack(formato_entrada_paquete, ancho, alto, crc, desplazamiento, len(pixeles))
+        desplazamiento += len(pixeles)
+
+    temporal = nombre_archivo + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(indice)
+        for *_, pixeles in entradas:
+            archivo.write(pixeles)
+    os.replace(temporal, nombre_archivo)
+    return desplazamiento
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Armar el paquete de imágenes pre-escaladas")
+    parser.add_argument("--tamaños", type=lambda texto: [int(parte) for parte in texto.split(",")],
+                        default=[tam_tile], help="lados en píxeles, separados por coma")
+    parser.add_argument("--salida", default=None, help=f"archivo del paquete (por defecto {archivo_paquete})")
+    argumentos = parser.parse_args()
+    salida = os.path.abspath(argumentos.salida) if argumentos.salida else None
+
+    # Las imágenes se buscan en assets/ junto a este archivo
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    tamaño = empaquetar(imagenes_tile, argumentos.tamaños, salida or archivo_paquete)
+    print(f"{len(imagenes_tile) * len(argumentos.tamaños)} imágenes, {tamaño} bytes en "
+          f"{salida or archivo_paquete}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,224 +1,206 @@
 # enemigo.py 
 
-import pygame
-import os
-import random
-from mapa import tam_tile
+import numpy as np
 
-class Enemigo:
+class EnemigoPool:
     """
-    # Objetivo: Representar un enemigo que se mueve en el mapa
-    # Entrada: fila_inicial, col_inicial - posición de inicio
-    # Salida: Objeto Enemigo con sprite y comportamiento
-    # Restricciones: No puede pasar por terrenos bloqueados
+    # Objetivo: Guardar todos los enemigos como arreglos de NumPy (posición,
+    #   contador y velocidad de cada uno) y moverlos a todos en un solo paso
+    # Entrada: filas_inicio, cols_inicio - posiciones de inicio de cada enemigo
+    #          velocidad_movimiento - frames entre movimientos
+    #          rng - generador de NumPy (opcional)
+    #          indice - IndiceOcupacion opcional (ocupacion.py) que se mantiene al día
+    # Salida: Objeto EnemigoPool
+    # Restricciones: Al perseguir 70% movimiento inteligente y 30% aleatorio;
+    #   al huir se aleja del objetivo. Solo lógica, los sprites los dibuja vista.py
     """
-    
-    def __init__(self, fila_inicial, col_inicial):
-        """
-        # Objetivo: Inicializar el enemigo con posición y sprite
-        # Entrada: fila_inicial, col_inicial - coordenadas de inicio
-        # Salida: None (crea objeto Enemigo)
-        # Restricciones: Posición debe estar dentro del mapa
-        """
-        # Posición inicial en el mapa
-        self.fila = fila_inicial
-        self.col = col_inicial
-        
-        # Velocidad de movimiento 
-        self.velocidad = 1
-
-        # Contador para controlar velocidad de movimiento
-        self.contador_movimiento = 0
-        self.velocidad_movimiento = 10  # Se mueve cada 10 frames 
-
-        # Cargar y escalar sprite del enemigo
-        ruta = os.path.join("assets", "enemigo.jpeg")  # Ruta de la imagen
-        self.sprite = pygame.image.load(ruta)  # Cargar imagen
-        self.sprite = pygame.transform.scale(self.sprite, (tam_tile, tam_tile))  # Ajustar tamaño
-
-    def puede_mover(self, nueva_fila, nueva_col, mapa_objetos):
-        """
-        # Objetivo: Verificar si el enemigo puede moverse a una posición
-        # Entrada: 
-        #   nueva_fila, nueva_col - coordenadas destino
-        #   mapa_objetos - matriz con objetos de terreno
-        # Salida: True si puede moverse, False si no
-        # Restricciones: No puede salir del mapa ni pasar terrenos bloqueados
-        """
-        # Verificar límites del mapa (no salirse)
-        if nueva_fila < 0 or nueva_fila >= len(mapa_objetos):
-            return False  # Fuera del mapa en filas
-        if nueva_col < 0 or nueva_col >= len(mapa_objetos):
-            return False  # Fuera del mapa en columnas
-        
-        # Obtener celda destino y verificar si permite enemigos
-        celda = mapa_objetos[nueva_fila][nueva_col]
-        return celda.permitir_enemigo()  # True si puede pasar
-
-    def obtener_movimientos_posibles(self, mapa_objetos):
-        """
-        # Objetivo: Obtener todas las direcciones posibles para moverse
-        # Entrada: mapa_objetos - matriz del mapa
-        # Salida: movimientos - lista de tuplas (df, dc) posibles
-        # Restricciones: Solo direcciones cardinales (no diagonales)
-        """
-        movimientos = []  # Lista para almacenar movimientos válidos
-        
-        # Definir las 4 direcciones posibles
-        direcciones = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # arriba, abajo, izquierda, derecha
-        
-        # Verificar cada dirección
-        for direccion in direcciones:
-            df, dc = direccion  # Desplazamiento en fila y columna
-            nueva_fila = self.fila + df  # Calcular nueva fila
-            nueva_col = self.col + dc    # Calcular nueva columna
-            
-            # Si puede moverse a esa posición, agregar a lista
-            if self.puede_mover(nueva_fila, nueva_col, mapa_objetos):
-                movimientos.append((df, dc))
-        
-        return movimientos  # Devolver movimientos posibles
-
-    def deberia_mover(self):
-        """
-        # Objetivo: Controlar la velocidad de movimiento del enemigo
+
+    # Las 4 direcciones: arriba, abajo, izquierda, derecha
+    df = np.array([-1, 1, 0, 0], dtype=np.int32)
+    dc = np.array([0, 0, -1, 1], dtype=np.int32)
+
+    def __init__(self, filas_inicio, cols_inicio, velocidad_movimiento=10, rng=None, indice=None):
+        """
+        # Objetivo: Crear los arreglos de todos los enemigos
+        # Entrada: filas_inicio, cols_inicio - secuencias del mismo largo
+        # Salida: None (crea objeto EnemigoPool)
+        # Restricciones: Las posiciones deben ser transitables para enemigos
+        """
+        self.fila = np.array(filas_inicio, dtype=np.int32)
+        self.col = np.array(cols_inicio, dtype=np.int32)
+        self.contador_movimiento = np.zeros(len(self.fila), dtype=np.int32)
+        self.velocidad_movimiento = np.full(len(self.fila), velocidad_movimiento, dtype=np.int32)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        # Índice de ocupación: el id de cada enemigo es su posición en los arreglos
+        self.indice = indice
+        if indice is not None:
+            indice.agregar_varios(np.arange(len(self.fila)), self.fila, self.col)
+
+    def __len__(self):
+        return len(self.fila)
+
+    def deberian_mover(self):
+        """
+        # Objetivo: Avanzar el contador de todos y ver quiénes se mueven
         # Entrada: None
-        # Salida: True si debe moverse en este frame, False si no
-        # Restricciones: Usa contador de frames para ralentizar movimiento
+        # Salida: arreglo con los índices de los enemigos que se mueven
+        # Restricciones: Cada enemigo se mueve una vez cada velocidad_movimiento ticks
         """
-        self.contador_movimiento += 1  # Incrementar contador cada frame
-        
-        # Solo moverse cuando el contador alcanza la velocidad definida
-        if self.contador_movimiento >= self.velocidad_movimiento:
-            self.contador_movimiento = 0  # Reiniciar contador
-            return True  # Puede moverse
-        return False  # No moverse en este frame
+        self.contador_movimiento += 1
+        mueven = self.contador_movimiento >= self.velocidad_movimiento
+        self.contador_movimiento[mueven] = 0
+        return np.flatnonzero(mueven)
+
+    def candidatos(self, indices, grilla):
+        """
+        # Objetivo: Calcular las 4 celdas vecinas de cada enemigo
+        # Entrada: indices - enemigos a mover, grilla - objeto Grilla del mapa
+        # Salida: (filas, cols, validos) - arreglos (k, 4); validos marca las
+        #   celdas dentro del mapa por las que el enemigo puede pasar
+        # Restricciones: Fuera del mapa se recortan las coordenadas para poder
+        #   indexar, pero quedan marcadas como no válidas
+        """
+        filas = self.fila[indices, None] + self.df
+        cols = self.col[indices, None] + self.dc
+        dentro = (filas >= 0) & (filas < grilla.filas) & (cols >= 0) & (cols < grilla.columnas)
+        np.clip(filas, 0, grilla.filas - 1, out=filas)
+        np.clip(cols, 0, grilla.columnas - 1, out=cols)
+        validos = dentro & grilla.paso_enemigo[filas, cols]
+        return filas, cols, validos
+
+    def aplicar(self, indices, filas, cols, eleccion, mover):
+        """
+        # Objetivo: Mover a cada enemigo a la vecina elegida
+        # Entrada: indices - enemigos, filas/cols - vecinas (k, 4),
+        #          eleccion - columna elegida por enemigo, mover - máscara de quién se mueve
+        # Salida: None (modifica las posiciones)
+        """
+        filas_mov = np.flatnonzero(mover)
+        movidos = indices[filas_mov]
+        nuevas_filas = filas[filas_mov, eleccion[filas_mov]]
+        nuevas_cols = cols[filas_mov, eleccion[filas_mov]]
+        if self.indice is not None:
+            self.indice.mover_varios(movidos, self.fila[movidos], self.col[movidos],
+                                     nuevas_filas, nuevas_cols)
+        self.fila[movidos] = nuevas_filas
+        self.col[movidos] = nuevas_cols
 
-    def mover_hacia(self, objetivo_f, objetivo_c, mapa_objetos):
+    def mover_hacia(self, objetivo_f, objetivo_c, grilla, campo=None):
         """
-        # Objetivo: Mover el enemigo hacia el objetivo (jugador)
+        # Objetivo: Mover a todos los enemigos hacia el objetivo (jugador)
         # Entrada:
         #   objetivo_f, objetivo_c - coordenadas del objetivo
-        #   mapa_objetos - matriz del mapa
-        # Salida: None (modifica posición del enemigo)
-        # Restricciones: 70% movimiento inteligente, 30% aleatorio
-        """
-        # Solo moverse si pasaron suficientes frames
-        if not self.deberia_mover():
-            return  # No moverse en este frame
-            
-        # Probabilidad: 70% movimiento inteligente, 30% aleatorio
-        if random.random() < 0.7:
-            self.mover_inteligente_hacia(objetivo_f, objetivo_c, mapa_objetos)
-        else:
-            self.mover_aleatorio(mapa_objetos)
-
-    def mover_inteligente_hacia(self, objetivo_f, objetivo_c, mapa_objetos):
-        """
-        # Objetivo: Movimiento inteligente que reduces distancia al objetivo
-        # Entrada:
-        #   objetivo_f, objetivo_c - coordenadas del objetivo  
-        #   mapa_objetos - matriz del mapa
-        # Salida: None (modifica posición del enemigo)
-        # Restricciones: Elige movimiento que más reduce distancia
-        """
-        # Obtener todos los movimientos posibles
-        movimientos_posibles = self.obtener_movimientos_posibles(mapa_objetos)
-        mejor_movimiento = None  # Mejor movimiento encontrado
-        menor_distancia = 1000   # Distancia inicial grande
-        
-        # Evaluar cada movimiento posible
-        for movimiento in movimientos_posibles:
-            df, dc = movimiento  # Desplazamiento
-            nueva_fila = self.fila + df  # Calcular nueva posición
-            nueva_col = self.col + dc
-            
-            # Calcular distancia Manhattan al objetivo
-            dist_filas = abs(nueva_fila - objetivo_f)      # Diferencia en filas
-            dist_columnas = abs(nueva_col - objetivo_c)    # Diferencia en columnas
-            distancia_total = dist_filas + dist_columnas   # Distancia total
-            
-            # Si esta posición está más cerca, es mejor movimiento
-            if distancia_total < menor_distancia:
-                menor_distancia = distancia_total
-                mejor_movimiento = movimiento
-        
-        # Aplicar el mejor movimiento encontrado
-        if mejor_movimiento:
-            df, dc = mejor_movimiento
-            self.fila += df  # Mover en fila
-            self.col += dc   # Mover en columna
-
-    def mover_lejos(self, objetivo_f, objetivo_c, mapa_objetos):
-        """
-        # Objetivo: Moverse lejos del objetivo (huir)
+        #   grilla - objeto Grilla del mapa
+        #   campo - CampoDistancias opcional (rutas.py) para bajar por la ruta real
+        # Salida: None (modifica posiciones)
+        # Restricciones: 70% movimiento inteligente, 30% aleatorio; los que
+        #   quedan fuera del campo acotado bajan por su campo completo. Sin
+        #   campo (o si el enemigo no llega al objetivo) se usa la distancia Manhattan
+        """
+        indices = self.deberian_mover()
+        if not indices.size:
+            return
+
+        inteligentes = self.rng.random(indices.size) < 0.7
+        filas, cols, validos = self.candidatos(indices, grilla)
+        grande = grilla.filas * grilla.columnas + 1  # Mayor que cualquier distancia del campo
+
+        # Movimiento inteligente: vecina más cercana al objetivo
+        puntaje = np.abs(filas - objetivo_f) + np.abs(cols - objetivo_c)
+        if campo is not None:
+            # Del campo solo se leen las celdas de los que se mueven y sus vecinas
+            campo.actualizar((objetivo_f, objetivo_c))
+            propia = campo.consultar_distancias(self.fila[indices], self.col[indices])
+            vecinas = campo.consultar_distancias(filas, cols)
+            fuera = np.flatnonzero(propia < 0)
+            if fuera.size:
+                # Cada enemigo usa un solo campo para él y sus vecinas
+                propia[fuera] = campo.consultar_completo(self.fila[indices[fuera]], self.col[indices[fuera]])
+                vecinas[fuera] = campo.consultar_completo(filas[fuera], cols[fuera])
+            por_campo = np.where(vecinas >= 0, vecinas, grande * 2)
+            puntaje = np.where((propia > 0)[:, None], por_campo, puntaje)
+        puntaje = np.where(validos, puntaje, grande * 4)
+        eleccion_inteligente = np.argmin(puntaje, axis=1)
+
+        # Movimiento aleatorio: una vecina válida cualquiera
+        claves = self.rng.random(validos.shape)
+        claves[~validos] = -1.0
+        eleccion_azar = np.argmax(claves, axis=1)
+
+        eleccion = np.where(inteligentes, eleccion_inteligente, eleccion_azar)
+        self.aplicar(indices, filas, cols, eleccion, validos.any(axis=1))
+
+    def mover_lejos(self, objetivo_f, objetivo_c, grilla, campo=None):
+        """
+        # Objetivo: Mover a todos los enemigos lejos del objetivo (huir)
         # Entrada:
         #   objetivo_f, objetivo_c - coordenadas del objetivo
-        #   mapa_objetos - matriz del mapa  
-        # Salida: None (modifica posición del enemigo)
-        # Restricciones: Elige movimiento que más aumenta distancia
-        """
-        # Solo moverse si pasaron suficientes frames
-        if not self.deberia_mover():
-            return  # No moverse en este frame
-            
-        # Obtener todos los movimientos posibles
-        movimientos_posibles = self.obtener_movimientos_posibles(mapa_objetos)
-        mejor_movimiento = None  # Mejor movimiento encontrado
-        mayor_distancia = -1     # Distancia inicial pequeña
-        
-        # Evaluar cada movimiento posible
-        for movimiento in movimientos_posibles:
-            df, dc = movimiento  # Desplazamiento
-            nueva_fila = self.fila + df  # Calcular nueva posición
-            nueva_col = self.col + dc
-            
-            # Calcular distancia Manhattan al objetivo
-            dist_filas = abs(nueva_fila - objetivo_f)      # Diferencia en filas
-            dist_columnas = abs(nueva_col - objetivo_c)    # Diferencia en columnas
-            distancia_total = dist_filas + dist_columnas   # Distancia total
-            
-            # Si esta posición está más lejos, es mejor movimiento
-            if distancia_total > mayor_distancia:
-                mayor_distancia = distancia_total
-                mejor_movimiento = movimiento
-        
-        # Aplicar el mejor movimiento encontrado
-        if mejor_movimiento:
-            df, dc = mejor_movimiento
-            self.fila += df  # Mover en fila
-            self.col += dc   # Mover en columna
-        else:
-            # Si no hay movimiento bueno, mover aleatoriamente
-            self.mover_aleatorio(mapa_objetos)
-
-    def mover_aleatorio(self, mapa_objetos):
-        """
-        # Objetivo: Movimiento aleatorio simple
-        # Entrada: mapa_objetos - matriz del mapa
-        # Salida: None (modifica posición del enemigo)
-        # Restricciones: Solo se mueve si hay movimientos posibles
-        """
-        # Obtener movimientos posibles
-        movimientos_posibles = self.obtener_movimientos_posibles(mapa_objetos)
-        
-        # Si hay movimientos posibles, elegir uno al azar
-        if movimientos_posibles:
-            movimiento_elegido = random.choice(movimientos_posibles)
-            df, dc = movimiento_elegido
-            self.fila += df  # Mover en fila
-            self.col += dc   # Mover en columna
-
-    def dibujar(self, window):
-        """
-        # Objetivo: Dibujar el enemigo en la pantalla
-        # Entrada: window - superficie de pygame donde dibujar
-        # Salida: None (dibuja sprite en la ventana)
-        # Restricciones: Usa posición actual del enemigo
-        """
-        # Calcular posición en píxeles
-        x = self.col * tam_tile  # Coordenada X en píxeles
-        y = self.fila * tam_tile # Coordenada Y en píxeles
-        
-        # Dibujar sprite en la posición calculada
-        window.blit(self.sprite, (x, y))
+        #   grilla - objeto Grilla del mapa
+        #   campo - CampoDistancias opcional para bajar por el mapa de huida
+        # Salida: None (modifica posiciones)
+        # Restricciones: Si el mapa de huida no mejora, elige la vecina que
+        #   más aumenta la distancia Manhattan
+        """
+        indices = self.deberian_mover()
+        if not indices.size:
+            return
+
+        filas, cols, validos = self.candidatos(indices, grilla)
+
+        # Alejarse en línea recta: vecina con mayor distancia Manhattan
+        lejania = np.abs(filas - objetivo_f) + np.abs(cols - objetivo_c)
+        lejania = np.where(validos, lejania, -1)
+        eleccion = np.argmax(lejania, axis=1)
+
+        if campo is not None:
+            campo.actualizar((objetivo_f, objetivo_c))
+            propia = campo.consultar_huida(self.fila[indices], self.col[indices])
+            vecinas = campo.consultar_huida(filas, cols)
+            vecinas = np.where(validos & ~np.isnan(vecinas), vecinas, np.inf)
+            eleccion_huida = np.argmin(vecinas, axis=1)
+            mejora = vecinas[np.arange(indices.size), eleccion_huida] < propia  # nan no mejora
+            eleccion = np.where(mejora, eleccion_huida, eleccion)
+
+        self.aplicar(indices, filas, cols, eleccion, validos.any(axis=1))
+
+    def en_celda(self, fila, col):
+        """
+        # Objetivo: Índices de los enemigos que están en una celda
+        # Entrada: fila, col - coordenadas de la celda
+        # Salida: arreglo de índices ordenado (vacío si no hay nadie)
+        # Restricciones: Con índice de ocupación es O(1); sin él recorre todos
+        """
+        if self.indice is not None:
+            return np.array(sorted(self.indice.en_celda(fila, col)), dtype=np.int64)
+        return np.flatnonzero((self.fila == fila) & (self.col == col))
+
+    def contar_cerca(self, fila, col, radio):
+        """
+        # Objetivo: Cuántos enemigos hay a cada distancia 0..radio de la celda
+        # Entrada: fila, col - celda, radio - distancia Manhattan máxima
+        # Salida: arreglo de largo radio + 1
+        # Restricciones: Con índice de ocupación cuesta O(radio²)
+        """
+        if self.indice is not None:
+            return self.indice.contar_por_distancia(fila, col, radio)
+        distancias = np.abs(self.fila - fila) + np.abs(self.col - col)
+        return np.bincount(distancias[distancias <= radio], minlength=radio + 1)
+
+    def reubicar(self, indice, fila, col):
+        """Pone al enemigo indice en otra celda (respawn)."""
+        if self.indice is not None:
+            self.indice.mover(int(indice), int(self.fila[indice]), int(self.col[indice]), fila, col)
+        self.fila[indice] = fila
+        self.col[indice] = col
+
+    def celdas_visibles(self, camara):
+        """
+        # Objetivo: Celdas ocupadas por enemigos dentro de la vista
+        # Entrada: camara - objeto Camara
+        # Salida: conjunto de tuplas (fila, col)
+        # Restricciones: El filtro se hace con NumPy; solo se arman tuplas de los visibles
+        """
+        visibles = ((self.fila >= camara.fila0) & (self.fila < camara.fila0 + camara.filas_vista) &
+                    (self.col >= camara.col0) & (self.col < camara.col0 + camara.columnas_vista))
+        return set(zip(self.fila[visibles].tolist(), self.col[visibles].tolist()))
@@ -0,0 +1,237 @@
+# generador.py
+
+import numpy as np
+from codigos_terreno import codigo_camino, codigo_muro, codigo_tunel
+
+# Objetivo:
+#   Generar laberintos con semilla explícita: la misma semilla y el
+#   mismo tamaño producen siempre el mismo mapa.
+#   Los nodos del laberinto son las celdas con fila y columna pares;
+#   entre dos nodos vecinos hay una celda "pared" que se abre (0) para
+#   unirlos. Después, las celdas que no son camino reciben un terreno
+#   al azar (muro, liana o túnel) en una sola operación vectorizada.
+# Restricciones:
+#   El camino siempre une (0, 0) con la esquina inferior-derecha.
+
+# Por encima de esta cantidad de nodos "auto" usa el generador vectorizado
+max_nodos_python = 250_000
+
+
+def tamaño_nodos(filas_mapa, columnas_mapa):
+    """Retorna cuántas filas y columnas de nodos caben en el mapa."""
+    return (filas_mapa + 1) // 2, (columnas_mapa + 1) // 2
+
+
+def abrir_uniones(celdas, nodos_a, nodos_b, columnas_nodos):
+    """
+    Objetivo:
+        Abrir los nodos dados y la celda intermedia entre cada par
+        (nodos_a[i], nodos_b[i]). Los nodos vienen como índices planos
+        de la malla de nodos.
+    """
+    fa, ca = np.divmod(np.asarray(nodos_a, dtype=np.int64), columnas_nodos)
+    fb, cb = np.divmod(np.asarray(nodos_b, dtype=np.int64), columnas_nodos)
+    celdas[2 * fa, 2 * ca] = codigo_camino
+    celdas[2 * fb, 2 * cb] = codigo_camino
+    celdas[fa + fb, ca + cb] = codigo_camino  # celda entre los dos nodos
+
+
+def conectar_salida(celdas):
+    """
+    Objetivo:
+        Unir la esquina inferior-derecha con el último nodo cuando
+        alguna dimensión es par (la esquina no cae sobre un nodo).
+    """
+    filas_mapa, columnas_mapa = celdas.shape
+    ultima_fila = 2 * ((filas_mapa + 1) // 2 - 1)
+    ultima_col = 2 * ((columnas_mapa + 1) // 2 - 1)
+    celdas[ultima_fila:, ultima_col] = codigo_camino
+    celdas[filas_mapa - 1, ultima_col:] = codigo_camino
+
+
+def generar_backtracker(filas_mapa, columnas_mapa, rng):
+    """
+    Objetivo:
+        Laberinto perfecto con backtracking recursivo, usando una pila
+        explícita (sin recursión de Python).
+    Salida: arreglo uint8 con 0 en el camino y 1 en el resto
+    """
+    nf, nc = tamaño_nodos(filas_mapa, columnas_mapa)
+    total = nf * nc
+    visitado = bytearray(total)
+    # Un número al azar por nodo visitado, sacados de una vez
+    azar = rng.random(total).tolist()
+    usados = 0
+
+    origen = []
+    destino = []
+    pila = [0]
+    visitado[0] = 1
+    while pila:
+        nodo = pila[-1]
+        f, c = divmod(nodo, nc)
+        vecinos = []
+        if f > 0 and not visitado[nodo - nc]:
+            vecinos.append(nodo - nc)
+        if f < nf - 1 and not visitado[nodo + nc]:
+            vecinos.append(nodo + nc)
+        if c > 0 and not visitado[nodo - 1]:
+            vecinos.append(nodo - 1)
+        if c < nc - 1 and not visitado[nodo + 1]:
+            vecinos.append(nodo + 1)
+        if not vecinos:
+            pila.pop()
+            continue
+        siguiente = vecinos[int(azar[usados] * len(vecinos))]
+        usados += 1
+        visitado[siguiente] = 1
+        origen.append(nodo)
+        destino.append(siguiente)
+        pila.append(siguiente)
+
+    celdas = np.full((filas_mapa, columnas_mapa), codigo_muro, dtype=np.uint8)
+    celdas[0, 0] = codigo_camino
+    abrir_uniones(celdas, origen, destino, nc)
+    conectar_salida(celdas)
+    return celdas
+
+
+def generar_kruskal(filas_mapa, columnas_mapa, rng):
+    """
+    Objetivo:
+        Laberinto perfecto con Kruskal aleatorio: se recorren las
+        uniones entre nodos en orden aleatorio y se abre cada una que
+        junte dos conjuntos distintos (union-find con compresión de
+        caminos y unión por tamaño).
+    Salida: arreglo uint8 con 0 en el camino y 1 en el resto
+    """
+    nf, nc = tamaño_nodos(filas_mapa, columnas_mapa)
+    nodos = np.arange(nf * nc).reshape(nf, nc)
+    a = np.concatenate([nodos[:, :-1].ravel(), nodos[:-1, :].ravel()])
+    b = np.concatenate([nodos[:, 1:].ravel(), nodos[1:, :].ravel()])
+    orden = rng.permutation(len(a))
+    a = a[orden].tolist()
+    b = b[orden].tolist()
+
+    padre = list(range(nf * nc))
+    tamaño = [1] * (nf * nc)
+    origen = []
+    destino = []
+    for u, v in zip(a, b):
+        # Buscar raíces con compresión de caminos (a la mitad)
+        x = u
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        y = v
+        while padre[y] != y:
+            padre[y] = padre[padre[y]]
+            y = padre[y]
+        if x == y:
+            continue  # Ya están conectados: abrirla haría un ciclo
+        if tamaño[x] < tamaño[y]:
+            x, y = y, x
+        padre[y] = x
+        tamaño[x] += tamaño[y]
+        origen.append(u)
+        destino.append(v)
+
+    celdas = np.full((filas_mapa, columnas_mapa), codigo_muro, dtype=np.uint8)
+    celdas[0, 0] = codigo_camino
+    abrir_uniones(celdas, origen, destino, nc)
+    conectar_salida(celdas)
+    return celdas
+
+
+def generar_sidewinder(filas_mapa, columnas_mapa, rng):
+    """
+    Objetivo:
+        Laberinto perfecto con el algoritmo sidewinder, calculado
+        completo con operaciones de NumPy (sin ciclos por celda).
+        Es el más rápido: sirve para mapas de miles de filas.
+    Salida: arreglo uint8 con 0 en el camino y 1 en el resto
+    """
+    nf, nc = tamaño_nodos(filas_mapa, columnas_mapa)
+    celdas = np.full((filas_mapa, columnas_mapa), codigo_muro, dtype=np.uint8)
+
+    # Primera fila de nodos: un solo pasillo horizontal
+    celdas[0, :2 * nc - 1] = codigo_camino
+
+    if nf > 1:
+        # En cada fila se forman "tramos" hacia la derecha; un tramo
+        # termina al azar o en la última columna
+        cerrar = rng.random((nf - 1, nc)) < 0.5
+        cerrar[:, -1] = True
+
+        # Nodos de las filas 1.. quedan abiertos
+        celdas[2:2 * nf - 1:2, 0:2 * nc - 1:2] = codigo_camino
+
+        # Pared este abierta donde el tramo continúa
+        continua = ~cerrar[:, :-1]
+        celdas[2:2 * nf - 1:2, 1:2 * nc - 2:2][continua] = codigo_camino
+
+        # Inicio de cada tramo: primera columna o después de un cierre
+        inicio = np.empty_like(cerrar)
+        inicio[:, 0] = True
+        inicio[:, 1:] = cerrar[:, :-1]
+        comienzos = np.flatnonzero(inicio)
+        largos = np.diff(np.append(comienzos, inicio.size))
+
+        # Cada tramo abre hacia el norte desde un nodo al azar del tramo
+        elegidos = comienzos + (rng.random(len(comienzos)) * largos).astype(np.int64)
+        fila_nodo, col_nodo = np.divmod(elegidos, nc)
+        # El nodo está en la fila de nodos fila_nodo + 1; su pared norte
+        # queda en la fila 2 * (fila_nodo + 1) - 1 del mapa
+        celdas[2 * fila_nodo + 1, 2 * col_nodo] = codigo_camino
+
+    conectar_salida(celdas)
+    return celdas
+
+
+# Generadores disponibles por nombre
+generadores = {
+    "backtracker": generar_backtracker,
+    "kruskal": generar_kruskal,
+    "sidewinder": generar_sidewinder,
+}
+
+
+def elegir_algoritmo(filas_mapa, columnas_mapa, algoritmo):
+    """
+    Objetivo:
+        Resolver "auto": backtracker en mapas normales y sidewinder
+        cuando el mapa es tan grande que un ciclo en Python sería lento.
+    """
+    if algoritmo != "auto":
+        if algoritmo not in generadores:
+            raise ValueError(f"algoritmo desconocido: {algoritmo}")
+        return algoritmo
+    nf, nc = tamaño_nodos(filas_mapa, columnas_mapa)
+    if nf * nc <= max_nodos_python:
+        return "backtracker"
+    return "sidewinder"
+
+
+def rellenar_terrenos(celdas, rng):
+    """
+    Objetivo:
+        Asignar al azar muro, liana o túnel a todas las celdas que no
+        son camino, en una sola operación.
+    """
+    resto = celdas != codigo_camino
+    celdas[resto] = rng.integers(codigo_muro, codigo_tunel + 1, size=int(resto.sum()), dtype=np.uint8)
+
+
+def generar(filas_mapa, columnas_mapa, semilla=None, algoritmo="auto"):
+    """
+    Objetivo:
+        Crear un mapa completo: laberinto con el algoritmo pedido y
+        terrenos al azar fuera del camino.
+    Salida: arreglo uint8 (filas_mapa, columnas_mapa) de códigos de terreno
+    Restricciones: misma semilla, tamaño y algoritmo => mismo mapa
+    """
+    rng = np.random.default_rng(semilla)
+    nombre = elegir_algoritmo(filas_mapa, columnas_mapa, algoritmo)
+    celdas = generadores[nombre](filas_mapa, columnas_mapa, rng)
+    rellenar_terrenos(celdas, rng)
+    return celdas
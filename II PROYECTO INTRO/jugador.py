@@ -1,11 +1,6 @@
-# jugador.py (con sprite)
+# jugador.py
 
 
-
-import pygame
-import os
-from mapa import tam_tile
-
 # Clase Jugador
 # Objetivo:
 #   Representar al jugador, su movimiento, energía
@@ -17,6 +12,7 @@ from mapa import tam_tile
 # Restricciones:
 #   No atravesar terrenos bloqueados
 #   Energía no puede ser negativa
+#   Solo lógica: el sprite lo dibuja vista.py
 
 class Jugador:
     """
@@ -41,19 +37,13 @@ class Jugador:
         # Control para saber si está corriendo
         self.corriendo = False
 
-        # Cargar sprite del jugador
-
-        ruta = os.path.join("assets", "jugador.jpeg")
-        self.sprite = pygame.image.load(ruta)
-        self.sprite = pygame.transform.scale(self.sprite, (tam_tile, tam_tile))
-
 
     # Métodos del jugador
 
 
 
 
-    def mover(self, df, dc, mapa_objetos):
+    def mover(self, df, dc, grilla):
         """
         Objetivo:
             Mover al jugador si el terreno lo permite.
@@ -62,17 +52,14 @@ class Jugador:
         nueva_fila = self.fila + df
         nueva_col = self.col + dc
 
-        limite = len(mapa_objetos)  # tamaño real del mapa
-
-        # Verificar límites reales
-        if nueva_fila < 0 or nueva_fila >= limite:
+        # Verificar límites reales (filas y columnas por separado)
+        if nueva_fila < 0 or nueva_fila >= grilla.filas:
             return
-        if nueva_col < 0 or nueva_col >= limite:
+        if nueva_col < 0 or nueva_col >= grilla.columnas:
             return
 
-        celda = mapa_objetos[nueva_fila][nueva_col]
-
-        if celda.permitir_jugador():
+        # Máscara de paso precalculada del jugador
+        if grilla.paso_jugador[nueva_fila, nueva_col]:
             self.fila = nueva_fila
             self.col = nueva_col
 
@@ -95,15 +82,6 @@ class Jugador:
         if not self.corriendo and self.energia < 100:
             self.energia += 0.5
 
-    def dibujar(self, window):
-        """
-        Objetivo:
-            Dibujar al jugador usando sprite.
-        """
-        x = self.col * tam_tile
-        y = self.fila * tam_tile
-        window.blit(self.sprite, (x, y))
-
     def actualizar(self):
         if self.corriendo:
             self.consumir_energia()
@@ -0,0 +1,95 @@
+# laberinto.py
+
+import numpy as np
+from generador import generar
+from conectividad import revisar_mapa
+from codigos_terreno import paso_jugador_por_codigo, paso_enemigo_por_codigo
+
+# Objetivo:
+#   Parte lógica del mapa: generar la matriz de terrenos y guardarla en
+#   una Grilla con las máscaras de paso. No usa pygame; el dibujo está
+#   en mapa.py.
+
+# Tamaño por defecto del mapa
+filas = 15
+columnas = 15
+
+# Límites para tamaños configurados al ejecutar
+min_dimension = 2
+max_dimension = 4096
+
+# Mapas rechazados por revisar_mapa antes de rendirse
+max_intentos_generar = 10
+
+
+def validar_dimensiones(filas_mapa, columnas_mapa):
+    """
+    Objetivo:
+        Verificar que el tamaño pedido para el mapa sea utilizable.
+    Restricciones: lanza ValueError si está fuera de los límites
+    """
+    for nombre, valor in (("filas", filas_mapa), ("columnas", columnas_mapa)):
+        if valor < min_dimension or valor > max_dimension:
+            raise ValueError(f"{nombre} debe estar entre {min_dimension} y {max_dimension}: {valor}")
+
+
+def generar_mapa(filas_mapa=filas, columnas_mapa=columnas, semilla=None, algoritmo="auto"):
+    """
+    Objetivo:
+        Retornar una matriz filas_mapa x columnas_mapa (arreglo uint8)
+        de números representando terrenos. El laberinto lo crea el
+        módulo generador; la misma semilla produce el mismo mapa.
+        Cada mapa pasa por revisar_mapa: se repara o se rechaza.
+    """
+    validar_dimensiones(filas_mapa, columnas_mapa)
+    inicio = (0, 0)
+    salida = (filas_mapa - 1, columnas_mapa - 1)
+    for intento in range(max_intentos_generar):
+        # El primer intento usa la semilla tal cual; los siguientes
+        # derivan otra semilla de ella para seguir siendo repetibles
+        semilla_intento = semilla if intento == 0 or semilla is None else [semilla, intento]
+        matriz = generar(filas_mapa, columnas_mapa, semilla_intento, algoritmo)
+        if revisar_mapa(matriz, inicio, salida):
+            return matriz
+    raise RuntimeError(f"no se pudo generar un mapa jugable en {max_intentos_generar} intentos")
+
+
+class Grilla:
+    """
+    Objetivo:
+        Representar el mapa de forma compacta: un arreglo uint8 con el
+        código de terreno de cada celda (un byte por celda) y máscaras
+        booleanas de paso precalculadas para el jugador y los enemigos.
+    Restricciones:
+        Los códigos deben ser índices válidos de las tablas de terrenos.
+    """
+    def __init__(self, matriz):
+        self.celdas = np.asarray(matriz, dtype=np.uint8)
+        self.filas, self.columnas = self.celdas.shape
+        self.paso_jugador = paso_jugador_por_codigo[self.celdas]
+        self.paso_enemigo = paso_enemigo_por_codigo[self.celdas]
+
+    def dentro(self, fila, col):
+        """Retorna True si la celda está dentro del mapa."""
+        return 0 <= fila < self.filas and 0 <= col < self.columnas
+
+    def permite_jugador(self, fila, col):
+        """Retorna True si el jugador puede estar en la celda."""
+        return self.dentro(fila, col) and bool(self.paso_jugador[fila, col])
+
+    def permite_enemigo(self, fila, col):
+        """Retorna True si un enemigo puede estar en la celda."""
+        return self.dentro(fila, col) and bool(self.paso_enemigo[fila, col])
+
+
+def construir_grilla(matriz):
+    """
+    Objetivo:
+        Convertir la matriz numérica de generar_mapa en una Grilla.
+    """
+    return Grilla(matriz)
+
+
+def posicion_salida(grilla):
+    """Retorna la celda de la salida: la esquina inferior-derecha."""
+    return grilla.filas - 1, grilla.columnas - 1
@@ -1,58 +1,162 @@
 # main.py (VERSIÓN COMPLETA CORREGIDA)
 
-import pygame
-import sys
-import random
 import time
+inicio_proceso = time.perf_counter()  # Para --medir-arranque: antes de importar pygame y el juego
 
-from terrenos import inicializar_imagenes
-from mapa import generar_mapa, convertir_a_objetos, dibujar_mapa, colocar_salida, dibujar_salida, tam_tile, filas, columnas
-from trampas import TrampaManager
-from jugador import Jugador
-from enemigo import Enemigo
+import pygame
+import sys
+import argparse
+import atexit
+from functools import lru_cache
+
+from mapa import tam_tile
+from laberinto import filas, columnas
+from camara import Camara
+from reloj_simulacion import RelojSimulacion
+from generador import generadores
+from motor import dificultades, meta_atrapados, nueva_semilla, fases_motor
+from vista import VistaJuego
+from repeticion import Repeticion, cargar
+from perfilador import Perfilador
+from puntajes import ServicioPuntajes
+from empaquetar_assets import empaquetar, imagenes_tile
+import recursos
 
 # Configuración del juego - TAMAÑOS CORREGIDOS
 ancho_mapa = columnas * tam_tile  # Ancho solo del mapa
 ancho_ui = 200  # Espacio para la interfaz
 ancho_total = ancho_mapa + ancho_ui  # Ancho total de la ventana
 alto_total = filas * tam_tile
-fps = 30
-
-def obtener_posicion_valida(mapa_objetos):
-    """
-    # Objetivo: Encontrar una posición aleatoria donde puede estar un enemigo
-    # Entrada: mapa_objetos - matriz con objetos de terreno
-    # Salida: (fila, columna) - tupla con coordenadas válidas
-    # Restricciones: Evitar bucle infinito con máximo de intentos
-    """
-    intentos = 0
-    # Intentar hasta 100 veces encontrar posición válida
-    while intentos < 100:
-        fila = random.randint(0, filas - 1)
-        col = random.randint(0, columnas - 1)
-        # Verificar si el enemigo puede estar en esta celda
-        if mapa_objetos[fila][col].permitir_enemigo():
-            return fila, col
-        intentos += 1
-    # Si no encuentra posición válida, usar posición por defecto
-    return 0, 0
-
-def crear_enemigos(mapa_objetos, cantidad):
-    """
-    # Objetivo: Crear múltiples enemigos en posiciones válidas del mapa
-    # Entrada: 
-    #   mapa_objetos - matriz del mapa
-    #   cantidad - número de enemigos a crear
-    # Salida: lista_enemigos - lista con objetos Enemigo
-    # Restricciones: cantidad debe ser número positivo
-    """
-    lista_enemigos = []
-    for i in range(cantidad):
-        # Obtener posición válida para cada enemigo
-        fila, col = obtener_posicion_valida(mapa_objetos)
-        nuevo_enemigo = Enemigo(fila, col)
-        lista_enemigos.append(nuevo_enemigo)
-    return lista_enemigos
+fps = 60  # Tope de FPS de dibujo
+ticks_por_segundo = 30  # Ticks de lógica por segundo (velocidad del juego)
+
+# Vista máxima del mapa en celdas: mapas más grandes se desplazan con la cámara
+max_filas_vista = 24
+max_columnas_vista = 32
+alto_minimo = 375  # Alto mínimo para que quepa el panel de UI
+
+# Fases de cada frame que mide el perfilador (F3 lo muestra, F4 exporta la traza)
+fases_perfil = ("espera", "eventos") + fases_motor + ("dibujo", "display")
+archivo_traza = "traza_perfil.json"
+
+# Marcas de tiempo del arranque: (nombre, perf_counter); None si no se mide
+marcas_arranque = None
+
+# Flechas del teclado -> acción de movimiento del motor
+acciones_teclas = {
+    pygame.K_UP: "arriba",
+    pygame.K_DOWN: "abajo",
+    pygame.K_LEFT: "izquierda",
+    pygame.K_RIGHT: "derecha",
+}
+
+def semilla_argumento(texto):
+    """
+    # Objetivo: Convertir el texto de --semilla en entero (para argparse)
+    # Entrada: texto - valor escrito en la línea de comandos
+    # Salida: entero entre 0 y 2**64 - 1
+    # Restricciones: NumPy no acepta semillas negativas y la repetición guarda
+    #   la semilla en 64 bits sin signo: fuera de ese rango es un error de uso
+    """
+    try:
+        semilla = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"no es un entero: {texto}")
+    if not 0 <= semilla < 2 ** 64:
+        raise argparse.ArgumentTypeError(f"debe estar entre 0 y 2**64 - 1: {texto}")
+    return semilla
+
+def leer_argumentos():
+    """
+    # Objetivo: Leer las opciones de línea de comandos del juego
+    # Entrada: None (usa sys.argv)
+    # Salida: objeto con los atributos filas, columnas, semilla, algoritmo, enemigos,
+    #   velocidad, grabar, repeticion, perfilar, medir_arranque y sin_paquete
+    # Restricciones: Tamaños entre los límites de laberinto.validar_dimensiones
+    """
+    parser = argparse.ArgumentParser(description="Escapa del Laberinto")
+    parser.add_argument("--filas", type=int, default=filas, help="filas del mapa")
+    parser.add_argument("--columnas", type=int, default=columnas, help="columnas del mapa")
+    parser.add_argument("--semilla", type=semilla_argumento, default=None, help="semilla de la partida: mapa y azar del juego (al azar si se omite)")
+    parser.add_argument("--algoritmo", default="auto", choices=["auto"] + sorted(generadores),
+                        help="algoritmo de generación del laberinto")
+    parser.add_argument("--enemigos", type=int, default=None,
+                        help="cantidad de enemigos (por defecto la de la dificultad)")
+    parser.add_argument("--velocidad", type=float, default=1.0,
+                        help="velocidad de la simulación (2 = el doble de rápido)")
+    parser.add_argument("--grabar", default="ultima_partida.rep",
+                        help="archivo donde se graba la partida para repetirla")
+    parser.add_argument("--repeticion", default=None,
+                        help="ver en tiempo real una partida grabada en vez de jugar")
+    parser.add_argument("--perfilar", action="store_true",
+                        help="empezar con el perfilador por fases encendido (F3)")
+    parser.add_argument("--medir-arranque", action="store_true",
+                        help="ir directo a una partida, medir el tiempo hasta el primer frame y salir")
+    parser.add_argument("--sin-paquete", action="store_true",
+                        help="decodificar los JPEG aunque exista assets/paquete.bin (para comparar)")
+    return parser.parse_args()
+
+def configurar_ventana(camara):
+    """
+    # Objetivo: Ajustar el tamaño de la ventana a la vista de la cámara
+    # Entrada: camara - objeto Camara ya creado para el mapa
+    # Salida: None (actualiza ancho_mapa, ancho_total y alto_total)
+    # Restricciones: Debe llamarse antes de crear la ventana del juego
+    """
+    global ancho_mapa, ancho_total, alto_total
+    ancho_mapa = camara.ancho
+    ancho_total = ancho_mapa + ancho_ui
+    alto_total = max(camara.alto, alto_minimo)
+
+def preparar_ventana(tamaño, titulo):
+    """
+    # Objetivo: Usar la única ventana del juego con el tamaño y título pedidos
+    # Entrada: tamaño - (ancho, alto) en píxeles, titulo - texto de la ventana
+    # Salida: superficie de la ventana
+    # Restricciones: set_mode solo se llama si cambia el tamaño; pygame 2
+    #   reutiliza la misma ventana en vez de crear otra
+    """
+    ventana = pygame.display.get_surface()
+    if ventana is None or ventana.get_size() != tamaño:
+        ventana = pygame.display.set_mode(tamaño)
+    pygame.display.set_caption(titulo)
+    return ventana
+
+# Fuentes ya creadas, una por tamaño (SysFont busca en el sistema cada vez)
+fuentes = {}
+
+def obtener_fuente(tamaño):
+    """
+    # Objetivo: Devolver la fuente del tamaño pedido, creándola solo la primera vez
+    # Entrada: tamaño - tamaño de fuente
+    # Salida: objeto pygame.font.Font
+    # Restricciones: pygame.font debe estar inicializado
+    """
+    fuente = fuentes.get(tamaño)
+    if fuente is None:
+        fuente = pygame.font.SysFont(None, tamaño)
+        fuentes[tamaño] = fuente
+    return fuente
+
+@lru_cache(maxsize=256)
+def renderizar_texto(texto, tamaño, color):
+    """
+    # Objetivo: Renderizar texto guardando las superficies más usadas
+    # Entrada: texto - string, tamaño - tamaño de fuente, color - tupla (R, G, B)
+    # Salida: superficie con el texto (compartida, no modificarla)
+    # Restricciones: color debe ser tupla para poder usarse como clave
+    """
+    return obtener_fuente(tamaño).render(texto, True, color)
+
+def limpiar_cache_texto():
+    """
+    # Objetivo: Olvidar fuentes y textos cacheados (no sirven tras pygame.quit)
+    # Entrada: None
+    # Salida: None
+    # Restricciones: Ninguna
+    """
+    fuentes.clear()
+    renderizar_texto.cache_clear()
 
 def mostrar_texto_simple(window, texto, tamaño, color, x, y):
     """
@@ -66,8 +170,7 @@ def mostrar_texto_simple(window, texto, tamaño, color, x, y):
     # Salida: None (dibuja directamente en la ventana)
     # Restricciones: Coordenadas deben estar dentro de la ventana
     """
-    font = pygame.font.SysFont(None, tamaño)  # Crear objeto fuente
-    texto_img = font.render(texto, True, color)  # Renderizar texto
+    texto_img = renderizar_texto(texto, tamaño, color)  # Superficie cacheada
     window.blit(texto_img, (x, y))  # Dibujar texto en posición
 
 def dibujar_barra_energia(window, jugador):
@@ -112,22 +215,22 @@ def dibujar_contador_trampas(window, trampas):
     # Objetivo: Mostrar cuántas trampas puede colocar el jugador
     # Entrada:
     #   window - superficie de pygame
-    #   trampas - objeto TrampaManager con lista_trampas
+    #   trampas - objeto TrampaManager
     # Salida: None (dibuja directamente en la ventana)
-    # Restricciones: Máximo 3 trampas simultáneas
+    # Restricciones: Máximo trampas.limite trampas simultáneas
     """
     # POSICIÓN CORREGIDA: Debajo de la barra de energía
     pos_x = ancho_mapa + 10
     pos_y = 60
     
-    trampas_disponibles = 3 - len(trampas.lista_trampas)
+    trampas_disponibles = trampas.disponibles()
     
     # Título
     mostrar_texto_simple(window, "TRAMPAS", 16, (200, 200, 200), pos_x, pos_y)
     
     # Contador con color según disponibilidad
     color_contador = (0, 255, 0) if trampas_disponibles > 0 else (255, 100, 100)
-    mostrar_texto_simple(window, f"Disponibles: {trampas_disponibles}/3", 18, color_contador, pos_x, pos_y + 25)
+    mostrar_texto_simple(window, f"Disponibles: {trampas_disponibles}/{trampas.limite}", 18, color_contador, pos_x, pos_y + 25)
 
 def dibujar_puntuacion(window, puntuacion):
     """
@@ -220,6 +323,28 @@ def dibujar_toda_ui(window, jugador, trampas, puntuacion, modo, dificultad):
     dibujar_modo_actual(window, modo)
     dibujar_dificultad(window, dificultad)  # NUEVO
 
+# Líneas ya dibujadas del perfilador (se rehacen cada cierta cantidad de frames)
+lineas_perfil = []
+
+def dibujar_perfilador(window, perfilador, cada=30):
+    """
+    # Objetivo: Mostrar en el panel los percentiles p50/p95/p99 de cada fase
+    # Entrada: window - superficie de pygame, perfilador - Perfilador activo
+    #   cada - frames entre actualizaciones del texto
+    # Salida: None (dibuja en la parte baja del panel de UI)
+    # Restricciones: Los números se recalculan solo cada `cada` frames
+    """
+    if perfilador.frame % cada == 0 or not lineas_perfil:
+        fuente = obtener_fuente(16)
+        lineas_perfil.clear()
+        lineas_perfil.append(fuente.render("ms        p50   p95   p99", True, (200, 200, 0)))
+        for nombre, p50, p95, p99 in perfilador.estadisticas():
+            texto = f"{nombre[:9]:9}{p50:6.1f}{p95:6.1f}{p99:6.1f}"
+            lineas_perfil.append(fuente.render(texto, True, (180, 255, 180)))
+    x = ancho_mapa + 10
+    for i, linea in enumerate(lineas_perfil):
+        window.blit(linea, (x, 245 + i * 12))
+
 def pedir_nombre_jugador():
     """
     # Objetivo: Mostrar pantalla para que jugador ingrese nombre
@@ -227,12 +352,10 @@ def pedir_nombre_jugador():
     # Salida: nombre_ingresado - string con nombre del jugador
     # Restricciones: Nombre máximo 12 caracteres, no vacío
     """
-    pygame.init()
-    # Crear ventana pequeña para registro
-    pantalla_chica = pygame.display.set_mode((400, 200))
-    pygame.display.set_caption("Registro de Jugador")
+    # Ventana pequeña para registro
+    pantalla_chica = preparar_ventana((400, 200), "Registro de Jugador")
     
-    font = pygame.font.SysFont(None, 36)  # Fuente para texto
+    font = obtener_fuente(36)  # Fuente para texto
     nombre_ingresado = ""  # Variable para almacenar nombre
     terminado = False  # Control del bucle
     
@@ -281,11 +404,10 @@ def elegir_modo_juego():
     # Salida: modo_elegido - string "escapa" o "cazador"
     # Restricciones: Debe elegir uno de los dos modos disponibles
     """
-    pantalla = pygame.display.set_mode((400, 300))
-    pygame.display.set_caption("Selección de Modo")
+    pantalla = preparar_ventana((400, 300), "Selección de Modo")
     
-    font_grande = pygame.font.SysFont(None, 48)  # Fuente título
-    font_normal = pygame.font.SysFont(None, 36)  # Fuente botones
+    font_grande = obtener_fuente(48)  # Fuente título
+    font_normal = obtener_fuente(36)  # Fuente botones
     
     # Definir áreas de botones
     boton_escapa = pygame.Rect(100, 100, 200, 50)
@@ -336,66 +458,21 @@ def elegir_modo_juego():
     
     return modo_elegido
 
-def leer_puntajes_archivo(nombre_archivo):
+# Top 5 en memoria para todo el proceso; escribe a disco en otro hilo
+servicio_puntajes = None
+
+def obtener_servicio_puntajes():
     """
-    # Objetivo: Leer puntajes guardados desde archivo de texto
-    # Entrada: nombre_archivo - string con ruta del archivo
-    # Salida: puntajes - lista de tuplas (nombre, puntos)
-    # Restricciones: Archivo debe tener formato "nombre,puntos"
+    # Objetivo: Devolver el servicio de puntajes, creándolo la primera vez
+    # Entrada: None
+    # Salida: objeto ServicioPuntajes
+    # Restricciones: Al salir del programa se escribe lo pendiente (atexit)
     """
-    puntajes = []  # Lista para almacenar puntajes
-    try:
-        archivo = open(nombre_archivo, "r")  # CORREGIDO: nombre_archivo en lugar de puntaje
-        for linea in archivo:
-            partes = linea.strip().split(",")  # Dividir por coma
-            if len(partes) == 2:  # Verificar formato correcto
-                nombre = partes[0]
-                puntos = int(partes[1])  # Convertir a número
-                puntajes.append((nombre, puntos))
-        archivo.close()
-    except:
-        # Si el archivo no existe, crear lista vacía
-        puntajes = []
-    
-    return puntajes
-
-def guardar_puntaje_archivo(nombre_archivo, nombre_jugador, puntuacion):
-    """
-    # Objetivo: Guardar nuevo puntaje en archivo (top 5)
-    # Entrada:
-    #   nombre_archivo - archivo donde guardar
-    #   nombre_jugador - nombre del jugador
-    #   puntuacion - puntos a guardar
-    # Salida: None (guarda en archivo)
-    # Restricciones: Solo guarda top 5 puntajes
-    """
-    # Leer puntajes existentes
-    todos_puntajes = leer_puntajes_archivo(nombre_archivo)
-    
-    # Agregar nuevo puntaje
-    todos_puntajes.append((nombre_jugador, puntuacion))
-    
-    # Ordenar de mayor a menor (algoritmo burbuja simple)
-    for i in range(len(todos_puntajes)):
-        for j in range(i + 1, len(todos_puntajes)):
-            if todos_puntajes[j][1] > todos_puntajes[i][1]:
-                # Intercambiar posiciones
-                temp = todos_puntajes[i]
-                todos_puntajes[i] = todos_puntajes[j]
-                todos_puntajes[j] = temp
-    
-    # Mantener solo los 5 mejores
-    if len(todos_puntajes) > 5:
-        todos_puntajes = todos_puntajes[:5]
-    
-    # Guardar en archivo
-    try:
-        archivo = open(nombre_archivo, "w")  # Abrir archivo escritura
-        for nombre, puntos in todos_puntajes:
-            archivo.write(f"{nombre},{puntos}\n")  # Escribir línea
-        archivo.close()
-    except:
-        print("Error guardando puntaje")
+    global servicio_puntajes
+    if servicio_puntajes is None:
+        servicio_puntajes = ServicioPuntajes()
+        atexit.register(servicio_puntajes.cerrar)
+    return servicio_puntajes
 
 def mostrar_pantalla_final(window, mensaje, color, nombre_jugador, puntuacion, modo):
     """
@@ -411,8 +488,8 @@ def mostrar_pantalla_final(window, mensaje, color, nombre_jugador, puntuacion, m
     # Restricciones: Espera hasta que usuario presione tecla o click
     """
     window.fill((0, 0, 0))  # Fondo negro
-    font_grande = pygame.font.SysFont(None, 48)  # Fuente grande
-    font_normal = pygame.font.SysFont(None, 36)  # Fuente normal
+    font_grande = obtener_fuente(48)  # Fuente grande
+    font_normal = obtener_fuente(36)  # Fuente normal
     
     # Mensaje principal (GANASTE/PERDISTE)
     texto_mensaje = font_grande.render(mensaje, True, color)
@@ -445,324 +522,300 @@ def mostrar_pantalla_final(window, mensaje, color, nombre_jugador, puntuacion, m
             if evento.type == pygame.MOUSEBUTTONDOWN:
                 esperando = False  # Cualquier click
 
-def verificar_colision_trampas(enemigos, trampas, mapa_objetos):
+def preparar_paquete():
     """
-    # Objetivo: Verificar si enemigos pisaron trampas y manejarlo
-    # Entrada:
-    #   enemigos - lista de objetos Enemigo
-    #   trampas - objeto TrampaManager
-    #   mapa_objetos - matriz del mapa
-    # Salida: puntos_ganados - puntos por eliminar enemigos
-    # Restricciones: Solo elimina un enemigo por trampa
-    """
-    puntos_ganados = 0  # Contador de puntos
-    enemigos_eliminados = []  # Lista de enemigos que pisaron trampas
-    
-    # Revisar cada enemigo
-    for enemigo in enemigos:
-        # Revisar cada trampa activa
-        for trampa in trampas.lista_trampas:
-            if enemigo.fila == trampa[0] and enemigo.col == trampa[1]:
-                # Enemigo pisó trampa - eliminarla
-                trampas.eliminar_trampa(trampa[0], trampa[1])
-                puntos_ganados += 50  # Bonus por eliminar enemigo
-                enemigos_eliminados.append(enemigo)  # Marcar para respawn
-                break  # Solo una trampa por enemigo
-    
-    # Reposicionar enemigos eliminados
-    for enemigo in enemigos_eliminados:
-        nueva_fila, nueva_col = obtener_posicion_valida(mapa_objetos)
-        enemigo.fila = nueva_fila
-        enemigo.col = nueva_col
-    
-    return puntos_ganados
-
-def verificar_victoria_escapa(jugador, salida_fila, salida_col):
-    """
-    # Objetivo: Verificar si jugador llegó a la salida en modo escapa
-    # Entrada:
-    #   jugador - objeto Jugador con posición
-    #   salida_fila, salida_col - coordenadas de la salida
-    # Salida: True si ganó, False si no
-    # Restricciones: Solo aplica para modo escapa
+    # Objetivo: Armar assets/paquete.bin si falta o si le falta alguna imagen
+    #   (la primera vez que se juega, o después de cambiar un JPEG)
+    # Entrada: None (usa recursos.usar_paquete)
+    # Salida: None (deja el paquete cargado en recursos)
+    # Restricciones: Antes de crear sprites: el paquete abierto se suelta para
+    #   reemplazar el archivo. Si no se puede escribir, se siguen usando los JPEG
     """
-    return jugador.fila == salida_fila and jugador.col == salida_col
+    if not recursos.usar_paquete:
+        return
+    if len(recursos.cargar_paquete()) == len(imagenes_tile):
+        return
+    recursos.cerrar_paquete()
+    try:
+        empaquetar(imagenes_tile, [tam_tile])
+    except (OSError, pygame.error):
+        pass
+    recursos.cargar_paquete()
 
-def verificar_derrota_escapa(jugador, enemigos):
+def marcar_arranque(nombre):
     """
-    # Objetivo: Verificar si enemigo atrapó al jugador en modo escapa
-    # Entrada:
-    #   jugador - objeto Jugador
-    #   enemigos - lista de objetos Enemigo
-    # Salida: True si perdió, False si no
-    # Restricciones: Solo aplica para modo escapa
+    # Objetivo: Anotar que terminó una etapa del arranque
+    # Entrada: nombre - etapa que terminó
+    # Salida: None (agrega la marca si se está midiendo el arranque)
+    # Restricciones: No hace nada sin --medir-arranque
     """
-    for enemigo in enemigos:
-        # Verificar colisión con cada enemigo
-        if enemigo.fila == jugador.fila and enemigo.col == jugador.col:
-            return True
-    return False
+    if marcas_arranque is not None:
+        marcas_arranque.append((nombre, time.perf_counter()))
 
-def main():
+def reportar_arranque():
     """
-    # Objetivo: Función principal que ejecuta todo el juego
-    # Entrada: None (inicia el programa)
-    # Salida: None (ejecuta juego completo)
-    # Restricciones: Controla flujo completo del juego
+    # Objetivo: Mostrar cuánto tardó cada etapa del arranque y el total hasta el primer frame
+    # Entrada: None (usa marcas_arranque e inicio_proceso)
+    # Salida: None (imprime en consola)
+    # Restricciones: El tiempo cuenta desde que se empieza a importar main.py,
+    #   sin el arranque del intérprete de Python
+    """
+    imagenes_paquete = len(recursos.paquete) if recursos.paquete else 0
+    print(f"Arranque (imágenes del paquete: {imagenes_paquete})")
+    anterior = inicio_proceso
+    for nombre, instante in marcas_arranque:
+        print(f"  {nombre:14}{(instante - anterior) * 1000:>9.1f} ms")
+        anterior = instante
+    print(f"  {'primer frame':14}{(anterior - inicio_proceso) * 1000:>9.1f} ms en total")
+
+def crear_repeticion(argumentos, modo_juego, dificultad):
+    """
+    # Objetivo: Configurar una partida nueva según la dificultad y los argumentos
+    # Entrada: argumentos - de leer_argumentos, modo_juego, dificultad - strings
+    # Salida: objeto Repeticion vacío (la partida se graba mientras se juega)
+    # Restricciones: Sin --semilla cada partida usa una semilla nueva
     """
-    # Pantallas iniciales
-    nombre_jugador = pedir_nombre_jugador()
-    if not nombre_jugador:  # Si nombre vacío, usar por defecto
-        nombre_jugador = "Jugador"
-    
-    modo_juego = elegir_modo_juego()  # Seleccionar modo
-    dificultad = elegir_dificultad()  # Seleccionar dificultad
-    
     # Configurar juego según dificultad
+    cantidad_enemigos, velocidad_enemigos = dificultades[dificultad]
     if dificultad == "facil":
-        cantidad_enemigos = 2
-        velocidad_enemigos = 12  # frames entre movimientos (más lento)
         print("Dificultad: FÁCIL - 2 enemigos, velocidad lenta")
     elif dificultad == "medio":
-        cantidad_enemigos = 3  
-        velocidad_enemigos = 8   # frames entre movimientos (normal)
         print("Dificultad: MEDIO - 3 enemigos, velocidad normal")
     else:  # dificil
-        cantidad_enemigos = 4
-        velocidad_enemigos = 4   # frames entre movimientos (más rápido)
         print("Dificultad: DIFÍCIL - 4 enemigos, velocidad rápida")
-    
-    # Inicializar pygame y ventana principal
-    pygame.init()
-    ventana = pygame.display.set_mode((ancho_total, alto_total))
+    if argumentos.enemigos is not None:
+        cantidad_enemigos = argumentos.enemigos  # Cantidad pedida por línea de comandos
+
+    semilla = argumentos.semilla
+    if semilla is None:
+        semilla = nueva_semilla()
+    print(f"Semilla de la partida: {semilla}")  # Para poder repetir la misma partida
+    return Repeticion(semilla, modo_juego, dificultad, argumentos.filas, argumentos.columnas,
+                      argumentos.algoritmo, cantidad_enemigos, velocidad_enemigos, ticks_por_segundo)
+
+def jugar_partida(reloj, argumentos, repeticion, nombre_jugador, reproduciendo):
+    """
+    # Objetivo: Jugar (o ver, si reproduciendo) una partida hasta que termine o se salga con ESC
+    # Entrada:
+    #   reloj - pygame.time.Clock de toda la sesión
+    #   argumentos - de leer_argumentos
+    #   repeticion - objeto Repeticion: se llena al jugar, se lee al reproducir
+    #   nombre_jugador - nombre para el título y la pantalla final
+    #   reproduciendo - True para ver una partida grabada
+    # Salida: estado - EstadoJuego al final de la partida
+    # Restricciones: Usa la ventana ya creada; solo cambia su tamaño si hace falta
+    """
+    modo_juego = repeticion.modo
+    dificultad = repeticion.dificultad
+
+    # Tiempos por fase de cada frame (apagado no cuesta casi nada)
+    perfilador = Perfilador(fases_perfil, activo=argumentos.perfilar)
+
+    # Crear mundo del juego: mapa (arreglo uint8 + máscaras de paso) y estado (sin pygame)
+    estado = repeticion.crear_estado(perfilador)
+    grilla = estado.grilla
+    marcar_arranque("mapa")
+
+    # La ventana muestra solo la vista de la cámara, no todo el mapa
+    camara = Camara(grilla.filas, grilla.columnas, max_filas_vista, max_columnas_vista, tam_tile)
+    configurar_ventana(camara)
+
+    # La misma ventana de los menús, con el tamaño del juego
     titulo_ventana = f"Escapa del Laberinto - {nombre_jugador} - {dificultad.upper()}"
-    pygame.display.set_caption(titulo_ventana)
-    
-    reloj = pygame.time.Clock()  # Para controlar FPS
-    inicializar_imagenes()  # Cargar imágenes de terrenos
+    ventana = preparar_ventana((ancho_total, alto_total), titulo_ventana)
 
-    # Crear mundo del juego
-    matriz_mapa = generar_mapa()  # Matriz numérica
-    mapa_objetos = convertir_a_objetos(matriz_mapa)  # Matriz de objetos
-    salida_fila, salida_col = colocar_salida(mapa_objetos)  # Posición salida
+    # La lógica (enemigos, energía, puntos, trampas) avanza a ticks fijos
+    simulacion = RelojSimulacion(ticks_por_segundo, argumentos.velocidad)
 
-    # Crear personajes y objetos del juego
-    jugador = Jugador(0, 0)  # Jugador en esquina superior izquierda
-    administrador_trampas = TrampaManager()  # Controlador de trampas
-    lista_enemigos = crear_enemigos(mapa_objetos, cantidad_enemigos)  # Usa cantidad_enemigos
-    
-    # Configurar velocidad de enemigos según dificultad
-    for enemigo in lista_enemigos:
-        enemigo.velocidad_movimiento = velocidad_enemigos
+    # Vista del estado de la partida
+    vista = VistaJuego(ventana, estado, camara)
+    marcar_arranque("imagenes")
+    acciones_grabadas = repeticion.acciones_por_tick() if reproduciendo else None
 
-    # Variables para modo cazador
-    contador_atrapados = 0  # Contador de enemigos atrapados
-    tiempo_inicio_cazador = 0  # Tiempo inicial modo cazador
-    
-    # Configurar juego según modo
-    if modo_juego == "cazador":
-        puntuacion_actual = 100  # Puntos iniciales modo cazador
-        tiempo_inicio_cazador = time.time()  # Tiempo inicial
-    else:
-        puntuacion_actual = 0  # Puntos iniciales modo escapa
-        tiempo_comienzo = time.time()  # Tiempo inicial para bonus
-    
+    # Fondo estático: la vista del mapa y la salida se dibujan una sola vez
+    rect_ui = pygame.Rect(ancho_mapa, 0, ancho_ui, alto_total)
+    ventana.fill((0, 0, 0))
+    vista.iniciar()
+    pygame.display.update()
+    marcar_arranque("fondo")
+    if marcas_arranque is not None:
+        return estado  # Solo se medía hasta el primer frame
+
+    acciones = []  # Acciones del jugador que esperan el próximo tick
     juego_activo = True  # Control del bucle principal
-    
+
     # BUCLE PRINCIPAL DEL JUEGO
     while juego_activo:
-        reloj.tick(fps)  # Mantener 30 FPS
-
-        # PROCESAR EVENTOS
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT:
-                juego_activo = False  # Salir del juego
+        perfilador.nuevo_frame()
+        with perfilador.medir("espera"):
+            reloj.tick(fps)  # Dibujar a lo más 60 FPS
+
+        # PROCESAR EVENTOS: se convierten en acciones para el motor
+        with perfilador.medir("eventos"):
+            for evento in pygame.event.get():
+                if evento.type == pygame.QUIT:
+                    juego_activo = False  # Salir del juego
             
-            # NUEVO: Tecla ESC para salir durante el juego
-            if evento.type == pygame.KEYDOWN:
-                if evento.key == pygame.K_ESCAPE:
-                    juego_activo = False  # Salir con ESC
-                    break  # Salir del bucle de eventos
+                # NUEVO: Tecla ESC para salir durante el juego
+                if evento.type == pygame.KEYDOWN:
+                    if evento.key == pygame.K_ESCAPE:
+                        juego_activo = False  # Salir con ESC
+                        break  # Salir del bucle de eventos
                 
-                # Tecla T para colocar trampa
-                if evento.key == pygame.K_t:
-                    if administrador_trampas.puede_colocar():
-                        administrador_trampas.colocar_trampa(jugador.fila, jugador.col)
+                    # F3 muestra/oculta el perfilador; F4 guarda su traza
+                    if evento.key == pygame.K_F3:
+                        perfilador.alternar()
+                    if evento.key == pygame.K_F4:
+                        frames = perfilador.exportar(archivo_traza)
+                        print(f"Traza de {frames} frames guardada en {archivo_traza}")
+
+                    # Tecla T para colocar trampa
+                    if evento.key == pygame.K_t:
+                        acciones.append("trampa")
                 
-                # MOVIMIENTO POR TECLAS PRESIONADAS (NO MANTENIDAS)
-                if evento.key == pygame.K_LSHIFT or evento.key == pygame.K_RSHIFT:
-                    jugador.iniciar_correr()
+                    # MOVIMIENTO POR TECLAS PRESIONADAS (NO MANTENIDAS)
+                    if evento.key == pygame.K_LSHIFT or evento.key == pygame.K_RSHIFT:
+                        acciones.append("correr")
                 
-                # MOVIMIENTO EN 4 DIRECCIONES (UNA CELDA POR TECLA)
-                if evento.key == pygame.K_UP:
-                    jugador.mover(-1, 0, mapa_objetos)  # Arriba - 1 celda
-                elif evento.key == pygame.K_DOWN:
-                    jugador.mover(1, 0, mapa_objetos)   # Abajo - 1 celda
-                elif evento.key == pygame.K_LEFT:
-                    jugador.mover(0, -1, mapa_objetos)  # Izquierda - 1 celda
-                elif evento.key == pygame.K_RIGHT:
-                    jugador.mover(0, 1, mapa_objetos)   # Derecha - 1 celda
+                    # MOVIMIENTO EN 4 DIRECCIONES (UNA CELDA POR TECLA)
+                    if evento.key in acciones_teclas:
+                        acciones.append(acciones_teclas[evento.key])
             
-            # DETENER DE CORRER CUANDO SE SUELTA SHIFT
-            if evento.type == pygame.KEYUP:
-                if evento.key == pygame.K_LSHIFT or evento.key == pygame.K_RSHIFT:
-                    jugador.detener_correr()
-
-        # ACTUALIZAR ENERGÍA DEL JUGADOR
-        jugador.actualizar()
-
-        # MOVIMIENTO DE ENEMIGOS
-        for enemigo in lista_enemigos:
-            if modo_juego == "escapa":
-                enemigo.mover_hacia(jugador.fila, jugador.col, mapa_objetos)
+                # DETENER DE CORRER CUANDO SE SUELTA SHIFT
+                if evento.type == pygame.KEYUP:
+                    if evento.key == pygame.K_LSHIFT or evento.key == pygame.K_RSHIFT:
+                        acciones.append("caminar")
+
+        # LÓGICA A PASO FIJO: se corren los ticks que tocan según el tiempo real
+        for _ in range(simulacion.avanzar()):
+            simulacion.paso()
+            if reproduciendo:
+                # Las acciones salen de la grabación (las teclas no cuentan)
+                acciones = next(acciones_grabadas, None)
+                if acciones is None:
+                    juego_activo = False  # Se acabó la grabación
+                    break
             else:
-                enemigo.mover_lejos(jugador.fila, jugador.col, mapa_objetos)
-
-        # VERIFICAR TRAMPAS
-        puntos_trampas = verificar_colision_trampas(lista_enemigos, administrador_trampas, mapa_objetos)
-        puntuacion_actual += puntos_trampas
+                repeticion.registrar(estado.ticks + 1, acciones)
+            estado.paso(acciones)
+            acciones = []
+            if estado.terminado():
+                break  # La partida terminó en este tick
 
         # VERIFICAR CONDICIONES DE FIN DEL JUEGO
-        if modo_juego == "escapa":
-            # VICTORIA: Llegar a la salida
-            if verificar_victoria_escapa(jugador, salida_fila, salida_col):
-                tiempo_transcurrido = time.time() - tiempo_comienzo
-                bonus_tiempo = max(0, 1000 - int(tiempo_transcurrido * 10))  # Más puntos por menos tiempo
-                puntuacion_actual += bonus_tiempo
-                
-                # Mostrar pantalla de victoria
-                mostrar_pantalla_final(ventana, "¡GANASTE!", (255, 255, 0), 
-                                     nombre_jugador, puntuacion_actual, modo_juego)
-                juego_activo = False
-            
-            # DERROTA: Enemigo atrapa al jugador
-            if verificar_derrota_escapa(jugador, lista_enemigos):
-                mostrar_pantalla_final(ventana, "PERDISTE", (255, 0, 0), 
-                                     nombre_jugador, puntuacion_actual, modo_juego)
-                juego_activo = False
-
-        else:  # MODO CAZADOR
-            """
-            # Objetivo: Lógica específica del modo cazador
-            # - Ganar puntos persiguiendo enemigos (estar cerca)
-            # - Perder puntos si enemigos escapan
-            # - Victoria: atrapar a todos los enemigos
-            # - Derrota: quedarse sin puntos
-            """
-            
-            # PUNTOS POR PERSEGUIR: Ganar puntos por estar cerca de enemigos
-            for enemigo in lista_enemigos:
-                distancia_filas = abs(enemigo.fila - jugador.fila)
-                distancia_columnas = abs(enemigo.col - jugador.col)
-                distancia_total = distancia_filas + distancia_columnas
-                
-                if distancia_total <= 1:  # Muy cerca - más puntos
-                    puntuacion_actual += 3
-                elif distancia_total <= 2:  # Cerca - puntos normales
-                    puntuacion_actual += 1
-            
-            # PENALIZACIÓN POR TIEMPO: Ir perdiendo puntos gradualmente
-            if random.random() < 0.02:  # 2% de probabilidad cada frame
-                puntuacion_actual -= 2
-            
-            # PENALIZACIÓN POR ENEMIGOS EN SALIDA: Si enemigo llega a salida, perder muchos puntos
-            for enemigo in lista_enemigos:
-                if enemigo.fila == salida_fila and enemigo.col == salida_col:
-                    puntuacion_actual -= 100  # Gran penalización
-                    # Reposicionar enemigo que escapó
-                    nueva_fila, nueva_col = obtener_posicion_valida(mapa_objetos)
-                    enemigo.fila = nueva_fila
-                    enemigo.col = nueva_col
-            
-            # BONUS POR ATRAPAR ENEMIGOS: Ganar puntos cuando atrapas un enemigo
-            for enemigo in lista_enemigos:
-                if enemigo.fila == jugador.fila and enemigo.col == jugador.col:
-                    puntuacion_actual += 100  # Bonus por atrapar enemigo
-                    contador_atrapados += 1  # Contar enemigo atrapado
-                    # Reposicionar enemigo atrapado
-                    nueva_fila, nueva_col = obtener_posicion_valida(mapa_objetos)
-                    enemigo.fila = nueva_fila
-                    enemigo.col = nueva_col
-            
-            # VICTORIA: Atrapar a cierta cantidad de enemigos (ej: 5)
-            if contador_atrapados >= 5:
-                tiempo_transcurrido = time.time() - tiempo_inicio_cazador
-                bonus_tiempo = max(0, 500 - int(tiempo_transcurrido * 5))  # Bonus por rapidez
-                puntuacion_actual += bonus_tiempo
-                
-                mostrar_pantalla_final(ventana, "¡GANASTE!", (255, 255, 0), 
-                                     nombre_jugador, puntuacion_actual, modo_juego)
-                juego_activo = False
-            
-            # DERROTA: Quedarse sin puntos
-            if puntuacion_actual <= 0:
-                mostrar_pantalla_final(ventana, "PERDISTE", (255, 0, 0), 
-                                     nombre_jugador, puntuacion_actual, modo_juego)
-                juego_activo = False
-
-        # DIBUJAR TODO EN PANTALLA
-        ventana.fill((0, 0, 0))  # Limpiar pantalla con negro
-        
-        # Dibujar elementos del juego en orden:
-        dibujar_mapa(ventana, mapa_objetos)  # 1. Mapa de fondo
-        dibujar_salida(ventana, salida_fila, salida_col)  # 2. Salida
-        administrador_trampas.dibujar(ventana)  # 3. Trampas
-        
-        # 4. Enemigos
-        for enemigo in lista_enemigos:
-            enemigo.dibujar(ventana)
-            
-        jugador.dibujar(ventana)  # 5. Jugador (sobre otros)
-        dibujar_toda_ui(ventana, jugador, administrador_trampas, puntuacion_actual, modo_juego, dificultad)  # 6. UI
-
-        # Dibujar información adicional para modo cazador
-        if modo_juego == "cazador":
-            mostrar_texto_simple(ventana, f"Atrapados: {contador_atrapados}/5", 20, (255, 255, 255), ancho_mapa + 10, 220)
-
-        pygame.display.update()  # Actualizar pantalla
-
-    # GUARDAR PUNTAJE Y MOSTRAR TOP 5
-    archivo_puntajes = f"top5_{modo_juego}.txt"
-    guardar_puntaje_archivo(archivo_puntajes, nombre_jugador, puntuacion_actual)
+        if estado.resultado == "victoria":
+            mostrar_pantalla_final(ventana, "¡GANASTE!", (255, 255, 0), 
+                                 nombre_jugador, estado.puntuacion, modo_juego)
+            juego_activo = False
+        elif estado.resultado == "derrota":
+            mostrar_pantalla_final(ventana, "PERDISTE", (255, 0, 0), 
+                                 nombre_jugador, estado.puntuacion, modo_juego)
+            juego_activo = False
+
+        with perfilador.medir("dibujo"):
+            # DIBUJAR SOLO LO QUE CAMBIÓ (mapa y entidades)
+            rects_sucios = vista.dibujar()
+
+            # Panel de UI (tamaño fijo, no depende del mapa)
+            ventana.fill((0, 0, 0), rect_ui)
+            dibujar_toda_ui(ventana, estado.jugador, estado.trampas, estado.puntuacion, modo_juego, dificultad)
+
+            # Dibujar información adicional para modo cazador
+            if modo_juego == "cazador":
+                mostrar_texto_simple(ventana, f"Atrapados: {estado.contador_atrapados}/{meta_atrapados}", 20,
+                                     (255, 255, 255), ancho_mapa + 10, 220)
+            if perfilador.activo:
+                dibujar_perfilador(ventana, perfilador)
+            rects_sucios.append(rect_ui)
+
+        with perfilador.medir("display"):
+            pygame.display.update(rects_sucios)  # Actualizar solo las zonas modificadas
+
+    return estado
 
-    # NUEVO: Mostrar pantalla Top 5 y preguntar si quiere jugar otra vez
-    decision = mostrar_pantalla_top5(ventana, modo_juego)
-
-    if decision == "jugar":
-        # Reiniciar el juego llamando a main() otra vez
-        pygame.quit()
-        main()  # Esto reinicia el juego completo
-    else:
-        # Salir del juego
-        pygame.quit()
-        sys.exit()
-
-def verificar_victoria_cazador(jugador, enemigos):
-    """
-    # Objetivo: Verificar si el jugador atrapó a todos los enemigos en modo cazador
-    # Entrada:
-    #   jugador - objeto Jugador
-    #   enemigos - lista de objetos Enemigo
-    # Salida: True si ganó, False si no
-    # Restricciones: Solo aplica para modo cazador
+def main():
     """
-    # Contar cuántos enemigos han sido atrapados (están en la misma posición que jugador)
-    enemigos_atrapados = 0
-    for enemigo in enemigos:
-        if enemigo.fila == jugador.fila and enemigo.col == jugador.col:
-            enemigos_atrapados += 1
-    
-    # Victoria: atrapar a todos los enemigos (3 en este caso)
-    return enemigos_atrapados >= 3
+    # Objetivo: Función principal que ejecuta todo el juego
+    # Entrada: None (inicia el programa)
+    # Salida: None (ejecuta juego completo)
+    # Restricciones: Una sola inicialización de pygame, una ventana y un reloj
+    #   para todas las partidas: la sesión es una máquina de estados
+    #   nombre -> modo -> dificultad -> juego -> resultados -> nombre...
+    #   (sin llamar a main() otra vez, así la pila no crece)
+    """
+    global marcas_arranque
+    argumentos = leer_argumentos()
+    recursos.usar_paquete = not argumentos.sin_paquete
+    if argumentos.medir_arranque:
+        marcas_arranque = []
+    marcar_arranque("importar")
+
+    # Ver una partida grabada salta los menús y no guarda puntajes;
+    # medir el arranque juega directo hasta el primer frame
+    if argumentos.repeticion is not None:
+        paso_sesion = "repeticion"
+    elif argumentos.medir_arranque:
+        paso_sesion = "arranque"
+    else:
+        paso_sesion = "nombre"
+    # Solo las partidas normales guardan puntajes: las otras no abren la base
+    if paso_sesion == "nombre":
+        puntajes = obtener_servicio_puntajes()  # Empieza a cargar el top guardado en otro hilo
 
-def verificar_derrota_cazador(puntuacion):
-    """
-    # Objetivo: Verificar si el jugador perdió en modo cazador (puntos <= 0)
-    # Entrada: puntuacion - puntos actuales del jugador
-    # Salida: True si perdió, False si no
-    # Restricciones: Solo aplica para modo cazador
-    """
-    return puntuacion <= 0
+    pygame.init()
+    reloj = pygame.time.Clock()  # Tope de FPS de dibujo, el mismo en todas las partidas
+    marcar_arranque("pygame")
+    preparar_paquete()
+    marcar_arranque("paquete")
+
+    while paso_sesion != "salir":
+        if paso_sesion == "nombre":
+            nombre_jugador = pedir_nombre_jugador()
+            if not nombre_jugador:  # Si nombre vacío, usar por defecto
+                nombre_jugador = "Jugador"
+            paso_sesion = "modo"
+
+        elif paso_sesion == "modo":
+            modo_juego = elegir_modo_juego()  # Seleccionar modo
+            paso_sesion = "dificultad"
+
+        elif paso_sesion == "dificultad":
+            dificultad = elegir_dificultad()  # Seleccionar dificultad
+            paso_sesion = "juego"
+
+        elif paso_sesion == "juego":
+            repeticion = crear_repeticion(argumentos, modo_juego, dificultad)
+            estado = jugar_partida(reloj, argumentos, repeticion, nombre_jugador, False)
+            paso_sesion = "resultados"
+
+        elif paso_sesion == "resultados":
+            # GUARDAR LA PARTIDA PARA PODER REPETIRLA
+            repeticion.terminar(estado.ticks)
+            repeticion.guardar(argumentos.grabar)
+
+            # GUARDAR PUNTAJE Y MOSTRAR TOP 5
+            puntajes.agregar(nombre_jugador, estado.puntuacion, modo_juego, dificultad)  # No espera al disco
+
+            # Mostrar pantalla Top 5 y preguntar si quiere jugar otra vez
+            decision = mostrar_pantalla_top5(pygame.display.get_surface(), modo_juego, puntajes)
+            paso_sesion = "nombre" if decision == "jugar" else "salir"
+
+        elif paso_sesion == "repeticion":
+            # La repetición trae modo, dificultad, mapa y semilla
+            repeticion = cargar(argumentos.repeticion)
+            jugar_partida(reloj, argumentos, repeticion, "Repetición", True)
+            paso_sesion = "salir"
+
+        elif paso_sesion == "arranque":
+            # Sin menús ni grabación: lo que cuesta llegar a ver el mapa
+            repeticion = crear_repeticion(argumentos, "escapa", "medio")
+            jugar_partida(reloj, argumentos, repeticion, "Jugador", False)
+            reportar_arranque()
+            paso_sesion = "salir"
+
+    # Salir del juego
+    pygame.quit()
+    limpiar_cache_texto()  # Las fuentes no sirven después de pygame.quit
 
 def elegir_dificultad():
     """
@@ -771,11 +824,10 @@ def elegir_dificultad():
     # Salida: dificultad - string "facil", "medio", "dificil"
     # Restricciones: Debe elegir una de las tres opciones
     """
-    pantalla = pygame.display.set_mode((400, 400))
-    pygame.display.set_caption("Selección de Dificultad")
+    pantalla = preparar_ventana((400, 400), "Selección de Dificultad")
     
-    font_titulo = pygame.font.SysFont(None, 48)
-    font_boton = pygame.font.SysFont(None, 36)
+    font_titulo = obtener_fuente(48)
+    font_boton = obtener_fuente(36)
     
     boton_facil = pygame.Rect(100, 100, 200, 50)
     boton_medio = pygame.Rect(100, 170, 200, 50)
@@ -826,20 +878,20 @@ def elegir_dificultad():
     return dificultad_elegida
 
 
-def mostrar_pantalla_top5(window, modo_juego):
+def mostrar_pantalla_top5(window, modo_juego, puntajes_guardados):
     """
     # Objetivo: Mostrar el Top 5 de puntuaciones del modo actual
     # Entrada: window - superficie de pygame, modo_juego - string del modo
-    # Salida: None (muestra pantalla y espera input)
+    #   puntajes_guardados - objeto ServicioPuntajes (responde desde memoria)
+    # Salida: "jugar" o "salir" según la tecla
     # Restricciones: Espera hasta que usuario presione tecla o click
     """
-    archivo_puntajes = f"top5_{modo_juego}.txt"
-    puntajes = leer_puntajes_archivo(archivo_puntajes)
+    puntajes = puntajes_guardados.top(modo_juego, 5)
     
     window.fill((0, 0, 0))  # Fondo negro
-    font_titulo = pygame.font.SysFont(None, 48)
-    font_item = pygame.font.SysFont(None, 36)
-    font_instruccion = pygame.font.SysFont(None, 24)
+    font_titulo = obtener_fuente(48)
+    font_item = obtener_fuente(36)
+    font_instruccion = obtener_fuente(24)
     
     # Título
     titulo = font_titulo.render(f"TOP 5 - {modo_juego.upper()}", True, (255, 255, 0))
@@ -886,4 +938,5 @@ def mostrar_pantalla_top5(window, modo_juego):
 
 
 
-main()  # Ejecutar juego
+if __name__ == "__main__":
+    main()  # Ejecutar juego
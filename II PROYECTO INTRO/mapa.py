@@ -1,9 +1,10 @@
 # mapa.py 
 
 import pygame
-import random
 import os
-from terrenos import Camino, Muro, Liana, Tunel, inicializar_imagenes
+from recursos import obtener_escalada
+from terrenos import Camino, Muro, Liana, Tunel, superficies_por_codigo
+from laberinto import posicion_salida
 
 # Tamaño del tile
 # Entrada: ninguna
@@ -11,55 +12,8 @@ from terrenos import Camino, Muro, Liana, Tunel, inicializar_imagenes
 # Restricciones: usado en todo el mapa
 
 tam_tile = 25
-filas = 15
-columnas = 15
-
-img_salida = None
-
-def cargar_imagen_salida():
-    """Cargar la imagen de la salida."""
-    ruta = os.path.join("assets", "salida.jpeg")
-    return pygame.image.load(ruta)
-
-
-def crear_matriz_vacia():
-    """Objetivo: crear toda la matriz llena de muros (valor 1)."""
-    return [[1 for _ in range(columnas)] for _ in range(filas)]
-
-
-def generar_camino_principal(matriz):
-    """
-    Objetivo:
-        Crear un camino garantizado desde (0,0) hasta (19,19).
-    """
-    fila = 0
-    col = 0
-    matriz[fila][col] = 0
-
-    while fila != filas - 1 or col != columnas - 1:
-        direccion = random.choice(["abajo", "derecha"])
-        if direccion == "abajo" and fila < filas - 1:
-            fila += 1
-        elif direccion == "derecha" and col < columnas - 1:
-            col += 1
-        matriz[fila][col] = 0
-
-
-def rellenar_terrenos(matriz):
-    """Objetivo: asignar aleatoriamente tipos de terreno a celdas que no son camino."""
-    for f in range(filas):
-        for c in range(columnas):
-            if matriz[f][c] != 0:
-                matriz[f][c] = random.choice([1, 2, 3])
-
-
-def generar_mapa():
-    """Retorna una matriz 20x20 de números representando terrenos."""
-    matriz = crear_matriz_vacia()
-    generar_camino_principal(matriz)
-    rellenar_terrenos(matriz)
-    return matriz
 
+ruta_salida = os.path.join("assets", "salida.jpeg")
 
 def convertir_a_objetos(matriz):
     """
@@ -82,26 +36,80 @@ def convertir_a_objetos(matriz):
     return nuevo
 
 
-def colocar_salida(mapa_objetos):
+def colocar_salida(grilla):
     """Define la salida en la esquina inferior-derecha."""
-    global img_salida
-    img_salida = cargar_imagen_salida()
-    return filas - 1, columnas - 1
+    return posicion_salida(grilla)
 
 
-def dibujar_salida(window, fila, col):
+def dibujar_salida(window, fila, col, camara=None):
     """Dibuja la imagen de salida."""
-    x = col * tam_tile
-    y = fila * tam_tile
-    img = pygame.transform.scale(img_salida, (tam_tile, tam_tile))
+    if camara is not None:
+        if not camara.visible(fila, col):
+            return
+        x, y = camara.a_pantalla(fila, col)
+    else:
+        x = col * tam_tile
+        y = fila * tam_tile
+    img = obtener_escalada(ruta_salida, tam_tile, tam_tile)
     window.blit(img, (x, y))
 
 
-def dibujar_mapa(window, mapa_objetos):
+def dibujar_region(window, grilla, fila0, col0, filas_vista, columnas_vista):
+    """
+    Objetivo:
+        Dibujar solo las celdas del rectángulo visible, con la celda
+        (fila0, col0) en la esquina superior-izquierda de la ventana.
+    """
+    # Una superficie por código de terreno; luego solo blits
+    superficies = superficies_por_codigo(tam_tile)
+    bloque = grilla.celdas[fila0:fila0 + filas_vista, col0:col0 + columnas_vista]
+    for f, fila in enumerate(bloque.tolist()):
+        y = f * tam_tile
+        for c, codigo in enumerate(fila):
+            window.blit(superficies[codigo], (c * tam_tile, y))
+
+
+def dibujar_mapa(window, grilla):
     """Dibuja todo el mapa en pantalla."""
-    for f in range(filas):
-        for c in range(columnas):
-            x = c * tam_tile
-            y = f * tam_tile
-            mapa_objetos[f][c].draw(window, x, y, tam_tile)
+    dibujar_region(window, grilla, 0, 0, grilla.filas, grilla.columnas)
+
 
+
+def crear_fondo_mapa(grilla, salida_fila, salida_col, camara):
+    """
+    Objetivo:
+        Pre-renderizar la parte visible del mapa y la salida en una
+        superficie fuera de pantalla. El terreno no cambia durante
+        la partida, así que cada frame solo copia trozos de ella;
+        solo se vuelve a crear cuando la cámara se desplaza.
+    """
+    fondo = pygame.Surface((camara.ancho, camara.alto))
+    if pygame.display.get_surface() is not None:
+        fondo = fondo.convert()
+    dibujar_region(fondo, grilla, camara.fila0, camara.col0,
+                   camara.filas_vista, camara.columnas_vista)
+    dibujar_salida(fondo, salida_fila, salida_col, camara)
+    return fondo
+
+
+def rect_celda(fila, col, camara):
+    """Retorna el rectángulo en pantalla que ocupa la celda."""
+    x, y = camara.a_pantalla(fila, col)
+    return pygame.Rect(x, y, tam_tile, tam_tile)
+
+
+def restaurar_celdas(window, fondo, celdas, camara):
+    """
+    Objetivo:
+        Copiar desde el fondo las celdas indicadas (borra lo que
+        se dibujó encima en el frame anterior).
+    Salida: lista de rectángulos modificados, para display.update
+    Restricciones: las celdas fuera de la vista se ignoran
+    """
+    rects = []
+    for fila, col in celdas:
+        if camara.visible(fila, col):
+            rect = rect_celda(fila, col, camara)
+            window.blit(fondo, rect, rect)
+            rects.append(rect)
+    return rects
@@ -0,0 +1,370 @@
+# motor.py
+
+import random
+import numpy as np
+from laberinto import posicion_salida
+from jugador import Jugador
+from enemigo import EnemigoPool
+from trampas import TrampaManager
+from ocupacion import IndiceOcupacion
+from rutas import CampoDistancias
+from perfilador import Perfilador
+
+# Objetivo:
+#   Motor del juego sin pygame: el estado completo de una partida
+#   (jugador, enemigos, trampas, energía, puntos y fin de juego) y un
+#   paso de simulación que avanza un tick con las acciones del jugador.
+#   main.py lo usa con ventana y vista.py lo dibuja; sin pantalla se
+#   pueden correr miles de ticks por segundo para pruebas y balance.
+#   Todo el azar de una partida sale de un solo generador con semilla:
+#   la misma semilla, el mismo mapa y las mismas acciones por tick dan
+#   exactamente la misma partida.
+# Restricciones:
+#   No importar pygame aquí (ni módulos que lo importen).
+#   No usar el módulo random global dentro de la partida.
+
+# Cantidad de enemigos y ticks entre sus movimientos por dificultad
+dificultades = {
+    "facil": (2, 12),   # Más lentos
+    "medio": (3, 8),
+    "dificil": (4, 4),  # Más rápidos
+}
+
+# Acciones de movimiento que entiende EstadoJuego.paso
+# (además: "trampa", "correr" y "caminar")
+movimientos_accion = {
+    "arriba": (-1, 0),
+    "abajo": (1, 0),
+    "izquierda": (0, -1),
+    "derecha": (0, 1),
+}
+
+# Enemigos que hay que atrapar para ganar en modo cazador
+meta_atrapados = 5
+
+# Celdas que revisa el campo de distancias de los enemigos cada vez que
+# el jugador se mueve: en mapas grandes el costo por movimiento no crece
+# con el mapa. Los enemigos que quedan fuera siguen el campo completo del
+# mapa, que avanza nodos_completo_por_tick celdas en cada tick
+nodos_campo = 8192
+nodos_completo_por_tick = 4096
+
+# Fases de EstadoJuego.paso que se miden con el perfilador
+fases_motor = ("jugador", "enemigos", "trampas", "modo")
+
+
+def nueva_semilla():
+    """Retorna una semilla al azar para una partida nueva."""
+    return random.randrange(2 ** 32)
+
+
+def obtener_posicion_valida(grilla, rng):
+    """
+    # Objetivo: Encontrar una posición aleatoria donde puede estar un enemigo
+    # Entrada: grilla - objeto Grilla del mapa
+    #          rng - generador de NumPy de la partida
+    # Salida: (fila, columna) - tupla con coordenadas válidas
+    # Restricciones: Evitar bucle infinito con máximo de intentos
+    """
+    intentos = 0
+    # Intentar hasta 100 veces encontrar posición válida
+    while intentos < 100:
+        fila = int(rng.integers(grilla.filas))
+        col = int(rng.integers(grilla.columnas))
+        # Verificar si el enemigo puede estar en esta celda
+        if grilla.paso_enemigo[fila, col]:
+            return fila, col
+        intentos += 1
+    # Si no encuentra posición válida, usar posición por defecto
+    return 0, 0
+
+
+def crear_enemigos(grilla, cantidad, velocidad_movimiento, rng):
+    """
+    # Objetivo: Crear múltiples enemigos en posiciones válidas del mapa
+    # Entrada: 
+    #   grilla - objeto Grilla del mapa
+    #   cantidad - número de enemigos a crear
+    #   velocidad_movimiento - ticks entre movimientos según la dificultad
+    #   rng - generador de NumPy de la partida (el pool lo sigue usando)
+    # Salida: enemigos - objeto EnemigoPool con todos los enemigos
+    # Restricciones: cantidad debe ser número positivo; el pool mantiene
+    #   un IndiceOcupacion para las consultas de colisión
+    """
+    filas_inicio = []
+    cols_inicio = []
+    for i in range(cantidad):
+        # Obtener posición válida para cada enemigo
+        fila, col = obtener_posicion_valida(grilla, rng)
+        filas_inicio.append(fila)
+        cols_inicio.append(col)
+    indice = IndiceOcupacion(grilla.filas, grilla.columnas)
+    return EnemigoPool(filas_inicio, cols_inicio, velocidad_movimiento, rng=rng, indice=indice)
+
+
+def reubicar_enemigo(enemigos, indice, grilla):
+    """
+    # Objetivo: Mandar a un enemigo a otra posición válida (respawn)
+    # Entrada: enemigos - objeto EnemigoPool, indice - enemigo, grilla - objeto Grilla
+    # Salida: None (modifica la posición del enemigo)
+    # Restricciones: Usa el generador del pool (el de la partida)
+    """
+    nueva_fila, nueva_col = obtener_posicion_valida(grilla, enemigos.rng)
+    enemigos.reubicar(indice, nueva_fila, nueva_col)
+
+
+def verificar_colision_trampas(enemigos, trampas, grilla):
+    """
+    # Objetivo: Verificar si enemigos pisaron trampas y manejarlo
+    # Entrada:
+    #   enemigos - objeto EnemigoPool
+    #   trampas - objeto TrampaManager
+    #   grilla - objeto Grilla del mapa
+    # Salida: puntos_ganados - puntos por eliminar enemigos
+    # Restricciones: Solo elimina un enemigo por trampa
+    """
+    puntos_ganados = 0  # Contador de puntos
+    enemigos_eliminados = []  # Índices de enemigos que pisaron trampas
+    
+    # Todos los enemigos contra la capa de trampas en una sola consulta
+    for indice in np.flatnonzero(trampas.pisadas(enemigos.fila, enemigos.col)):
+        fila, col = int(enemigos.fila[indice]), int(enemigos.col[indice])
+        if not trampas.hay_trampa(fila, col):
+            continue  # Otro enemigo ya gastó esta trampa
+        # Enemigo pisó trampa - eliminarla
+        trampas.eliminar_trampa(fila, col)
+        puntos_ganados += 50  # Bonus por eliminar enemigo
+        enemigos_eliminados.append(indice)  # Marcar para respawn
+    
+    # Reposicionar enemigos eliminados
+    for indice in enemigos_eliminados:
+        reubicar_enemigo(enemigos, indice, grilla)
+    
+    return puntos_ganados
+
+
+def verificar_victoria_escapa(jugador, salida_fila, salida_col):
+    """
+    # Objetivo: Verificar si jugador llegó a la salida en modo escapa
+    # Entrada:
+    #   jugador - objeto Jugador con posición
+    #   salida_fila, salida_col - coordenadas de la salida
+    # Salida: True si ganó, False si no
+    # Restricciones: Solo aplica para modo escapa
+    """
+    return jugador.fila == salida_fila and jugador.col == salida_col
+
+
+def verificar_derrota_escapa(jugador, enemigos):
+    """
+    # Objetivo: Verificar si enemigo atrapó al jugador en modo escapa
+    # Entrada:
+    #   jugador - objeto Jugador
+    #   enemigos - objeto EnemigoPool
+    # Salida: True si perdió, False si no
+    # Restricciones: Solo aplica para modo escapa
+    """
+    return enemigos.indice.hay_alguien(jugador.fila, jugador.col)
+
+
+def verificar_victoria_cazador(jugador, enemigos):
+    """
+    # Objetivo: Verificar si el jugador atrapó a todos los enemigos en modo cazador
+    # Entrada:
+    #   jugador - objeto Jugador
+    #   enemigos - objeto EnemigoPool
+    # Salida: True si ganó, False si no
+    # Restricciones: Solo aplica para modo cazador
+    """
+    # Contar cuántos enemigos han sido atrapados (están en la misma posición que jugador)
+    enemigos_atrapados = enemigos.en_celda(jugador.fila, jugador.col).size
+    
+    # Victoria: atrapar a todos los enemigos (3 en este caso)
+    return enemigos_atrapados >= 3
+
+
+def verificar_derrota_cazador(puntuacion):
+    """
+    # Objetivo: Verificar si el jugador perdió en modo cazador (puntos <= 0)
+    # Entrada: puntuacion - puntos actuales del jugador
+    # Salida: True si perdió, False si no
+    # Restricciones: Solo aplica para modo cazador
+    """
+    return puntuacion <= 0
+
+
+class EstadoJuego:
+    """
+    # Objetivo: Guardar el estado de una partida y avanzarlo tick a tick
+    # Entrada: grilla - objeto Grilla del mapa
+    #          modo - "escapa" o "cazador"
+    #          cantidad_enemigos, velocidad_enemigos - ver dificultades
+    #          ticks_por_segundo - duración de un tick (para tiempos y bonos)
+    #          semilla - semilla del azar de la partida (nueva si se omite)
+    #          limite_trampas - trampas activas a la vez
+    #          perfilador - Perfilador con las fases_motor (uno apagado si se omite)
+    #          nodos_campo, nodos_completo_por_tick - límites del campo de
+    #            distancias de los enemigos (nodos_campo None = campo entero
+    #            cada vez; nodos_completo_por_tick 0 = sin campo completo)
+    # Salida: Objeto EstadoJuego
+    # Restricciones: resultado queda en None mientras se juega y pasa a
+    #   "victoria" o "derrota" cuando la partida termina
+    """
+
+    def __init__(self, grilla, modo, cantidad_enemigos, velocidad_enemigos, ticks_por_segundo=30,
+                 semilla=None, limite_trampas=3, perfilador=None, nodos_campo=nodos_campo,
+                 nodos_completo_por_tick=nodos_completo_por_tick):
+        self.grilla = grilla
+        self.modo = modo
+        self.dt = 1.0 / ticks_por_segundo
+        self.ticks = 0
+        self.tiempo = 0.0  # Segundos de simulación
+
+        # Único generador de azar de la partida
+        self.semilla = semilla if semilla is not None else nueva_semilla()
+        self.rng = np.random.default_rng(self.semilla)
+
+        # Personajes y objetos del juego
+        self.salida = posicion_salida(grilla)
+        self.jugador = Jugador(0, 0)  # Jugador en esquina superior izquierda
+        self.trampas = TrampaManager(grilla.filas, grilla.columnas, limite_trampas)
+        self.enemigos = crear_enemigos(grilla, cantidad_enemigos, velocidad_enemigos, self.rng)
+
+        # Mapa de distancias desde el jugador, compartido por todos los enemigos
+        # (se recalcula alrededor del jugador cuando se mueve)
+        self.campo = CampoDistancias(grilla.paso_enemigo, max_nodos=nodos_campo)
+        self.nodos_completo_por_tick = nodos_completo_por_tick
+
+        # Puntos iniciales según el modo
+        self.puntuacion = 100 if modo == "cazador" else 0
+        self.contador_atrapados = 0  # Enemigos atrapados (modo cazador)
+        self.resultado = None
+
+        self.perfilador = perfilador if perfilador is not None else Perfilador(fases_motor)
+
+    def terminado(self):
+        """Retorna True si la partida ya terminó."""
+        return self.resultado is not None
+
+    def aplicar_accion(self, accion):
+        """
+        # Objetivo: Aplicar una acción del jugador
+        # Entrada: accion - "arriba", "abajo", "izquierda", "derecha",
+        #          "trampa", "correr" o "caminar"
+        # Salida: None (modifica el estado)
+        # Restricciones: Las acciones desconocidas lanzan ValueError
+        """
+        jugador = self.jugador
+        if accion in movimientos_accion:
+            df, dc = movimientos_accion[accion]
+            jugador.mover(df, dc, self.grilla)  # Una celda por acción
+        elif accion == "trampa":
+            self.trampas.colocar_trampa(jugador.fila, jugador.col, self.tiempo)
+        elif accion == "correr":
+            jugador.iniciar_correr()
+        elif accion == "caminar":
+            jugador.detener_correr()
+        else:
+            raise ValueError(f"acción desconocida: {accion}")
+
+    def paso(self, acciones=()):
+        """
+        # Objetivo: Avanzar la partida un tick
+        # Entrada: acciones - acciones del jugador para este tick, en orden
+        # Salida: None (modifica el estado)
+        # Restricciones: No hace nada si la partida ya terminó
+        """
+        if self.terminado():
+            return
+        self.ticks += 1
+        self.tiempo = self.ticks * self.dt
+
+        for accion in acciones:
+            self.aplicar_accion(accion)
+
+        jugador = self.jugador
+        enemigos = self.enemigos
+        grilla = self.grilla
+        perfilador = self.perfilador
+
+        # ACTUALIZAR ENERGÍA DEL JUGADOR
+        with perfilador.medir("jugador"):
+            jugador.actualizar()
+
+        # MOVIMIENTO DE ENEMIGOS
+        with perfilador.medir("enemigos"):
+            # El campo se lee solo en los ticks en que algún enemigo se mueve
+            if self.modo == "escapa":
+                self.campo.avanzar_completo(self.nodos_completo_por_tick)
+                enemigos.mover_hacia(jugador.fila, jugador.col, grilla, self.campo)
+            else:
+                enemigos.mover_lejos(jugador.fila, jugador.col, grilla, self.campo)
+
+        # VERIFICAR TRAMPAS
+        with perfilador.medir("trampas"):
+            self.puntuacion += verificar_colision_trampas(enemigos, self.trampas, grilla)
+
+        with perfilador.medir("modo"):
+            if self.modo == "escapa":
+                self.paso_escapa()
+            else:
+                self.paso_cazador()
+
+    def paso_escapa(self):
+        """
+        # Objetivo: Revisar victoria y derrota en modo escapa
+        # Entrada: None
+        # Salida: None (puede fijar resultado)
+        """
+        salida_fila, salida_col = self.salida
+        # VICTORIA: Llegar a la salida
+        if verificar_victoria_escapa(self.jugador, salida_fila, salida_col):
+            bonus_tiempo = max(0, 1000 - int(self.tiempo * 10))  # Más puntos por menos tiempo
+            self.puntuacion += bonus_tiempo
+            self.resultado = "victoria"
+        # DERROTA: Enemigo atrapa al jugador
+        elif verificar_derrota_escapa(self.jugador, self.enemigos):
+            self.resultado = "derrota"
+
+    def paso_cazador(self):
+        """
+        # Objetivo: Lógica específica del modo cazador
+        # - Ganar puntos persiguiendo enemigos (estar cerca)
+        # - Perder puntos si enemigos escapan
+        # - Victoria: atrapar meta_atrapados enemigos
+        # - Derrota: quedarse sin puntos
+        """
+        jugador = self.jugador
+        enemigos = self.enemigos
+        salida_fila, salida_col = self.salida
+
+        # PUNTOS POR PERSEGUIR: Ganar puntos por estar cerca de enemigos
+        cerca = enemigos.contar_cerca(jugador.fila, jugador.col, 2)  # Enemigos a distancia 0, 1, 2
+        self.puntuacion += 3 * int(cerca[0] + cerca[1])  # Muy cerca - más puntos
+        self.puntuacion += int(cerca[2])                 # Cerca - puntos normales
+
+        # PENALIZACIÓN POR TIEMPO: Ir perdiendo puntos gradualmente
+        if self.rng.random() < 0.02:  # 2% de probabilidad cada tick
+            self.puntuacion -= 2
+
+        # PENALIZACIÓN POR ENEMIGOS EN SALIDA: Si enemigo llega a salida, perder muchos puntos
+        for indice in enemigos.en_celda(salida_fila, salida_col):
+            self.puntuacion -= 100  # Gran penalización
+            # Reposicionar enemigo que escapó
+            reubicar_enemigo(enemigos, indice, self.grilla)
+
+        # BONUS POR ATRAPAR ENEMIGOS: Ganar puntos cuando atrapas un enemigo
+        for indice in enemigos.en_celda(jugador.fila, jugador.col):
+            self.puntuacion += 100  # Bonus por atrapar enemigo
+            self.contador_atrapados += 1  # Contar enemigo atrapado
+            # Reposicionar enemigo atrapado
+            reubicar_enemigo(enemigos, indice, self.grilla)
+
+        # VICTORIA: Atrapar a cierta cantidad de enemigos
+        if self.contador_atrapados >= meta_atrapados:
+            bonus_tiempo = max(0, 500 - int(self.tiempo * 5))  # Bonus por rapidez
+            self.puntuacion += bonus_tiempo
+            self.resultado = "victoria"
+        # DERROTA: Quedarse sin puntos
+        elif verificar_derrota_cazador(self.puntuacion):
+            self.resultado = "derrota"
@@ -0,0 +1,121 @@
+# ocupacion.py
+
+import numpy as np
+
+# Objetivo:
+#   Índice de ocupación por celda para responder rápido "quién está en
+#   esta celda" (O(1)) y "quién está a distancia r" (O(r²)) sin recorrer
+#   la lista completa de entidades. Las entidades avisan al índice cuando
+#   se mueven; el índice guarda:
+#   - conteo: arreglo (filas, columnas) con cuántas entidades hay en cada celda
+#   - ocupantes: diccionario (fila, col) -> conjunto de ids, solo de celdas ocupadas
+# Restricciones:
+#   Los ids son enteros (por ejemplo el índice del enemigo en EnemigoPool).
+#   La distancia del radio es Manhattan, igual que el movimiento.
+
+
+class IndiceOcupacion:
+    """
+    Objetivo:
+        Saber qué entidades hay en cada celda del mapa.
+    """
+    def __init__(self, filas, columnas):
+        self.filas = filas
+        self.columnas = columnas
+        self.conteo = np.zeros((filas, columnas), dtype=np.int32)
+        self.ocupantes = {}
+
+    def agregar(self, ident, fila, col):
+        """Registra la entidad ident en la celda."""
+        self.conteo[fila, col] += 1
+        self.ocupantes.setdefault((fila, col), set()).add(ident)
+
+    def quitar(self, ident, fila, col):
+        """Saca la entidad ident de la celda."""
+        celda = self.ocupantes.get((fila, col))
+        if celda is None or ident not in celda:
+            return
+        celda.discard(ident)
+        if not celda:
+            del self.ocupantes[(fila, col)]
+        self.conteo[fila, col] -= 1
+
+    def mover(self, ident, fila, col, nueva_fila, nueva_col):
+        """Cambia la entidad de una celda a otra."""
+        self.quitar(ident, fila, col)
+        self.agregar(ident, nueva_fila, nueva_col)
+
+    def agregar_varios(self, idents, filas, cols):
+        """Registra muchas entidades a la vez (arreglos del mismo largo)."""
+        np.add.at(self.conteo, (filas, cols), 1)
+        ocupantes = self.ocupantes
+        for ident, fila, col in zip(np.asarray(idents).tolist(), np.asarray(filas).tolist(),
+                                    np.asarray(cols).tolist()):
+            ocupantes.setdefault((fila, col), set()).add(ident)
+
+    def mover_varios(self, idents, filas, cols, nuevas_filas, nuevas_cols):
+        """
+        Objetivo:
+            Mover muchas entidades a la vez. El conteo se actualiza con
+            NumPy; el diccionario, una entrada por entidad movida.
+        Restricciones: filas/cols deben ser las celdas donde estaban registradas
+        """
+        np.subtract.at(self.conteo, (filas, cols), 1)
+        np.add.at(self.conteo, (nuevas_filas, nuevas_cols), 1)
+        ocupantes = self.ocupantes
+        for ident, fila, col, nueva_fila, nueva_col in zip(
+                np.asarray(idents).tolist(), np.asarray(filas).tolist(), np.asarray(cols).tolist(),
+                np.asarray(nuevas_filas).tolist(), np.asarray(nuevas_cols).tolist()):
+            celda = ocupantes[(fila, col)]
+            celda.discard(ident)
+            if not celda:
+                del ocupantes[(fila, col)]
+            ocupantes.setdefault((nueva_fila, nueva_col), set()).add(ident)
+
+    def hay_alguien(self, fila, col):
+        """Retorna True si hay al menos una entidad en la celda."""
+        return self.conteo[fila, col] > 0
+
+    def en_celda(self, fila, col):
+        """Conjunto de ids en la celda (vacío si no hay nadie)."""
+        return self.ocupantes.get((fila, col), set())
+
+    def ventana(self, fila, col, radio):
+        """
+        Objetivo:
+            Recorte del conteo alrededor de la celda (cortado en los
+            bordes) y la distancia Manhattan de cada celda del recorte.
+        Salida: (fila0, col0, conteo, distancias)
+        """
+        fila0 = max(0, fila - radio)
+        col0 = max(0, col - radio)
+        fila1 = min(self.filas, fila + radio + 1)
+        col1 = min(self.columnas, col + radio + 1)
+        distancias = (np.abs(np.arange(fila0, fila1) - fila)[:, None] +
+                      np.abs(np.arange(col0, col1) - col)[None, :])
+        return fila0, col0, self.conteo[fila0:fila1, col0:col1], distancias
+
+    def en_radio(self, fila, col, radio):
+        """
+        Objetivo:
+            Entidades a distancia Manhattan <= radio de la celda.
+        Salida: lista de tuplas (ident, distancia)
+        """
+        fila0, col0, conteo, distancias = self.ventana(fila, col, radio)
+        resultado = []
+        for df, dc in zip(*np.nonzero((conteo > 0) & (distancias <= radio))):
+            distancia = int(distancias[df, dc])
+            for ident in self.ocupantes[(fila0 + int(df), col0 + int(dc))]:
+                resultado.append((ident, distancia))
+        return resultado
+
+    def contar_por_distancia(self, fila, col, radio):
+        """
+        Objetivo:
+            Cuántas entidades hay a cada distancia 0..radio de la celda.
+        Salida: arreglo de largo radio + 1
+        """
+        _, _, conteo, distancias = self.ventana(fila, col, radio)
+        dentro = distancias <= radio
+        return np.bincount(distancias[dentro], weights=conteo[dentro],
+                           minlength=radio + 1).astype(np.int64)
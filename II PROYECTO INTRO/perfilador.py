@@ -0,0 +1,144 @@
+# perfilador.py
+
+import json
+import time
+import numpy as np
+
+# Objetivo:
+#   Medir cuánto tarda cada fase de cada frame (eventos, lógica, dibujo,
+#   display.update...) para encontrar qué causa los tirones.
+#   Los tiempos se toman con time.perf_counter_ns (reloj monotónico) y se
+#   guardan en un buffer circular de los últimos `capacidad` frames:
+#   - duraciones: arreglo (capacidad, fases + 1) en milisegundos; una
+#     fase que corre varias veces en un frame (un tick por vuelta) suma
+#     sus tiempos; la última columna es el frame completo
+#   - eventos: por frame, la lista (fase, inicio, duración) en ns para
+#     exportar la traza en formato Chrome (chrome://tracing, Perfetto)
+# Restricciones:
+#   Apagado, medir() retorna un objeto que no hace nada: el costo es una
+#   llamada a método por fase. No usa pygame (el motor también lo usa).
+
+
+class SinMedicion:
+    """Contexto vacío que retorna medir() con el perfilador apagado."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+
+sin_medicion = SinMedicion()
+
+
+class Medicion:
+    """Contexto que mide una fase y la anota en el frame actual."""
+    def __init__(self, perfilador, fase):
+        self.perfilador = perfilador
+        self.fase = fase
+        self.inicio = 0
+
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *excepcion):
+        duracion = time.perf_counter_ns() - self.inicio
+        perfilador = self.perfilador
+        fila = perfilador.frame % perfilador.capacidad
+        perfilador.duraciones[fila, self.fase] += duracion / 1e6
+        perfilador.eventos[fila].append((self.fase, self.inicio, duracion))
+        return False
+
+
+class Perfilador:
+    """
+    Objetivo:
+        Guardar los tiempos por fase de los últimos frames.
+    Entrada:
+        fases - nombres de las fases, en el orden en que se muestran
+        capacidad - frames que guarda el buffer circular
+        activo - si empieza midiendo
+    Uso:
+        perfilador.nuevo_frame()            # al inicio de cada frame
+        with perfilador.medir("dibujo"):    # alrededor de cada fase
+            ...
+    """
+    def __init__(self, fases, capacidad=600, activo=False):
+        self.fases = tuple(fases)
+        self.indice_fase = {fase: i for i, fase in enumerate(self.fases)}
+        self.capacidad = capacidad
+        self.duraciones = np.zeros((capacidad, len(self.fases) + 1))
+        self.inicios = np.zeros(capacidad, dtype=np.int64)
+        self.eventos = [[] for _ in range(capacidad)]
+        self.frame = -1            # Frames empezados desde que se activó
+        self.inicio_frame = None   # perf_counter_ns del frame actual
+        self.activo = activo
+
+    def alternar(self):
+        """Prende o apaga la medición. Retorna el nuevo estado."""
+        self.activo = not self.activo
+        self.inicio_frame = None  # El frame en curso no se midió completo
+        return self.activo
+
+    def nuevo_frame(self):
+        """Cierra el frame anterior y empieza uno nuevo en el buffer."""
+        if not self.activo:
+            return
+        ahora = time.perf_counter_ns()
+        if self.inicio_frame is not None:
+            fila = self.frame % self.capacidad
+            self.duraciones[fila, -1] = (ahora - self.inicio_frame) / 1e6
+        self.frame += 1
+        fila = self.frame % self.capacidad
+        self.duraciones[fila] = 0
+        self.inicios[fila] = ahora
+        self.eventos[fila] = []
+        self.inicio_frame = ahora
+
+    def medir(self, fase):
+        """Contexto que mide la fase en el frame actual (o no hace nada si está apagado)."""
+        if not self.activo or self.inicio_frame is None:
+            return sin_medicion
+        return Medicion(self, self.indice_fase[fase])
+
+    def frames_completos(self):
+        """Filas del buffer con frames ya cerrados, de la más vieja a la más nueva."""
+        cantidad = min(self.frame, self.capacidad - 1)
+        filas = [(self.frame - cantidad + i) % self.capacidad for i in range(cantidad)]
+        return [fila for fila in filas if self.duraciones[fila, -1] > 0]
+
+    def estadisticas(self):
+        """
+        Objetivo:
+            Percentiles de tiempo por fase en los frames guardados.
+        Salida: lista de (nombre, p50, p95, p99) en ms, con "frame" al final;
+            vacía si todavía no hay frames completos
+        """
+        filas = self.frames_completos()
+        if not filas:
+            return []
+        percentiles = np.percentile(self.duraciones[filas], [50, 95, 99], axis=0)
+        nombres = self.fases + ("frame",)
+        return [(nombre, *percentiles[:, i]) for i, nombre in enumerate(nombres)]
+
+    def exportar(self, nombre_archivo):
+        """
+        Objetivo:
+            Escribir los frames guardados como traza de Chrome (JSON con
+            eventos "X" de duración, en microsegundos).
+        Salida: cantidad de frames exportados
+        """
+        filas = self.frames_completos()
+        origen = int(self.inicios[filas[0]]) if filas else 0
+        eventos = []
+        for numero, fila in enumerate(filas):
+            eventos.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                            "ts": (int(self.inicios[fila]) - origen) / 1000,
+                            "dur": self.duraciones[fila, -1] * 1000, "args": {"frame": numero}})
+            for fase, inicio, duracion in self.eventos[fila]:
+                eventos.append({"name": self.fases[fase], "ph": "X", "pid": 1, "tid": 1,
+                                "ts": (inicio - origen) / 1000, "dur": duracion / 1000})
+        with open(nombre_archivo, "w", encoding="utf-8") as archivo:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, archivo)
+        return len(filas)
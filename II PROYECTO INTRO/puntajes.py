@@ -0,0 +1,265 @@
+# puntajes.py
+
+import heapq
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# Objetivo:
+#   Guardar todos los puntajes en una base SQLite en modo WAL, en vez de
+#   reescribir top5_<modo>.txt en cada partida.
+#   - Cada resultado es una fila nueva (no se pierde ninguno); cada
+#     escritura es una transacción, así que es atómica.
+#   - Los índices (modo, puntos), (modo, dificultad, puntos) y
+#     (nombre, modo, puntos) permiten sacar el top N leyendo solo N
+#     filas del índice, aunque haya millones de puntajes.
+#   - La primera vez se importan los top5_<modo>.txt que existan; los
+#     archivos importados se anotan para no repetirlos.
+#   ServicioPuntajes vive todo el proceso: guarda el top k de cada modo
+#   en memoria (un montículo acotado, O(log k) por puntaje) y escribe en
+#   la base desde un hilo aparte, en lotes, para que las pantallas de fin
+#   de partida nunca esperen al disco.
+# Restricciones:
+#   Los errores de SQLite no se esconden: suben como sqlite3.Error.
+#   Una conexión de SQLite se usa solo en el hilo que la creó.
+
+archivo_base = "puntajes.db"
+modos = ("escapa", "cazador")
+
+esquema = """
+CREATE TABLE IF NOT EXISTS puntajes (
+    id INTEGER PRIMARY KEY,
+    modo TEXT NOT NULL,
+    dificultad TEXT,
+    nombre TEXT NOT NULL,
+    puntos INTEGER NOT NULL,
+    fecha REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS puntajes_modo ON puntajes (modo, puntos DESC, id);
+CREATE INDEX IF NOT EXISTS puntajes_dificultad ON puntajes (modo, dificultad, puntos DESC, id);
+CREATE INDEX IF NOT EXISTS puntajes_nombre ON puntajes (nombre, modo, puntos DESC, id);
+CREATE TABLE IF NOT EXISTS archivos_importados (
+    archivo TEXT PRIMARY KEY
+);
+"""
+
+
+def leer_archivo_texto(nombre_archivo):
+    """
+    Objetivo:
+        Leer un top5_<modo>.txt del formato viejo ("nombre,puntos" por línea).
+    Salida: lista de (nombre, puntos); las líneas mal formadas se saltan
+    """
+    puntajes = []
+    with open(nombre_archivo, encoding="utf-8") as archivo:
+        for linea in archivo:
+            nombre, separador, puntos = linea.strip().rpartition(",")
+            if not separador:
+                continue
+            try:
+                puntajes.append((nombre, int(puntos)))
+            except ValueError:
+                continue
+    return puntajes
+
+
+class TablaPuntajes:
+    """
+    Objetivo:
+        Guardar puntajes y consultar los mejores.
+    Entrada:
+        nombre_archivo - base de datos (se crea si no existe)
+        carpeta_textos - dónde buscar los top5_<modo>.txt viejos (None = no importar)
+        sincronizar - PRAGMA synchronous: "OFF", "NORMAL" (en WAL no pierde
+            consistencia, sin fsync por transacción) o "FULL" (fsync siempre)
+    """
+    def __init__(self, nombre_archivo=archivo_base, carpeta_textos=".", sincronizar="NORMAL"):
+        if sincronizar not in ("OFF", "NORMAL", "FULL"):
+            raise ValueError(f"sincronizar desconocido: {sincronizar}")
+        self.conexion = sqlite3.connect(nombre_archivo)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute(f"PRAGMA synchronous={sincronizar}")
+        self.conexion.executescript(esquema)
+        if carpeta_textos is not None:
+            self.importar_textos(carpeta_textos)
+
+    def importar_textos(self, carpeta):
+        """Importa los top5_<modo>.txt de la carpeta que no se hayan importado antes."""
+        for modo in modos:
+            ruta = os.path.join(carpeta, f"top5_{modo}.txt")
+            if not os.path.exists(ruta):
+                continue
+            clave = os.path.abspath(ruta)
+            with self.conexion:
+                ya = self.conexion.execute("SELECT 1 FROM archivos_importados WHERE archivo = ?",
+                                           (clave,)).fetchone()
+                if ya:
+                    continue
+                fecha = os.path.getmtime(ruta)
+                self.conexion.executemany(
+                    "INSERT INTO puntajes (modo, dificultad, nombre, puntos, fecha) VALUES (?, NULL, ?, ?, ?)",
+                    [(modo, nombre, puntos, fecha) for nombre, puntos in leer_archivo_texto(ruta)])
+                self.conexion.execute("INSERT INTO archivos_importados VALUES (?)", (clave,))
+
+    def guardar(self, nombre, puntos, modo, dificultad=None):
+        """Agrega un resultado (una transacción)."""
+        with self.conexion:
+            self.conexion.execute(
+                "INSERT INTO puntajes (modo, dificultad, nombre, puntos, fecha) VALUES (?, ?, ?, ?, ?)",
+                (modo, dificultad, nombre, int(puntos), time.time()))
+
+    def guardar_varios(self, resultados):
+        """Agrega muchos (nombre, puntos, modo, dificultad) en una sola transacción."""
+        ahora = time.time()
+        with self.conexion:
+            self.conexion.executemany(
+                "INSERT INTO puntajes (nombre, puntos, modo, dificultad, fecha) VALUES (?, ?, ?, ?, ?)",
+                [(nombre, int(puntos), modo, dificultad, ahora) for nombre, puntos, modo, dificultad in resultados])
+
+    def top(self, modo, cantidad=5, dificultad=None, nombre=None):
+        """
+        Objetivo:
+            Los mejores puntajes del modo, opcionalmente de una dificultad
+            o de un jugador. En empate gana el más antiguo.
+        Salida: lista de (nombre, puntos) de mayor a menor
+        """
+        condiciones = ["modo = ?"]
+        parametros = [modo]
+        if dificultad is not None:
+            condiciones.append("dificultad = ?")
+            parametros.append(dificultad)
+        if nombre is not None:
+            condiciones.append("nombre = ?")
+            parametros.append(nombre)
+        parametros.append(cantidad)
+        consulta = (f"SELECT nombre, puntos FROM puntajes WHERE {' AND '.join(condiciones)} "
+                    "ORDER BY puntos DESC, id LIMIT ?")
+        return self.conexion.execute(consulta, parametros).fetchall()
+
+    def cantidad(self, modo=None):
+        """Cuántos puntajes hay guardados (de un modo o de todos)."""
+        if modo is None:
+            return self.conexion.execute("SELECT COUNT(*) FROM puntajes").fetchone()[0]
+        return self.conexion.execute("SELECT COUNT(*) FROM puntajes WHERE modo = ?", (modo,)).fetchone()[0]
+
+    def cerrar(self):
+        self.conexion.close()
+
+
+class ServicioPuntajes:
+    """
+    Objetivo:
+        Top k por modo en memoria con escritura diferida a la base.
+        - agregar() mete el puntaje al montículo del modo y lo deja en
+          una cola; no toca el disco.
+        - top() responde desde memoria; solo la primera vez puede esperar
+          a que el hilo termine de cargar el top guardado.
+        - Un hilo abre la base, carga el top k guardado de cada modo (en
+          cuanto arranca) y después escribe la cola en lotes.
+    Entrada:
+        nombre_archivo, carpeta_textos, sincronizar - ver TablaPuntajes
+        capacidad - puntajes por modo que se guardan en memoria (k)
+        lote - máximo de puntajes por transacción
+        espera_lote - segundos que se espera a juntar más puntajes
+    Restricciones:
+        Llamar cerrar() antes de salir para escribir lo pendiente. Si el
+        hilo falla, cerrar() lanza su error (los puntajes que quedaron en
+        la cola no se pierden en silencio).
+    """
+    def __init__(self, nombre_archivo=archivo_base, capacidad=5, lote=64, espera_lote=0.2,
+                 sincronizar="NORMAL", carpeta_textos="."):
+        self.nombre_archivo = nombre_archivo
+        self.carpeta_textos = carpeta_textos
+        self.sincronizar = sincronizar
+        self.capacidad = capacidad
+        self.lote = lote
+        self.espera_lote = espera_lote
+
+        # Montículo de mínimos por modo: (puntos, -orden, nombre); arriba
+        # queda el peor, que es el que sale al llegar uno mejor
+        self.montones = {modo: [] for modo in modos}
+        self.orden = 0  # Orden de llegada: en empate gana el más antiguo
+        self.candado = threading.Lock()
+
+        self.cola = queue.Queue()
+        self.cargado = threading.Event()  # El top guardado ya está en memoria
+        self.guardados = 0
+        self.error = None  # Error del hilo, se lanza en cerrar()
+        self.hilo = threading.Thread(target=self.trabajar, name="puntajes", daemon=True)
+        self.hilo.start()
+
+    def meter(self, modo, entrada):
+        """Agrega (puntos, -orden, nombre) al montículo del modo si entra en el top."""
+        monton = self.montones.setdefault(modo, [])
+        if len(monton) < self.capacidad:
+            heapq.heappush(monton, entrada)
+        elif entrada > monton[0]:
+            heapq.heapreplace(monton, entrada)
+
+    def agregar(self, nombre, puntos, modo, dificultad=None):
+        """Registra un resultado: O(log k) en memoria, el disco lo hace el hilo."""
+        puntos = int(puntos)
+        with self.candado:
+            self.meter(modo, (puntos, -self.orden, nombre))
+            self.orden += 1
+        self.cola.put((nombre, puntos, modo, dificultad))
+
+    def top(self, modo, cantidad=None):
+        """Los mejores (nombre, puntos) del modo, de mayor a menor, desde memoria."""
+        self.cargado.wait()  # Sin el top guardado faltarían los de otras sesiones
+        with self.candado:
+            mejores = sorted(self.montones.get(modo, ()), reverse=True)
+        if cantidad is not None:
+            mejores = mejores[:cantidad]
+        return [(nombre, puntos) for puntos, _, nombre in mejores]
+
+    def trabajar(self):
+        """
+        Hilo de fondo: cargar el top guardado y luego escribir los lotes.
+        Un error termina el hilo y queda en self.error para cerrar().
+        """
+        tabla = None
+        try:
+            tabla = TablaPuntajes(self.nombre_archivo, self.carpeta_textos, self.sincronizar)
+            for modo in modos:
+                guardados = tabla.top(modo, self.capacidad)
+                with self.candado:
+                    # Los guardados son más antiguos que los de esta sesión
+                    for i, (nombre, puntos) in enumerate(guardados):
+                        self.meter(modo, (puntos, len(guardados) - i, nombre))
+            self.cargado.set()
+
+            terminar = False
+            while not terminar:
+                pendientes = [self.cola.get()]
+                while pendientes[-1] is not None and len(pendientes) < self.lote:
+                    try:
+                        pendientes.append(self.cola.get(timeout=self.espera_lote))
+                    except queue.Empty:
+                        break
+                if pendientes[-1] is None:
+                    terminar = True
+                    pendientes.pop()
+                if pendientes:
+                    tabla.guardar_varios(pendientes)
+                    self.guardados += len(pendientes)
+        except Exception as error:
+            self.error = error
+        finally:
+            self.cargado.set()  # Aunque la carga falle, top() no se queda esperando
+            if tabla is not None:
+                tabla.cerrar()
+
+    def cerrar(self):
+        """
+        Escribe lo pendiente y termina el hilo (se puede llamar varias veces).
+        Si el hilo falló, lanza su error una vez.
+        """
+        if self.hilo.is_alive():
+            self.cola.put(None)
+            self.hilo.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
@@ -0,0 +1,167 @@
+# recursos.py
+
+import pygame
+import os
+import mmap
+import struct
+import zlib
+
+# Objetivo:
+#   Administrar las imágenes del juego en un solo lugar.
+#   Cada archivo se lee y decodifica una sola vez, y cada
+#   tamaño escalado se guarda para que todos los objetos
+#   compartan la misma superficie.
+#   Si existe assets/paquete.bin (ver empaquetar_assets.py), los sprites
+#   del tamaño del tile salen de ahí: píxeles RGBA ya escalados que se
+#   leen por mmap y se envuelven en superficies sin decodificar JPEG.
+#   El paquete no está en git: main.py lo arma la primera vez que se
+#   juega y lo vuelve a armar si alguna imagen cambió.
+# Restricciones:
+#   Las superficies entregadas son compartidas: no modificarlas.
+
+# Imágenes originales ya decodificadas: ruta -> superficie
+imagenes = {}
+
+# Variantes escaladas y convertidas: (ruta, ancho, alto) -> superficie
+escaladas = {}
+
+# Formato del paquete:
+#   cabecera: firma, versión, cantidad de entradas
+#   índice: por entrada, largo de la ruta + ruta (utf-8, con "/") y
+#     ancho, alto, CRC-32 del contenido del JPEG de origen,
+#     desplazamiento y largo de sus píxeles dentro del archivo
+#   píxeles: RGBA crudo, una imagen tras otra
+archivo_paquete = os.path.join("assets", "paquete.bin")
+firma_paquete = b"PAQA"
+version_paquete = 2
+formato_cabecera_paquete = "<4sBH"
+formato_ruta_paquete = "<H"
+formato_entrada_paquete = "<HHIII"
+
+usar_paquete = True  # False obliga a decodificar los JPEG (para comparar)
+
+# Píxeles del paquete: (ruta, ancho, alto) -> memoryview sobre el mmap.
+# None hasta la primera consulta; vacío si no hay paquete válido
+paquete = None
+mapa_paquete = None  # El mmap queda abierto mientras haya superficies sobre él
+
+
+def clave_ruta(ruta):
+    """Ruta con "/" como separador (el paquete se arma igual en cualquier sistema)."""
+    return ruta.replace(os.sep, "/")
+
+
+def crc_archivo(ruta):
+    """CRC-32 del contenido de un archivo (para saber si cambió)."""
+    with open(ruta, "rb") as archivo:
+        return zlib.crc32(archivo.read())
+
+
+def cargar_paquete(nombre_archivo=archivo_paquete):
+    """
+    Objetivo:
+        Abrir el paquete con mmap y leer su índice. Los píxeles no se
+        copian: cada entrada es una vista sobre el archivo mapeado.
+    Salida: diccionario (ruta, ancho, alto) -> memoryview
+    Restricciones:
+        Un paquete ausente, vacío, truncado, de otra versión o dañado se
+        ignora (se usan los JPEG). Una entrada cuyo JPEG cambió de
+        contenido también: se compara el CRC-32, no la fecha, que cambia
+        al clonar o copiar los archivos.
+    """
+    global paquete, mapa_paquete
+    paquete = {}
+    if not usar_paquete or not os.path.exists(nombre_archivo):
+        return paquete
+    try:
+        with open(nombre_archivo, "rb") as archivo:
+            mapa_paquete = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        datos = memoryview(mapa_paquete)
+        crc_origen = {}  # Cada JPEG se lee una vez aunque esté en varios tamaños
+        firma, version, cantidad = struct.unpack_from(formato_cabecera_paquete, datos)
+        if firma != firma_paquete or version != version_paquete:
+            return paquete
+        posicion = struct.calcsize(formato_cabecera_paquete)
+        entradas = {}
+        for _ in range(cantidad):
+            (largo_ruta,) = struct.unpack_from(formato_ruta_paquete, datos, posicion)
+            posicion += struct.calcsize(formato_ruta_paquete)
+            ruta = bytes(datos[posicion:posicion + largo_ruta]).decode("utf-8")
+            posicion += largo_ruta
+            ancho, alto, crc, desplazamiento, largo = struct.unpack_from(
+                formato_entrada_paquete, datos, posicion)
+            posicion += struct.calcsize(formato_entrada_paquete)
+            if largo != ancho * alto * 4 or desplazamiento + largo > len(datos):
+                return paquete
+            if os.path.exists(ruta):
+                if ruta not in crc_origen:
+                    crc_origen[ruta] = crc_archivo(ruta)
+                if crc_origen[ruta] != crc:
+                    continue  # El JPEG cambió después de armar el paquete
+            entradas[(ruta, ancho, alto)] = datos[desplazamiento:desplazamiento + largo]
+    except (OSError, ValueError, struct.error):
+        # ValueError: mmap de un archivo vacío o ruta mal codificada
+        return paquete
+    paquete = entradas
+    return paquete
+
+
+def cerrar_paquete():
+    """
+    Objetivo:
+        Soltar el paquete abierto (para poder reemplazar el archivo).
+    Restricciones:
+        Solo antes de crear superficies sobre sus píxeles: esas
+        superficies usan la memoria del mmap.
+    """
+    global paquete, mapa_paquete
+    paquete = None
+    if mapa_paquete is not None:
+        mapa_paquete.close()
+        mapa_paquete = None
+
+
+def cargar_imagen(ruta):
+    """
+    Objetivo:
+        Devolver la imagen de la ruta, leyéndola de disco solo la primera vez.
+    """
+    imagen = imagenes.get(ruta)
+    if imagen is None:
+        imagen = pygame.image.load(ruta)
+        imagenes[ruta] = imagen
+    return imagen
+
+
+def obtener_escalada(ruta, ancho, alto):
+    """
+    Objetivo:
+        Devolver la imagen escalada a (ancho, alto) y convertida al
+        formato de la pantalla. Se calcula una vez por tamaño; si el
+        paquete trae ese tamaño no se decodifica el JPEG.
+    Restricciones:
+        Solo se guarda en cache cuando ya existe ventana, porque
+        convert() necesita conocer el formato de la pantalla.
+    """
+    clave = (ruta, ancho, alto)
+    superficie = escaladas.get(clave)
+    if superficie is None:
+        if paquete is None:
+            cargar_paquete()
+        pixeles = paquete.get((clave_ruta(ruta), ancho, alto))
+        if pixeles is not None:
+            superficie = pygame.image.frombuffer(pixeles, (ancho, alto), "RGBA")
+        else:
+            superficie = pygame.transform.scale(cargar_imagen(ruta), (ancho, alto))
+        if pygame.display.get_surface() is not None:
+            superficie = superficie.convert()
+            escaladas[clave] = superficie
+    return superficie
+
+
+def obtener_sprite(nombre, tam):
+    """
+    Objetivo:
+        Atajo para los sprites cuadrados de la carpeta assets.
+    """
+    return obtener_escalada(os.path.join("assets", nombre), tam, tam)
@@ -0,0 +1,65 @@
+# reloj_simulacion.py
+
+import time
+
+# Objetivo:
+#   Separar la velocidad del juego de los FPS de dibujo. La lógica avanza
+#   en pasos fijos (ticks) de 1/ticks_por_segundo segundos; cada frame se
+#   suma el tiempo real transcurrido a un acumulador y se corren los ticks
+#   que quepan. Si la máquina dibuja lento, se corren varios ticks por
+#   frame; si dibuja rápido, algunos frames no corren ninguno.
+# Restricciones:
+#   Para no quedar atrapado después de una pausa larga (arrastrar la
+#   ventana, un breakpoint) se corren a lo más max_pasos ticks por frame.
+
+
+class RelojSimulacion:
+    """
+    Objetivo:
+        Reloj de paso fijo con acumulador.
+    Entrada:
+        ticks_por_segundo - frecuencia de la lógica
+        escala - 1.0 = tiempo real, 2.0 = el doble de rápido, etc.
+        max_pasos - máximo de ticks que se corren en un solo frame
+    """
+    def __init__(self, ticks_por_segundo=30, escala=1.0, max_pasos=10):
+        self.dt = 1.0 / ticks_por_segundo
+        self.escala = escala
+        self.max_pasos = max_pasos
+        self.tiempo = 0.0      # Segundos de simulación transcurridos
+        self.ticks = 0         # Ticks de lógica corridos
+        self.acumulado = 0.0
+        self.ultimo = None
+
+    def reiniciar(self):
+        """Olvida el tiempo real transcurrido (después de una pantalla que bloquea)."""
+        self.ultimo = None
+        self.acumulado = 0.0
+
+    def avanzar(self):
+        """
+        Objetivo:
+            Sumar el tiempo real desde la última llamada.
+        Salida: cantidad de ticks de lógica que hay que correr ahora
+        """
+        ahora = time.perf_counter()
+        if self.ultimo is not None:
+            self.acumulado += (ahora - self.ultimo) * self.escala
+        self.ultimo = ahora
+
+        pasos = int(self.acumulado / self.dt)
+        if pasos > self.max_pasos:
+            pasos = self.max_pasos
+            self.acumulado = 0.0  # Se descarta el atraso en lugar de acumularlo
+        else:
+            self.acumulado -= pasos * self.dt
+        return pasos
+
+    def paso(self):
+        """Registra un tick de lógica (avanza el tiempo de simulación)."""
+        self.ticks += 1
+        self.tiempo = self.ticks * self.dt
+
+    def alfa(self):
+        """Fracción del siguiente tick ya transcurrida (0..1), para interpolar al dibujar."""
+        return self.acumulado / self.dt
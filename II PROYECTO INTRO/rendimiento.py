@@ -0,0 +1,345 @@
+# rendimiento.py
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Dibujo fuera de pantalla
+
+import argparse
+import contextlib
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pygame
+
+# Objetivo:
+#   Medir los caminos calientes del juego siempre de la misma forma y
+#   guardar los resultados en JSON, para comparar un commit con otro:
+#     python rendimiento.py --salida antes.json
+#     python rendimiento.py --salida despues.json --comparar antes.json
+#   Cada caso se mide sobre varios tamaños de mapa y, cuando aplica,
+#   varias cantidades de enemigos. Los mapas salen de semillas fijas.
+#   De cada medición se guardan el mejor tiempo y la mediana.
+#   Los casos con objetivo (ver objetivos) se marcan si el mejor tiempo
+#   lo pasa, y entonces el programa termina con código 1.
+# Restricciones:
+#   Se ejecuta desde la carpeta del juego (usa assets/). El video va al
+#   driver "dummy" de SDL salvo que SDL_VIDEODRIVER diga otra cosa.
+#   Los casos que crecen con el mapa completo (objetos por celda, dibujar
+#   todo el mapa) tienen un tamaño máximo para no agotar la memoria.
+
+from laberinto import generar_mapa, construir_grilla, filas, columnas
+from mapa import convertir_a_objetos, dibujar_mapa, crear_fondo_mapa, colocar_salida, tam_tile
+from terrenos import inicializar_imagenes
+from camara import Camara
+from motor import (crear_enemigos, verificar_colision_trampas, nodos_campo, nodos_completo_por_tick,
+                   dificultades, movimientos_accion)
+from trampas import TrampaManager
+from rutas import CampoDistancias
+from puntajes import TablaPuntajes, ServicioPuntajes
+from repeticion import Repeticion, reproducir
+
+tamaños = (15, 64, 256, 1024, 2048)
+cantidades_enemigos = (4, 100, 10000)
+
+# Si una medición pasa este tiempo se deja de repetir
+tiempo_objetivo = 0.5
+max_repeticiones = 50
+
+# Tamaño de la superficie fuera de pantalla (la vista de main.py)
+ancho_vista = 32 * tam_tile
+alto_vista = 24 * tam_tile
+
+# Semilla fija de todos los mapas y enemigos
+semilla = 12345
+
+# Puntajes ya guardados en la tabla del caso "puntajes"
+puntajes_previos = 1_000_000
+
+# Partida del caso "reproducir": 5 minutos de cazador a 30 ticks por
+# segundo, con un movimiento al azar cada 3 ticks. Con esta semilla la
+# partida no termina antes, así se reproducen todos los ticks.
+semilla_repeticion = 76
+ticks_repeticion = 9000
+
+# Tiempo máximo en segundos de los casos que tienen un objetivo
+objetivos = {
+    "reproducir": 1.0,  # Reproducir sin ventana una partida de 5 minutos
+}
+
+# Mapas ya generados por lado, para no generarlos en cada caso
+grillas = {}
+
+# Lo que un caso tiene que liberar (carpetas temporales, bases abiertas):
+# correr lo cierra apenas termina de medir ese caso
+limpieza = contextlib.ExitStack()
+
+
+def obtener_grilla(lado):
+    """Grilla del mapa lado x lado con la semilla fija."""
+    if lado not in grillas:
+        grillas[lado] = construir_grilla(generar_mapa(lado, lado, semilla))
+    return grillas[lado]
+
+
+def caminata_jugador(grilla, pasos, rng):
+    """Posiciones de un jugador que camina al azar desde (0, 0)."""
+    fila, col = 0, 0
+    posiciones = []
+    for _ in range(pasos):
+        opciones = [(fila + df, col + dc) for df, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                    if grilla.permite_jugador(fila + df, col + dc)]
+        if opciones:
+            fila, col = opciones[rng.integers(len(opciones))]
+        posiciones.append((fila, col))
+    return posiciones
+
+
+# Cada caso recibe (lado, enemigos) y retorna (ejecutar, reiniciar):
+# ejecutar es lo que se mide; reiniciar (o None) se corre antes de cada
+# medición sin contar su tiempo. Lo que haya que liberar después se
+# registra en limpieza.
+
+def caso_generar_mapa(lado, enemigos):
+    return lambda: generar_mapa(lado, lado, semilla), None
+
+
+def caso_convertir_a_objetos(lado, enemigos):
+    matriz = obtener_grilla(lado).celdas
+    return lambda: convertir_a_objetos(matriz), None
+
+
+def caso_dibujar_mapa(lado, enemigos):
+    grilla = obtener_grilla(lado)
+    superficie = pygame.Surface((ancho_vista, alto_vista))
+    return lambda: dibujar_mapa(superficie, grilla), None
+
+
+def caso_fondo_camara(lado, enemigos):
+    grilla = obtener_grilla(lado)
+    camara = Camara(grilla.filas, grilla.columnas, 24, 32, tam_tile)
+    salida_fila, salida_col = colocar_salida(grilla)
+    camara.centrar(salida_fila, salida_col)
+    return lambda: crear_fondo_mapa(grilla, salida_fila, salida_col, camara), None
+
+
+def caso_mover_enemigos(lado, enemigos):
+    """Un tick de movimiento con todos los enemigos moviéndose y el jugador caminando."""
+    grilla = obtener_grilla(lado)
+    rng = np.random.default_rng(semilla)
+    pool = crear_enemigos(grilla, enemigos, 1, rng)  # Todos se mueven cada tick
+    campo = CampoDistancias(grilla.paso_enemigo, max_nodos=nodos_campo)  # Como en EstadoJuego
+    posiciones = caminata_jugador(grilla, 1000, rng)
+    siguiente = [0]
+
+    def ejecutar():
+        fila, col = posiciones[siguiente[0] % len(posiciones)]
+        siguiente[0] += 1
+        campo.avanzar_completo(nodos_completo_por_tick)
+        pool.mover_hacia(fila, col, grilla, campo)
+    return ejecutar, None
+
+
+def caso_colision_trampas(lado, enemigos):
+    """Revisión de trampas con la mitad de los enemigos parados en una."""
+    grilla = obtener_grilla(lado)
+    pool = crear_enemigos(grilla, enemigos, 1, np.random.default_rng(semilla))
+    trampas = TrampaManager(grilla.filas, grilla.columnas, limite=enemigos)
+
+    def reiniciar():
+        trampas.eliminar_varias(list(trampas.trampas))
+        trampas.colocar_varias(zip(pool.fila[::2], pool.col[::2]))
+    return lambda: verificar_colision_trampas(pool, trampas, grilla), reiniciar
+
+
+def caso_puntajes(lado, enemigos):
+    """Guardar un puntaje y leer el top 5 (lo que hace main.py al terminar)."""
+    carpeta = limpieza.enter_context(tempfile.TemporaryDirectory())
+    tabla = TablaPuntajes(os.path.join(carpeta, "puntajes.db"), carpeta_textos=None)
+    limpieza.callback(tabla.cerrar)  # Antes de borrar la carpeta
+    rng = np.random.default_rng(semilla)
+    puntos = rng.integers(-100, 3000, puntajes_previos).tolist()
+    tabla.guardar_varios((f"J{i % 1000}", p, ("escapa", "cazador")[i % 2], "medio")
+                         for i, p in enumerate(puntos))
+
+    def ejecutar():
+        tabla.guardar("Jugador", int(rng.integers(3000)), "escapa", "medio")
+        tabla.top("escapa", 5)
+    return ejecutar, None
+
+
+def caso_servicio_puntajes(lado, enemigos):
+    """Lo mismo con el servicio en memoria (lo que espera main.py en realidad)."""
+    carpeta = limpieza.enter_context(tempfile.TemporaryDirectory())
+    servicio = ServicioPuntajes(os.path.join(carpeta, "puntajes.db"), carpeta_textos=None)
+    limpieza.callback(servicio.cerrar)
+    servicio.cargado.wait()
+    rng = np.random.default_rng(semilla)
+
+    def ejecutar():
+        servicio.agregar("Jugador", int(rng.integers(3000)), "escapa", "medio")
+        servicio.top("escapa", 5)
+    return ejecutar, None
+
+
+def caso_reproducir(lado, enemigos):
+    """Reproducción sin ventana de una partida de cazador de 5 minutos en el mapa por defecto."""
+    cantidad, velocidad = dificultades["medio"]
+    repeticion = Repeticion(semilla_repeticion, "cazador", "medio", filas, columnas, "auto",
+                            cantidad, velocidad, 30)
+    rng = np.random.default_rng(semilla_repeticion)
+    movimientos = list(movimientos_accion)
+    for tick in range(1, ticks_repeticion + 1, 3):
+        repeticion.registrar(tick, [movimientos[rng.integers(len(movimientos))]])
+    repeticion.terminar(ticks_repeticion)
+    if reproducir(repeticion).ticks < ticks_repeticion:
+        print(f"aviso: la partida de semilla {semilla_repeticion} termina antes de {ticks_repeticion} ticks")
+    return lambda: reproducir(repeticion), None
+
+
+# Casos: nombre -> (función, lado máximo, usa enemigos, usa tamaño)
+casos = {
+    "generar_mapa": (caso_generar_mapa, 2048, False, True),
+    "convertir_a_objetos": (caso_convertir_a_objetos, 1024, False, True),
+    "dibujar_mapa": (caso_dibujar_mapa, 1024, False, True),
+    "fondo_camara": (caso_fondo_camara, 2048, False, True),
+    "mover_enemigos": (caso_mover_enemigos, 2048, True, True),
+    "colision_trampas": (caso_colision_trampas, 2048, True, True),
+    "puntajes": (caso_puntajes, None, False, False),
+    "servicio_puntajes": (caso_servicio_puntajes, None, False, False),
+    "reproducir": (caso_reproducir, None, False, False),
+}
+
+
+def medir(ejecutar, reiniciar):
+    """
+    Objetivo:
+        Repetir ejecutar hasta juntar tiempo_objetivo segundos (o
+        max_repeticiones veces).
+    Salida: lista de tiempos en segundos
+    """
+    tiempos = []
+    while len(tiempos) < max_repeticiones and sum(tiempos) < tiempo_objetivo:
+        if reiniciar is not None:
+            reiniciar()
+        inicio = time.perf_counter()
+        ejecutar()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def commit_actual():
+    """Hash del commit de git, o None fuera de un repositorio."""
+    try:
+        salida = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return salida.stdout.strip()
+
+
+def correr(nombres, lados, cantidades):
+    """Mide los casos pedidos; retorna la lista de resultados."""
+    resultados = []
+    for nombre in nombres:
+        funcion, lado_maximo, usa_enemigos, usa_tamaño = casos[nombre]
+        for lado in lados if usa_tamaño else (None,):
+            if lado is not None and lado > lado_maximo:
+                continue
+            for enemigos in cantidades if usa_enemigos else (None,):
+                with limpieza:
+                    ejecutar, reiniciar = funcion(lado, enemigos)
+                    tiempos = medir(ejecutar, reiniciar)
+                resultado = {
+                    "caso": nombre,
+                    "lado": lado,
+                    "enemigos": enemigos,
+                    "repeticiones": len(tiempos),
+                    "mejor_s": min(tiempos),
+                    "mediana_s": statistics.median(tiempos),
+                    "objetivo_s": objetivos.get(nombre),
+                }
+                resultados.append(resultado)
+                marca = "  SOBRE EL OBJETIVO" if fuera_de_objetivo(resultado) else ""
+                print(f"{nombre:20}{lado or '-':>6}{enemigos or '-':>7}"
+                      f"{resultado['mejor_s'] * 1000:>12.3f} ms{resultado['mediana_s'] * 1000:>12.3f} ms"
+                      f"{len(tiempos):>5}x{marca}")
+    return resultados
+
+
+def fuera_de_objetivo(resultado):
+    """Retorna True si el caso tiene objetivo y su mejor tiempo lo pasa."""
+    return resultado["objetivo_s"] is not None and resultado["mejor_s"] > resultado["objetivo_s"]
+
+
+def clave(resultado):
+    return resultado["caso"], resultado["lado"], resultado["enemigos"]
+
+
+def comparar(resultados, nombre_archivo, umbral=1.2):
+    """Muestra la razón contra una corrida anterior y marca las más lentas."""
+    with open(nombre_archivo, encoding="utf-8") as archivo:
+        anteriores = {clave(r): r for r in json.load(archivo)["resultados"]}
+    print(f"\nComparación con {nombre_archivo} (mejor tiempo, nuevo / anterior):")
+    for resultado in resultados:
+        anterior = anteriores.get(clave(resultado))
+        if anterior is None:
+            continue
+        razon = resultado["mejor_s"] / anterior["mejor_s"]
+        marca = "  MÁS LENTO" if razon > umbral else ""
+        caso, lado, enemigos = clave(resultado)
+        print(f"{caso:20}{lado or '-':>6}{enemigos or '-':>7}{razon:>8.2f}x{marca}")
+
+
+def lista_enteros(texto):
+    """Convierte "15,64" en [15, 64] (para argparse)."""
+    return [int(parte) for parte in texto.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento del juego")
+    parser.add_argument("--casos", type=lambda texto: texto.split(","), default=list(casos),
+                        help="casos separados por coma: " + ", ".join(casos))
+    parser.add_argument("--tamaños", type=lista_enteros, default=list(tamaños), help="lados de mapa")
+    parser.add_argument("--enemigos", type=lista_enteros, default=list(cantidades_enemigos))
+    parser.add_argument("--salida", default="rendimiento.json", help="archivo JSON de resultados")
+    parser.add_argument("--comparar", default=None, help="JSON de una corrida anterior")
+    argumentos = parser.parse_args()
+    for nombre in argumentos.casos:
+        if nombre not in casos:
+            parser.error(f"caso desconocido: {nombre}")
+
+    salida = os.path.abspath(argumentos.salida)
+    anterior = os.path.abspath(argumentos.comparar) if argumentos.comparar else None
+
+    # Las imágenes se buscan en assets/ junto a este archivo
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    pygame.init()
+    pygame.display.set_mode((ancho_vista, alto_vista))
+    inicializar_imagenes()
+
+    resultados = correr(argumentos.casos, argumentos.tamaños, argumentos.enemigos)
+    datos = {
+        "commit": commit_actual(),
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+    with open(salida, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, indent=2)
+    print(f"Resultados guardados en {salida}")
+    if anterior:
+        comparar(resultados, anterior)
+    pygame.quit()
+    if any(fuera_de_objetivo(resultado) for resultado in resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
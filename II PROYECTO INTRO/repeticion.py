@@ -0,0 +1,191 @@
+# repeticion.py
+
+import struct
+import sys
+import time
+from laberinto import generar_mapa, construir_grilla
+from generador import generadores
+from motor import EstadoJuego, dificultades
+
+# Objetivo:
+#   Grabar partidas en un archivo binario pequeño y reproducirlas igual.
+#   Como todo el azar de EstadoJuego sale de su semilla, basta guardar
+#   la configuración de la partida y las acciones del jugador con el
+#   tick en que se aplicaron:
+#   - cabecera fija (ver formato_cabecera)
+#   - una lista de enteros de largo variable (varint, 7 bits por byte),
+#     uno por acción: (ticks desde la acción anterior << 3) | código
+#   - al final el código fin_partida con los ticks que quedaron sin acciones
+#   Una partida de 5 minutos ocupa unos pocos KB.
+#   Se puede reproducir sin ventana a toda velocidad (python repeticion.py
+#   archivo) o en tiempo real con la vista de pygame (main.py --repeticion).
+# Restricciones:
+#   No importa pygame. La reproducción es exacta solo con el mismo
+#   código del motor que grabó la partida (por eso hay versión).
+
+firma = b"LABR"
+version = 1
+
+# firma, versión, modo, dificultad, algoritmo, semilla, filas, columnas,
+# cantidad de enemigos, ticks entre movimientos, ticks por segundo
+formato_cabecera = "<4sBBBBQHHIHH"
+
+# Códigos de acción de 3 bits (el índice en la tupla)
+acciones_codigo = ("arriba", "abajo", "izquierda", "derecha", "trampa", "correr", "caminar")
+fin_partida = 7
+
+modos = ("escapa", "cazador")
+nombres_dificultad = tuple(dificultades)
+algoritmos = ("auto",) + tuple(sorted(generadores))
+
+
+class Repeticion:
+    """
+    Objetivo:
+        Configuración de una partida y las acciones de cada tick.
+        Sirve para grabar (registrar/terminar) y para reproducir
+        (crear_estado/acciones_por_tick).
+    """
+    def __init__(self, semilla, modo, dificultad, filas, columnas, algoritmo,
+                 cantidad_enemigos, velocidad_enemigos, ticks_por_segundo):
+        self.semilla = semilla
+        self.modo = modo
+        self.dificultad = dificultad
+        self.filas = filas
+        self.columnas = columnas
+        self.algoritmo = algoritmo
+        self.cantidad_enemigos = cantidad_enemigos
+        self.velocidad_enemigos = velocidad_enemigos
+        self.ticks_por_segundo = ticks_por_segundo
+        self.eventos = []      # (tick, acción) en orden
+        self.total_ticks = 0   # Último tick de la partida
+
+    def crear_estado(self, perfilador=None):
+        """Genera el mapa y retorna un EstadoJuego nuevo con esta configuración."""
+        matriz = generar_mapa(self.filas, self.columnas, self.semilla, self.algoritmo)
+        return EstadoJuego(construir_grilla(matriz), self.modo, self.cantidad_enemigos,
+                           self.velocidad_enemigos, self.ticks_por_segundo, self.semilla,
+                           perfilador=perfilador)
+
+    def registrar(self, tick, acciones):
+        """Guarda las acciones que se aplican en el tick dado."""
+        for accion in acciones:
+            self.eventos.append((tick, accion))
+        self.total_ticks = max(self.total_ticks, tick)
+
+    def terminar(self, tick):
+        """Marca el último tick jugado."""
+        self.total_ticks = max(self.total_ticks, tick)
+
+    def acciones_por_tick(self):
+        """
+        Objetivo:
+            Generar la lista de acciones de cada tick, del 1 al total_ticks.
+        Salida: generador de listas (vacías en los ticks sin acciones)
+        """
+        eventos = self.eventos
+        siguiente = 0
+        for tick in range(1, self.total_ticks + 1):
+            acciones = []
+            while siguiente < len(eventos) and eventos[siguiente][0] == tick:
+                acciones.append(eventos[siguiente][1])
+                siguiente += 1
+            yield acciones
+
+    def codificar(self):
+        """Retorna la partida como bytes."""
+        datos = bytearray(struct.pack(
+            formato_cabecera, firma, version,
+            modos.index(self.modo), nombres_dificultad.index(self.dificultad),
+            algoritmos.index(self.algoritmo), self.semilla, self.filas, self.columnas,
+            self.cantidad_enemigos, self.velocidad_enemigos, self.ticks_por_segundo))
+        anterior = 0
+        for tick, accion in self.eventos:
+            escribir_varint(datos, (tick - anterior) << 3 | acciones_codigo.index(accion))
+            anterior = tick
+        escribir_varint(datos, (self.total_ticks - anterior) << 3 | fin_partida)
+        return bytes(datos)
+
+    def guardar(self, nombre_archivo):
+        """Escribe la partida en un archivo."""
+        with open(nombre_archivo, "wb") as archivo:
+            archivo.write(self.codificar())
+
+
+def escribir_varint(datos, valor):
+    """Agrega valor (entero >= 0) a datos, 7 bits por byte."""
+    while valor >= 0x80:
+        datos.append(valor & 0x7F | 0x80)
+        valor >>= 7
+    datos.append(valor)
+
+
+def decodificar(datos):
+    """
+    Objetivo:
+        Leer una partida desde bytes.
+    Salida: objeto Repeticion
+    Restricciones: lanza ValueError si los datos no son una repetición válida
+    """
+    tam_cabecera = struct.calcsize(formato_cabecera)
+    if len(datos) < tam_cabecera:
+        raise ValueError("repetición incompleta")
+    (firma_leida, version_leida, modo, dificultad, algoritmo, semilla, filas_mapa,
+     columnas_mapa, cantidad, velocidad, ticks_por_segundo) = struct.unpack_from(formato_cabecera, datos)
+    if firma_leida != firma:
+        raise ValueError("no es un archivo de repetición")
+    if version_leida != version:
+        raise ValueError(f"versión de repetición no soportada: {version_leida}")
+
+    repeticion = Repeticion(semilla, modos[modo], nombres_dificultad[dificultad], filas_mapa,
+                            columnas_mapa, algoritmos[algoritmo], cantidad, velocidad, ticks_por_segundo)
+    tick = 0
+    valor = 0
+    desplazamiento = 0
+    for byte in datos[tam_cabecera:]:
+        valor |= (byte & 0x7F) << desplazamiento
+        if byte & 0x80:
+            desplazamiento += 7
+            continue
+        tick += valor >> 3
+        codigo = valor & 7
+        if codigo == fin_partida:
+            repeticion.terminar(tick)
+            return repeticion
+        repeticion.eventos.append((tick, acciones_codigo[codigo]))
+        valor = 0
+        desplazamiento = 0
+    raise ValueError("repetición sin marca de fin")
+
+
+def cargar(nombre_archivo):
+    """Lee una repetición desde un archivo."""
+    with open(nombre_archivo, "rb") as archivo:
+        return decodificar(archivo.read())
+
+
+def reproducir(repeticion):
+    """
+    Objetivo:
+        Correr la partida completa sin ventana, lo más rápido posible.
+    Salida: EstadoJuego al final de la partida
+    """
+    estado = repeticion.crear_estado()
+    for acciones in repeticion.acciones_por_tick():
+        estado.paso(acciones)
+        if estado.terminado():
+            break
+    return estado
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("uso: python repeticion.py archivo")
+        sys.exit(1)
+    repeticion = cargar(sys.argv[1])
+    inicio = time.perf_counter()
+    estado = reproducir(repeticion)
+    duracion = time.perf_counter() - inicio
+    print(f"Modo: {repeticion.modo} - Dificultad: {repeticion.dificultad} - Semilla: {repeticion.semilla}")
+    print(f"Resultado: {estado.resultado or 'sin terminar'} - Puntuación: {estado.puntuacion}")
+    print(f"{estado.ticks} ticks ({estado.tiempo:.1f} s de juego) reproducidos en {duracion:.3f} s")
@@ -0,0 +1,311 @@
+# rutas.py
+
+from collections import deque
+from itertools import repeat
+import numpy as np
+
+# Objetivo:
+#   Rutas reales para los enemigos sobre la máscara de paso de enemigos.
+#   En lugar de una búsqueda A* por enemigo hay un solo mapa de
+#   distancias (BFS) desde el jugador que comparten todos: cada enemigo
+#   baja por él mirando sus vecinas, así rodea muros y lianas sin
+#   guardar una ruta propia. El mapa se calcula solo cuando el jugador
+#   cambia de celda, los de celdas recientes quedan guardados y un BFS
+#   revisa a lo más max_nodos celdas: el costo por frame no crece con la
+#   cantidad de enemigos y está acotado aunque el mapa sea grande. Los
+#   enemigos que quedan fuera de ese radio bajan por un campo de todo el
+#   mapa que se calcula por partes, unos miles de celdas por tick.
+# Restricciones:
+#   Movimiento en 4 direcciones, cada paso cuesta 1.
+
+# Factor del mapa de huida: los valores de la distancia se multiplican por
+# -factor_huida y se relajan, así huir hacia un callejón sin salida cuesta
+# más que rodear al jugador hacia una zona abierta
+factor_huida = 1.2
+
+# Valor de las celdas sin distancia (en el mapa de huida)
+infinito = float("inf")
+
+# Celdas que CampoDistancias guarda de campos anteriores: el jugador
+# vuelve seguido a las mismas celdas y en un mapa chico cabe un campo
+# por cada celda
+max_celdas_guardadas = 1 << 16
+
+
+class CampoDistancias:
+    """
+    Objetivo:
+        Mapa de distancias (BFS) desde la celda del jugador sobre la
+        máscara de paso de enemigos, compartido por todos los enemigos.
+        Se recalcula solo cuando el jugador cambia de celda; cada enemigo
+        elige su paso mirando sus 4 vecinos, así el costo por frame es
+        O(mapa) + O(enemigos) sin importar cuántos enemigos haya.
+        siguiente_paso da el paso de una sola ficha (el bot de
+        calibrar.py lo usa para el jugador).
+        Con max_nodos el BFS se para después de revisar esa cantidad de
+        celdas: en mapas grandes el costo por paso del jugador queda
+        acotado. Para los enemigos lejanos (sin distancia) hay además un
+        campo completo del mapa que avanza por partes (avanzar_completo)
+        y apunta a donde estaba el jugador cuando se empezó.
+        Los campos de los últimos orígenes (con su mapa de huida) se
+        guardan: volver a una celda reciente no recalcula nada.
+    Restricciones:
+        distancias es un diccionario nodo -> distancia en orden de BFS;
+        las celdas que no están (no se alcanzan desde el origen o
+        quedaron fuera de max_nodos) cuentan como -1.
+        La máscara no cambia (los campos guardados siguen valiendo).
+        El campo completo ocupa 4 bytes por celda del mapa.
+    """
+    def __init__(self, mascara, max_nodos=None):
+        self.filas, self.columnas = mascara.shape
+        self.paso = mascara.tobytes()
+        self.max_nodos = max_nodos
+        self.origen = None
+        self.distancias = {}
+        self.origen_huida = None
+        self.huida = {}
+        # origen -> [distancias, huida o None], del más viejo al más nuevo
+        self.guardados = {}
+        self.celdas_guardadas = 0
+        # Campo completo: solo hace falta si max_nodos deja celdas afuera
+        self.hace_falta_completo = max_nodos is not None and max_nodos <= int(np.count_nonzero(mascara))
+        self.pedido_completo = False  # Algún enemigo quedó fuera de max_nodos
+        self.completo = None          # Arreglo int32 por celda (-1 = no se llega)
+        self.origen_completo = None
+        self.en_curso = None          # [origen, distancias, frente, siguiente, nivel] del BFS a medias
+
+    def actualizar(self, origen):
+        """
+        Objetivo:
+            Cambiar el origen del campo; se calcula solo si no está guardado.
+        Salida: True si el origen cambió
+        """
+        if origen == self.origen:
+            return False
+        self.origen = origen
+        guardado = self.guardados.pop(origen, None)
+        if guardado is None:
+            guardado = [self.calcular(origen), None]
+            self.celdas_guardadas += len(guardado[0])
+            # Olvidar los más viejos (los primeros del diccionario)
+            while self.guardados and self.celdas_guardadas > max_celdas_guardadas:
+                viejo = self.guardados.pop(next(iter(self.guardados)))
+                self.celdas_guardadas -= len(viejo[0])
+        self.guardados[origen] = guardado  # Queda como el más nuevo
+        self.distancias = guardado[0]
+        if guardado[1] is not None:
+            self.huida = guardado[1]
+            self.origen_huida = origen
+        return True
+
+    def calcular(self, origen):
+        """
+        Objetivo:
+            BFS por niveles desde origen.
+        Salida: diccionario nodo -> distancia, en orden de BFS
+        Restricciones:
+            Con max_nodos se para al terminar el nivel en que se llega a
+            esa cantidad de celdas: las distancias guardadas son exactas.
+        """
+        paso = self.paso
+        columnas = self.columnas
+        total = self.filas * columnas
+        limite = self.max_nodos if self.max_nodos is not None else total
+        inicio = origen[0] * columnas + origen[1]
+        distancias = {inicio: 0}  # El origen cuenta aunque sea un túnel
+        frente = [inicio]
+        nivel = 0
+        while frente and len(distancias) < limite:
+            nivel += 1
+            siguiente = []
+            for nodo in frente:
+                col = nodo % columnas
+                for vecino in (nodo - columnas, nodo + columnas,
+                               nodo - 1 if col > 0 else -1,
+                               nodo + 1 if col < columnas - 1 else -1):
+                    if 0 <= vecino < total and paso[vecino] and vecino not in distancias:
+                        distancias[vecino] = nivel
+                        siguiente.append(vecino)
+            frente = siguiente
+        return distancias
+
+    def avanzar_completo(self, presupuesto):
+        """
+        Objetivo:
+            Seguir el BFS del campo completo revisando a lo más
+            presupuesto celdas. Al terminar, ese campo pasa a ser el que
+            se consulta y, si el jugador ya se movió, empieza otro.
+        Restricciones:
+            No hace nada hasta que consultar_completo lo pida: en mapas
+            donde max_nodos alcanza para todo nunca se calcula.
+            Un nivel del BFS se puede repartir entre varias llamadas.
+        """
+        if not self.pedido_completo or presupuesto <= 0:
+            return
+        if self.en_curso is None:
+            if self.origen is None or self.origen == self.origen_completo:
+                return
+            inicio = self.origen[0] * self.columnas + self.origen[1]
+            distancias = np.full(self.filas * self.columnas, -1, dtype=np.int32)
+            distancias[inicio] = 0
+            self.en_curso = [self.origen, distancias, [inicio], [], 0]
+        origen, completo, frente, siguiente, nivel = self.en_curso
+        distancias = memoryview(completo)  # Leer y escribir de a uno es más rápido que en NumPy
+        paso = self.paso
+        columnas = self.columnas
+        total = self.filas * columnas
+        revisadas = 0
+        while revisadas < presupuesto:
+            if not frente:
+                if not siguiente:
+                    break
+                frente, siguiente = siguiente, []
+                nivel += 1
+            # Las celdas de frente están a distancia nivel; se toman del final
+            parte = frente[revisadas - presupuesto:]
+            del frente[revisadas - presupuesto:]
+            revisadas += len(parte)
+            proximo = nivel + 1
+            for nodo in parte:
+                col = nodo % columnas
+                for vecino in (nodo - columnas, nodo + columnas,
+                               nodo - 1 if col > 0 else -1,
+                               nodo + 1 if col < columnas - 1 else -1):
+                    if 0 <= vecino < total and paso[vecino] and distancias[vecino] < 0:
+                        distancias[vecino] = proximo
+                        siguiente.append(vecino)
+        if frente or siguiente:
+            self.en_curso = [origen, completo, frente, siguiente, nivel]
+            return
+        self.completo = completo
+        self.origen_completo = origen
+        self.en_curso = None
+
+    def consultar_completo(self, filas, cols):
+        """
+        Objetivo:
+            Distancias del campo completo (-1 = no se llega o todavía no
+            hay campo completo), para los enemigos fuera de max_nodos.
+        Entrada: filas, cols - arreglos de enteros de la misma forma
+        Salida: arreglo int32 con esa forma
+        """
+        if self.hace_falta_completo:
+            self.pedido_completo = True
+        if self.completo is None:
+            return np.full(np.shape(filas), -1, dtype=np.int32)
+        return self.completo[np.asarray(filas) * self.columnas + cols]
+
+    def distancia(self, celda):
+        """Distancia en pasos de la celda al origen (-1 si no se llega)."""
+        return self.distancias.get(celda[0] * self.columnas + celda[1], -1)
+
+    def vecinos(self, fila, col):
+        """Índices planos de los vecinos transitables de la celda."""
+        columnas = self.columnas
+        nodo = fila * columnas + col
+        resultado = []
+        if fila > 0 and self.paso[nodo - columnas]:
+            resultado.append(nodo - columnas)
+        if fila < self.filas - 1 and self.paso[nodo + columnas]:
+            resultado.append(nodo + columnas)
+        if col > 0 and self.paso[nodo - 1]:
+            resultado.append(nodo - 1)
+        if col < columnas - 1 and self.paso[nodo + 1]:
+            resultado.append(nodo + 1)
+        return resultado
+
+    def siguiente_paso(self, ficha, objetivo):
+        """
+        Objetivo:
+            Paso de una ficha (objeto con fila y col) hacia el objetivo
+            bajando por el campo.
+        Salida: (fila, col) o None si la ficha no alcanza al objetivo
+        """
+        self.actualizar(objetivo)
+        if self.distancia((ficha.fila, ficha.col)) <= 0:
+            return None
+        # Las celdas sin distancia no sirven para bajar
+        columnas = self.columnas
+        mejor = None
+        mejor_valor = self.distancia((ficha.fila, ficha.col))
+        for vecino in self.vecinos(ficha.fila, ficha.col):
+            valor = self.distancias.get(vecino, -1)
+            if 0 <= valor < mejor_valor:
+                mejor, mejor_valor = vecino, valor
+        if mejor is None:
+            return None
+        return divmod(mejor, columnas)
+
+    def calcular_huida(self):
+        """
+        Objetivo:
+            Mapa de huida: -factor_huida * distancia en cada celda con
+            distancia, relajado (valor <= vecino + 1) entre esas mismas
+            celdas. Bajar por este mapa aleja del origen sin meterse en
+            callejones cerca de él.
+        Salida: diccionario nodo -> valor
+        Restricciones:
+            Como cada paso cuesta 1 no hace falta un heap: los valores
+            iniciales salen ordenados del BFS (al revés) y los relajados
+            salen en orden de una cola FIFO; siempre se toma la menor de
+            las dos cabezas. Cuesta O(celdas con distancia).
+        """
+        huida = {nodo: -factor_huida * distancia for nodo, distancia in self.distancias.items()
+                 if distancia >= 0}
+        # Ya viene casi siempre en orden y sorted lo detecta en O(n)
+        iniciales = sorted(reversed(huida.items()), key=lambda par: par[1])
+        cantidad = len(iniciales)
+        siguiente = 0
+        relajados = deque()
+        columnas = self.columnas
+        paso = self.paso
+        total = self.filas * columnas
+        while siguiente < cantidad or relajados:
+            if relajados and (siguiente == cantidad or relajados[0][1] < iniciales[siguiente][1]):
+                nodo, valor = relajados.popleft()
+            else:
+                nodo, valor = iniciales[siguiente]
+                siguiente += 1
+            if valor > huida[nodo]:
+                continue  # Entrada vieja: ya bajó más
+            nuevo = valor + 1
+            col = nodo % columnas
+            for vecino in (nodo - columnas, nodo + columnas,
+                           nodo - 1 if col > 0 else -1,
+                           nodo + 1 if col < columnas - 1 else -1):
+                if 0 <= vecino < total and paso[vecino] and nuevo < huida.get(vecino, -infinito):
+                    huida[vecino] = nuevo
+                    relajados.append((vecino, nuevo))
+        return huida
+
+    def preparar_huida(self):
+        """Calcula el mapa de huida si el origen cambió desde la última vez."""
+        if self.origen_huida != self.origen:
+            self.huida = self.calcular_huida()
+            self.origen_huida = self.origen
+            if self.origen in self.guardados:
+                self.guardados[self.origen][1] = self.huida
+
+    def consultar(self, valores, filas, cols, faltante, tipo):
+        """Arreglo con valores[nodo] de cada celda pedida (faltante si no está)."""
+        nodos = (np.asarray(filas) * self.columnas + cols).ravel().tolist()
+        leidos = np.fromiter(map(valores.get, nodos, repeat(faltante)), dtype=tipo, count=len(nodos))
+        return leidos.reshape(np.shape(filas))
+
+    def consultar_distancias(self, filas, cols):
+        """
+        Objetivo:
+            Distancias de muchas celdas a la vez (-1 = no se llega), para
+            mover a todos los enemigos con NumPy (EnemigoPool).
+        Entrada: filas, cols - arreglos de enteros de la misma forma
+        Salida: arreglo int32 con esa forma
+        Restricciones:
+            Solo se leen las celdas pedidas (las de los enemigos y sus
+            vecinas): nunca se arma un arreglo del mapa entero.
+        """
+        return self.consultar(self.distancias, filas, cols, -1, np.int32)
+
+    def consultar_huida(self, filas, cols):
+        """Como consultar_distancias, con el mapa de huida (nan = no se llega)."""
+        self.preparar_huida()
+        return self.consultar(self.huida, filas, cols, np.nan, float)
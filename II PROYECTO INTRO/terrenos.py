@@ -3,6 +3,8 @@
 
 import pygame
 import os
+from recursos import cargar_imagen as cargar_recurso, obtener_escalada
+from codigos_terreno import nombres_por_codigo
 
 # Objetivo:
 #   Cargar las imágenes para cada tipo de terreno
@@ -13,13 +15,17 @@ import os
 # Salida: superficie de pygame cargada
 # Restricciones: la imagen debe existir dentro de assets/terrenos
 
+def ruta_imagen(nombre):
+    """Ruta de una imagen de la carpeta de terrenos."""
+    return os.path.join("assets", "terrenos", nombre)
+
+
 def cargar_imagen(nombre):
     """
     Objetivo:
         Cargar una imagen desde la carpeta de terrenos.
     """
-    ruta = os.path.join("assets", "terrenos", nombre)
-    return pygame.image.load(ruta)
+    return cargar_recurso(ruta_imagen(nombre))
 
 # Variables globales en minuscula
 img_camino = None
@@ -27,6 +33,30 @@ img_muro = None
 img_liana = None
 img_tunel = None
 
+# Cache de superficies ya escaladas, compartida por todas las celdas
+# Clave: (tipo de terreno, tamaño del tile) -> superficie lista para blit
+cache_superficies = {}
+
+
+def obtener_superficie(tipo, imagen, size):
+    """
+    Objetivo:
+        Devolver la imagen escalada a (size, size) para el tipo dado.
+        Solo se escala y convierte una vez por (tipo, size); las
+        siguientes llamadas reutilizan la misma superficie.
+    Restricciones:
+        convert() necesita una ventana creada: sin ella la superficie
+        se devuelve sin guardar, para convertirla cuando ya exista.
+    """
+    clave = (tipo, size)
+    superficie = cache_superficies.get(clave)
+    if superficie is None:
+        superficie = pygame.transform.scale(imagen, (size, size))
+        if pygame.display.get_surface() is not None:
+            superficie = superficie.convert()
+            cache_superficies[clave] = superficie
+    return superficie
+
 
 def inicializar_imagenes():
     """
@@ -40,11 +70,23 @@ def inicializar_imagenes():
     img_tunel = cargar_imagen("tunel.jpeg")
 
 
+def superficies_por_codigo(size):
+    """
+    Objetivo:
+        Retornar los terrenos escalados a (size, size) en el orden de sus
+        códigos, sin pasar por inicializar_imagenes: con el paquete de
+        assets no se decodifica ningún JPEG.
+    """
+    return [obtener_escalada(ruta_imagen(f"{nombre}.jpeg"), size, size) for nombre in nombres_por_codigo]
+
+
 class Terreno:
     """
     Objetivo:
         Clase base que representa un tipo de terreno.
     """
+    tipo = "terreno"
+
     def __init__(self, imagen, puede_jugador, puede_enemigo):
         self.imagen = imagen
         self.puede_jugador = puede_jugador
@@ -63,30 +105,38 @@ class Terreno:
         Objetivo:
             Dibujar el terreno en la pantalla.
         """
-        img = pygame.transform.scale(self.imagen, (size, size))
+        img = obtener_superficie(self.tipo, self.imagen, size)
         window.blit(img, (x, y))
 
 
 class Camino(Terreno):
     """Terreno transitable por jugador y enemigo."""
+    tipo = "camino"
+
     def __init__(self):
         super().__init__(img_camino, True, True)
 
 
 class Muro(Terreno):
     """Terreno bloqueado para ambos."""
+    tipo = "muro"
+
     def __init__(self):
         super().__init__(img_muro, False, False)
 
 
 class Liana(Terreno):
     """Terreno exclusivo de enemigos."""
+    tipo = "liana"
+
     def __init__(self):
         super().__init__(img_liana, False, True)
 
 
 class Tunel(Terreno):
     """Terreno exclusivo del jugador."""
+    tipo = "tunel"
+
     def __init__(self):
         super().__init__(img_tunel, True, False)
 
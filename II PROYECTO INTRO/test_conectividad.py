@@ -0,0 +1,92 @@
+# test_conectividad.py
+
+from collections import deque
+import numpy as np
+import pytest
+from conectividad import etiquetar_componentes, alcanzables, filas_bits, revisar_mapa
+from codigos_terreno import paso_jugador_por_codigo, paso_enemigo_por_codigo
+from generador import generar
+
+# Objetivo:
+#   Pruebas de conectividad.py contra un relleno por BFS celda a celda,
+#   recorriendo el mapa en orden de filas:
+#     python -m pytest test_conectividad.py
+# Restricciones:
+#   No usa pygame.
+
+direcciones = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def rellenar(mascara, inicio, etiquetas, etiqueta):
+    """BFS desde inicio que marca su región con etiqueta; retorna el tamaño."""
+    filas, columnas = mascara.shape
+    etiquetas[inicio] = etiqueta
+    cola = deque([inicio])
+    tamaño = 0
+    while cola:
+        fila, col = cola.popleft()
+        tamaño += 1
+        for df, dc in direcciones:
+            vecina = (fila + df, col + dc)
+            if (0 <= vecina[0] < filas and 0 <= vecina[1] < columnas
+                    and mascara[vecina] and not etiquetas[vecina]):
+                etiquetas[vecina] = etiqueta
+                cola.append(vecina)
+    return tamaño
+
+
+def etiquetar_referencia(mascara):
+    """Regiones numeradas 1..k según su primera celda en orden de filas."""
+    etiquetas = np.zeros(mascara.shape, dtype=np.int32)
+    tamaños = [0]
+    for fila, col in zip(*np.nonzero(mascara)):
+        if not etiquetas[fila, col]:
+            tamaños.append(rellenar(mascara, (fila, col), etiquetas, len(tamaños)))
+    return etiquetas, tamaños
+
+
+def mascaras_prueba(semilla):
+    """Máscaras al azar de distinta densidad y formas límite."""
+    rng = np.random.default_rng(semilla)
+    forma = (int(rng.integers(1, 40)), int(rng.integers(1, 70)))
+    resultado = [rng.random(forma) < densidad for densidad in (0.3, 0.55, 0.8)]
+    resultado.append(np.ones(forma, dtype=bool))
+    resultado.append(np.zeros(forma, dtype=bool))
+    return resultado
+
+
+@pytest.mark.parametrize("semilla", range(8))
+def test_etiquetar_componentes_igual_a_bfs(semilla):
+    for mascara in mascaras_prueba(semilla):
+        etiquetas, tamaños = etiquetar_componentes(mascara)
+        esperadas, tamaños_esperados = etiquetar_referencia(mascara)
+        assert np.array_equal(etiquetas, esperadas)
+        assert tamaños.tolist() == tamaños_esperados
+
+
+@pytest.mark.parametrize("semilla", range(8))
+def test_alcanzables_igual_a_bfs(semilla):
+    rng = np.random.default_rng(semilla)
+    for mascara in mascaras_prueba(semilla):
+        for _ in range(3):
+            inicio = (int(rng.integers(mascara.shape[0])), int(rng.integers(mascara.shape[1])))
+            esperado = np.zeros(mascara.shape, dtype=np.int32)
+            if mascara[inicio]:
+                rellenar(mascara, inicio, esperado, 1)
+            assert np.array_equal(alcanzables(filas_bits(mascara), inicio), esperado > 0)
+
+
+@pytest.mark.parametrize("semilla", range(6))
+def test_revisar_mapa_deja_una_sola_region(semilla):
+    """Después de revisar_mapa todo lo transitable está en la región del inicio."""
+    celdas = generar(31, 45, semilla)
+    inicio, salida = (0, 0), (30, 44)
+    if not revisar_mapa(celdas, inicio, salida):
+        pytest.skip("mapa rechazado")
+    for tabla in (paso_jugador_por_codigo, paso_enemigo_por_codigo):
+        etiquetas, _ = etiquetar_componentes(tabla[celdas])
+        region = etiquetas[inicio]
+        transitables = etiquetas > 0
+        assert region == 0 or np.all(etiquetas[transitables] == region)
+    etiquetas, _ = etiquetar_componentes(paso_jugador_por_codigo[celdas])
+    assert etiquetas[inicio] and etiquetas[inicio] == etiquetas[salida]
@@ -0,0 +1,50 @@
+# test_generador.py
+
+import numpy as np
+import pytest
+from generador import generar, generadores
+from laberinto import generar_mapa, construir_grilla
+from conectividad import alcanzables, filas_bits
+from codigos_terreno import codigo_camino
+
+# Objetivo:
+#   Pruebas de los generadores de laberintos: misma semilla, mismo mapa,
+#   y el camino siempre une las dos esquinas:
+#     python -m pytest test_generador.py
+# Restricciones:
+#   No usa pygame.
+
+algoritmos = sorted(generadores)
+tamaños = [(2, 2), (2, 7), (9, 2), (15, 15), (16, 15), (15, 16), (30, 44)]
+
+
+@pytest.mark.parametrize("algoritmo", algoritmos)
+@pytest.mark.parametrize("forma", tamaños)
+def test_misma_semilla_mismo_mapa(algoritmo, forma):
+    filas_mapa, columnas_mapa = forma
+    for semilla in range(5):
+        primero = generar(filas_mapa, columnas_mapa, semilla, algoritmo)
+        assert np.array_equal(primero, generar(filas_mapa, columnas_mapa, semilla, algoritmo))
+        grilla = construir_grilla(generar_mapa(filas_mapa, columnas_mapa, semilla, algoritmo))
+        otra = construir_grilla(generar_mapa(filas_mapa, columnas_mapa, semilla, algoritmo))
+        assert np.array_equal(grilla.celdas, otra.celdas)
+        assert np.array_equal(grilla.paso_jugador, otra.paso_jugador)
+        assert np.array_equal(grilla.paso_enemigo, otra.paso_enemigo)
+
+
+@pytest.mark.parametrize("algoritmo", algoritmos)
+def test_otra_semilla_otro_mapa(algoritmo):
+    mapas = {generar(31, 31, semilla, algoritmo).tobytes() for semilla in range(10)}
+    assert len(mapas) == 10
+
+
+@pytest.mark.parametrize("algoritmo", algoritmos)
+@pytest.mark.parametrize("forma", tamaños)
+def test_esquinas_unidas_por_camino(algoritmo, forma):
+    filas_mapa, columnas_mapa = forma
+    for semilla in range(5):
+        celdas = generar(filas_mapa, columnas_mapa, semilla, algoritmo)
+        assert celdas[0, 0] == codigo_camino
+        assert celdas[-1, -1] == codigo_camino
+        camino = celdas == codigo_camino
+        assert alcanzables(filas_bits(camino), (0, 0))[-1, -1]
@@ -0,0 +1,66 @@
+# test_motor.py
+
+import numpy as np
+from laberinto import Grilla
+from codigos_terreno import codigo_camino, codigo_muro
+from motor import EstadoJuego
+
+# Objetivo:
+#   Pruebas del motor sin ventana: partidas cortas sobre mapas armados a
+#   mano donde se sabe por dónde tienen que ir los enemigos.
+#     python -m pytest test_motor.py
+# Restricciones:
+#   No usa pygame.
+
+
+def serpentina(lado):
+    """
+    Mapa lado x lado de pasillos horizontales unidos por una sola abertura,
+    alternando el extremo: la única ruta recorre todo el mapa y muchas
+    veces obliga a alejarse del jugador en línea recta.
+    """
+    matriz = np.full((lado, lado), codigo_muro, dtype=np.uint8)
+    matriz[::2, :] = codigo_camino
+    for numero, fila in enumerate(range(1, lado, 2)):
+        matriz[fila, lado - 1 if numero % 2 == 0 else 0] = codigo_camino
+    return matriz
+
+
+def partida_serpentina(lado, **opciones):
+    """Un enemigo que se mueve cada tick, al final de la serpentina; el
+    jugador se queda quieto en (0, 0)."""
+    grilla = Grilla(serpentina(lado))
+    estado = EstadoJuego(grilla, "escapa", 1, 1, semilla=1, **opciones)
+    ultima = lado - 1
+    estado.enemigos.reubicar(0, ultima, 0 if (ultima // 2) % 2 else ultima)
+    return estado
+
+
+def test_enemigos_no_entran_a_muros():
+    """Las distancias del campo en un laberinto superan por mucho a
+    filas + columnas: igual nunca se elige una vecina bloqueada."""
+    estado = partida_serpentina(31)
+    paso = estado.grilla.paso_enemigo
+    while not estado.terminado() and estado.ticks < 5000:
+        estado.paso()
+        assert paso[estado.enemigos.fila[0], estado.enemigos.col[0]]
+    assert estado.resultado == "derrota"
+
+
+def jugar(estado, max_ticks):
+    """Avanza sin acciones del jugador hasta que termine o pasen max_ticks."""
+    while not estado.terminado() and estado.ticks < max_ticks:
+        estado.paso()
+    return estado
+
+
+def test_enemigo_lejano_sigue_el_campo_completo():
+    """Con el campo acotado a 64 celdas el enemigo empieza muy fuera de él
+    y aun así recorre toda la serpentina hasta el jugador; sin el campo
+    completo se queda contra el primer muro (la línea recta no sirve)."""
+    estado = jugar(partida_serpentina(41, nodos_campo=64), 20000)
+    assert estado.resultado == "derrota"
+
+    estado = jugar(partida_serpentina(41, nodos_campo=64, nodos_completo_por_tick=0), 5000)
+    assert not estado.terminado()
+    assert estado.enemigos.fila[0] >= 38  # No pasó de la última abertura
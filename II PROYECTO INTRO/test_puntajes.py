@@ -0,0 +1,149 @@
+# test_puntajes.py
+
+import sqlite3
+import threading
+import pytest
+import puntajes
+from puntajes import TablaPuntajes, ServicioPuntajes
+
+# Objetivo:
+#   Pruebas de la tabla de puntajes en SQLite y del servicio que guarda
+#   el top en memoria y escribe desde un hilo. Cada prueba usa una base
+#   nueva en una carpeta temporal.
+#     python -m pytest test_puntajes.py
+# Restricciones:
+#   No usa pygame.
+
+
+def crear_servicio(carpeta, **opciones):
+    """Servicio sobre una base nueva dentro de carpeta, sin importar textos."""
+    opciones.setdefault("carpeta_textos", None)
+    return ServicioPuntajes(str(carpeta / "puntajes.db"), **opciones)
+
+
+def test_tabla_ordena_y_desempata_por_antiguedad(tmp_path):
+    tabla = TablaPuntajes(str(tmp_path / "puntajes.db"), carpeta_textos=None)
+    tabla.guardar("ana", 30, "escapa", "facil")
+    tabla.guardar("beto", 50, "escapa", "medio")
+    tabla.guardar("caro", 30, "escapa", "medio")
+    tabla.guardar_varios([("dani", 50, "escapa", "dificil"), ("eva", 10, "cazador", "medio")])
+    assert tabla.top("escapa") == [("beto", 50), ("dani", 50), ("ana", 30), ("caro", 30)]
+    assert tabla.top("escapa", 2) == [("beto", 50), ("dani", 50)]
+    assert tabla.top("escapa", dificultad="medio") == [("beto", 50), ("caro", 30)]
+    assert tabla.top("escapa", nombre="ana") == [("ana", 30)]
+    assert tabla.top("cazador") == [("eva", 10)]
+    assert tabla.cantidad() == 5
+    assert tabla.cantidad("cazador") == 1
+    tabla.cerrar()
+
+
+def test_tabla_importa_textos_una_vez(tmp_path):
+    (tmp_path / "top5_escapa.txt").write_text("ana,40\nsin coma\nbeto,no es número\nde, con coma,25\n",
+                                              encoding="utf-8")
+    (tmp_path / "top5_cazador.txt").write_text("caro,90\n", encoding="utf-8")
+    base = str(tmp_path / "puntajes.db")
+    tabla = TablaPuntajes(base, carpeta_textos=str(tmp_path))
+    assert tabla.top("escapa") == [("ana", 40), ("de, con coma", 25)]
+    assert tabla.top("cazador") == [("caro", 90)]
+    tabla.cerrar()
+
+    # Abrir otra vez no vuelve a importar los mismos archivos
+    tabla = TablaPuntajes(base, carpeta_textos=str(tmp_path))
+    assert tabla.cantidad() == 3
+    tabla.cerrar()
+
+
+def test_sincronizar_desconocido(tmp_path):
+    with pytest.raises(ValueError):
+        TablaPuntajes(str(tmp_path / "puntajes.db"), carpeta_textos=None, sincronizar="A VECES")
+
+
+def test_servicio_top_por_modo(tmp_path):
+    servicio = crear_servicio(tmp_path, capacidad=3)
+    for nombre, puntos, modo in [("ana", 10, "escapa"), ("beto", 30, "escapa"), ("caro", 20, "escapa"),
+                                 ("dani", 30, "escapa"), ("eva", 5, "escapa"), ("fede", 70, "cazador")]:
+        servicio.agregar(nombre, puntos, modo)
+    # Capacidad 3: ana y eva quedan fuera; en empate gana el que llegó antes
+    assert servicio.top("escapa") == [("beto", 30), ("dani", 30), ("caro", 20)]
+    assert servicio.top("escapa", 1) == [("beto", 30)]
+    assert servicio.top("cazador") == [("fede", 70)]
+    servicio.cerrar()
+
+    # Todos llegan a la base, no solo los del top
+    tabla = TablaPuntajes(str(tmp_path / "puntajes.db"), carpeta_textos=None)
+    assert tabla.cantidad("escapa") == 5
+    assert tabla.cantidad("cazador") == 1
+    tabla.cerrar()
+
+
+def test_servicio_carga_lo_guardado(tmp_path):
+    """El top de otra sesión entra a los montículos y, en empate, gana
+    frente a los puntajes nuevos por ser más antiguo."""
+    tabla = TablaPuntajes(str(tmp_path / "puntajes.db"), carpeta_textos=None)
+    tabla.guardar_varios([("ana", 50, "escapa", None), ("beto", 20, "escapa", None),
+                          ("caro", 20, "escapa", None), ("dani", 40, "cazador", None)])
+    tabla.cerrar()
+
+    servicio = crear_servicio(tmp_path, capacidad=3)
+    servicio.agregar("eva", 20, "escapa")
+    servicio.agregar("fede", 60, "escapa")
+    assert servicio.top("escapa") == [("fede", 60), ("ana", 50), ("beto", 20)]
+    assert servicio.top("cazador") == [("dani", 40)]
+    servicio.cerrar()
+
+
+def test_servicio_importa_textos(tmp_path):
+    (tmp_path / "top5_cazador.txt").write_text("ana,15\nbeto,25\n", encoding="utf-8")
+    servicio = crear_servicio(tmp_path, carpeta_textos=str(tmp_path))
+    assert servicio.top("cazador") == [("beto", 25), ("ana", 15)]
+    assert servicio.top("escapa") == []
+    servicio.cerrar()
+
+
+def test_top_espera_la_carga(tmp_path, monkeypatch):
+    """top() no responde hasta que el hilo terminó de cargar lo guardado."""
+    tabla = TablaPuntajes(str(tmp_path / "puntajes.db"), carpeta_textos=None)
+    tabla.guardar("ana", 50, "escapa")
+    tabla.cerrar()
+
+    abrir = threading.Event()
+
+    class TablaLenta(TablaPuntajes):
+        def __init__(self, *argumentos):
+            abrir.wait(5)
+            super().__init__(*argumentos)
+
+    monkeypatch.setattr(puntajes, "TablaPuntajes", TablaLenta)
+    servicio = crear_servicio(tmp_path)
+    respuestas = []
+    consulta = threading.Thread(target=lambda: respuestas.append(servicio.top("escapa")))
+    consulta.start()
+    consulta.join(0.2)
+    assert consulta.is_alive() and not servicio.cargado.is_set()
+
+    abrir.set()
+    consulta.join(5)
+    assert respuestas == [[("ana", 50)]]
+    servicio.cerrar()
+
+
+def test_error_al_abrir_sale_en_cerrar(tmp_path):
+    """Una base que no se puede abrir no deja a top() esperando, y el error
+    sale en cerrar() una sola vez."""
+    servicio = ServicioPuntajes(str(tmp_path), carpeta_textos=None)  # Una carpeta no es una base
+    assert servicio.top("escapa") == []
+    with pytest.raises(sqlite3.Error):
+        servicio.cerrar()
+    servicio.cerrar()
+
+
+def test_error_al_escribir_sale_en_cerrar(tmp_path):
+    base = str(tmp_path / "puntajes.db")
+    servicio = ServicioPuntajes(base, carpeta_textos=None, espera_lote=0)
+    servicio.top("escapa")  # Ya cargó: lo que sigue es escribir
+    otra = sqlite3.connect(base)
+    otra.execute("DROP TABLE puntajes")
+    otra.close()
+    servicio.agregar("ana", 10, "escapa")
+    with pytest.raises(sqlite3.OperationalError):
+        servicio.cerrar()
@@ -0,0 +1,74 @@
+# test_repeticion.py
+
+import numpy as np
+import pytest
+from motor import dificultades
+from repeticion import Repeticion, acciones_codigo, decodificar, reproducir
+
+# Objetivo:
+#   Pruebas del formato de repeticiones: lo que se codifica se lee igual,
+#   y reproducir una grabación da la misma partida que se jugó.
+#     python -m pytest test_repeticion.py
+# Restricciones:
+#   No usa pygame.
+
+
+def nueva_repeticion(semilla, modo="cazador", dificultad="medio"):
+    """Repetición vacía de un mapa chico, como la arma main.py."""
+    cantidad, velocidad = dificultades[dificultad]
+    return Repeticion(semilla, modo, dificultad, 15, 15, "auto", cantidad, velocidad, 30)
+
+
+def jugar_grabando(repeticion, max_ticks=3000):
+    """
+    Juega con acciones al azar (derivadas de la semilla) cada pocos ticks,
+    registrándolas como main.py, y retorna el EstadoJuego final.
+    """
+    rng = np.random.default_rng([repeticion.semilla, 7])
+    estado = repeticion.crear_estado()
+    while not estado.terminado() and estado.ticks < max_ticks:
+        acciones = []
+        if rng.random() < 0.3:
+            acciones.append(acciones_codigo[rng.integers(len(acciones_codigo))])
+        repeticion.registrar(estado.ticks + 1, acciones)
+        estado.paso(acciones)
+    repeticion.terminar(estado.ticks)
+    return estado
+
+
+@pytest.mark.parametrize("modo", ["escapa", "cazador"])
+def test_codificar_decodificar(modo):
+    repeticion = nueva_repeticion(2 ** 64 - 1, modo, "dificil")
+    jugar_grabando(repeticion, 500)
+    leida = decodificar(repeticion.codificar())
+    for atributo in ("semilla", "modo", "dificultad", "filas", "columnas", "algoritmo",
+                     "cantidad_enemigos", "velocidad_enemigos", "ticks_por_segundo", "total_ticks"):
+        assert getattr(leida, atributo) == getattr(repeticion, atributo)
+    assert leida.eventos == repeticion.eventos
+    assert leida.codificar() == repeticion.codificar()
+
+
+@pytest.mark.parametrize("semilla", [0, 5, 123456789])
+def test_reproducir_da_la_misma_partida(semilla):
+    """La partida reproducida desde los bytes termina en el mismo tick, con
+    el mismo resultado, puntuación y posiciones que la original."""
+    repeticion = nueva_repeticion(semilla)
+    original = jugar_grabando(repeticion)
+    assert repeticion.eventos  # La prueba no sirve sin acciones del jugador
+    copia = reproducir(decodificar(repeticion.codificar()))
+    assert copia.ticks == original.ticks
+    assert copia.resultado == original.resultado
+    assert copia.puntuacion == original.puntuacion
+    assert (copia.jugador.fila, copia.jugador.col) == (original.jugador.fila, original.jugador.col)
+    assert np.array_equal(copia.enemigos.fila, original.enemigos.fila)
+    assert np.array_equal(copia.enemigos.col, original.enemigos.col)
+
+
+def test_datos_invalidos():
+    datos = nueva_repeticion(1).codificar()
+    with pytest.raises(ValueError):
+        decodificar(datos[:10])       # Cabecera incompleta
+    with pytest.raises(ValueError):
+        decodificar(datos[:-1])       # Sin marca de fin
+    with pytest.raises(ValueError):
+        decodificar(b"XXXX" + datos[4:])
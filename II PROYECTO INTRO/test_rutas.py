@@ -0,0 +1,120 @@
+# test_rutas.py
+
+import heapq
+import numpy as np
+import pytest
+from laberinto import generar_mapa, construir_grilla
+import rutas
+from rutas import CampoDistancias, factor_huida
+
+# Objetivo:
+#   Pruebas de los campos de distancias de rutas.py. La referencia es
+#   siempre un BFS completo (CampoDistancias.calcular) sobre la máscara
+#   del momento:
+#     python -m pytest test_rutas.py
+# Restricciones:
+#   No usa pygame.
+
+direcciones = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def mascaras(semilla):
+    """Un laberinto generado (sin ciclos) y una máscara al azar (con ciclos)."""
+    rng = np.random.default_rng(semilla)
+    laberinto = construir_grilla(generar_mapa(21, 17, semilla)).paso_enemigo
+    return [laberinto.copy(), rng.random((19, 23)) < 0.7]
+
+
+def recalculo(mascara, origen):
+    """Distancias de un BFS completo sobre la máscara."""
+    return CampoDistancias(mascara).calcular(origen)
+
+
+def celda_transitable(mascara, rng):
+    celdas = np.argwhere(mascara)
+    fila, col = celdas[rng.integers(len(celdas))]
+    return int(fila), int(col)
+
+
+@pytest.mark.parametrize("semilla", range(6))
+def test_campos_guardados_igual_a_recalculo(semilla, monkeypatch):
+    """El jugador camina y vuelve a celdas recientes: el campo y el mapa
+    de huida que se reusan tienen que ser iguales a calcularlos de nuevo."""
+    monkeypatch.setattr(rutas, "max_celdas_guardadas", 2000)  # Que también se olviden campos
+    rng = np.random.default_rng(semilla)
+    for mascara in mascaras(semilla):
+        filas, columnas = mascara.shape
+        campo = CampoDistancias(mascara)
+        origen = celda_transitable(mascara, rng)
+        for _ in range(150):
+            df, dc = direcciones[rng.integers(4)]
+            fila, col = origen[0] + df, origen[1] + dc
+            if 0 <= fila < filas and 0 <= col < columnas and mascara[fila, col]:
+                origen = (fila, col)
+            campo.actualizar(origen)
+            assert campo.distancias == recalculo(mascara, origen)
+            if rng.random() < 0.3:
+                campo.preparar_huida()
+                nuevo = CampoDistancias(mascara)
+                nuevo.actualizar(origen)
+                assert campo.huida == nuevo.calcular_huida()
+        assert campo.celdas_guardadas <= 2000 + filas * columnas
+
+
+@pytest.mark.parametrize("max_nodos", [1, 50, 300])
+def test_campo_acotado_es_exacto(max_nodos):
+    """Con max_nodos se guardan menos celdas, pero con su distancia exacta
+    y completando niveles: ninguna celda cercana queda afuera."""
+    mascara = construir_grilla(generar_mapa(41, 41, 3)).paso_enemigo
+    completo = recalculo(mascara, (0, 0))
+    campo = CampoDistancias(mascara, max_nodos=max_nodos)
+    campo.actualizar((0, 0))
+    assert len(campo.distancias) >= min(max_nodos, len(completo))
+    assert all(completo[nodo] == distancia for nodo, distancia in campo.distancias.items())
+    ultimo_nivel = max(campo.distancias.values())
+    assert all(nodo in campo.distancias for nodo, distancia in completo.items() if distancia <= ultimo_nivel)
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_huida_igual_a_dijkstra(semilla):
+    """El mapa de huida sin heap da lo mismo que Dijkstra con heap."""
+    rng = np.random.default_rng(semilla)
+    for mascara in mascaras(semilla):
+        campo = CampoDistancias(mascara)
+        campo.actualizar(celda_transitable(mascara, rng))
+        campo.preparar_huida()
+
+        esperado = {nodo: -factor_huida * distancia for nodo, distancia in campo.distancias.items()}
+        abiertos = [(valor, nodo) for nodo, valor in esperado.items()]
+        heapq.heapify(abiertos)
+        while abiertos:
+            valor, nodo = heapq.heappop(abiertos)
+            if valor > esperado[nodo]:
+                continue
+            for vecino in campo.vecinos(*divmod(nodo, campo.columnas)):
+                if vecino in esperado and valor + 1 < esperado[vecino]:
+                    esperado[vecino] = valor + 1
+                    heapq.heappush(abiertos, (valor + 1, vecino))
+        assert campo.huida == esperado
+
+
+@pytest.mark.parametrize("presupuesto", [1, 7, 100])
+def test_campo_completo_por_partes(presupuesto):
+    """El campo completo, calculado de a pedazos, es igual a un BFS
+    completo desde donde estaba el jugador cuando empezó."""
+    mascara = construir_grilla(generar_mapa(41, 41, 5)).paso_enemigo
+    columnas = mascara.shape[1]
+    campo = CampoDistancias(mascara, max_nodos=10)
+    campo.actualizar((0, 0))
+    campo.avanzar_completo(presupuesto)
+    assert campo.en_curso is None  # Nadie lo pidió todavía
+    lejos = np.argwhere(mascara)[-1]
+    assert campo.consultar_completo(lejos[:1], lejos[1:]).tolist() == [-1]
+    while campo.completo is None:
+        campo.avanzar_completo(presupuesto)
+        campo.actualizar((0, 1) if campo.origen == (0, 0) else (0, 0))  # El jugador sigue caminando
+    esperado = np.full(mascara.size, -1)
+    for nodo, distancia in recalculo(mascara, campo.origen_completo).items():
+        esperado[nodo] = distancia
+    assert campo.completo.tolist() == esperado.tolist()
+    assert campo.consultar_completo(lejos[:1], lejos[1:]).tolist() == [esperado[lejos[0] * columnas + lejos[1]]]
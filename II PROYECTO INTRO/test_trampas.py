@@ -0,0 +1,74 @@
+# test_trampas.py
+
+import numpy as np
+import pytest
+from trampas import TrampaManager
+
+# Objetivo:
+#   Pruebas del registro de trampas: límite y espera al colocar, el
+#   conjunto de celdas y la capa booleana siempre de acuerdo, y pisadas
+#   igual con capa o sin ella.
+#     python -m pytest test_trampas.py
+# Restricciones:
+#   No usa pygame.
+
+
+def coincide_capa(trampas):
+    """La capa tiene True exactamente en las celdas con trampa."""
+    if trampas.capa is None:
+        return True
+    return set(zip(*(indices.tolist() for indices in np.nonzero(trampas.capa)))) == trampas.trampas
+
+
+def test_limite_y_espera():
+    trampas = TrampaManager(10, 10, limite=2, espera=5)
+    trampas.colocar_trampa(1, 1, 0)
+    assert trampas.hay_trampa(1, 1)
+    trampas.colocar_trampa(2, 2, 4)       # Todavía en espera
+    assert not trampas.hay_trampa(2, 2)
+    trampas.colocar_trampa(2, 2, 5)
+    assert trampas.hay_trampa(2, 2) and trampas.disponibles() == 0
+    trampas.colocar_trampa(3, 3, 100)     # Límite lleno
+    assert not trampas.hay_trampa(3, 3) and len(trampas) == 2
+
+    trampas.eliminar_trampa(1, 1)
+    assert trampas.disponibles() == 1
+    assert trampas.puede_colocar(105) and not trampas.puede_colocar(9)
+    assert coincide_capa(trampas)
+
+
+def test_misma_celda_no_gasta_espera():
+    trampas = TrampaManager(10, 10, limite=3, espera=5)
+    trampas.colocar_trampa(1, 1, 0)
+    trampas.colocar_trampa(1, 1, 10)      # Ya hay una ahí: no cuenta
+    assert len(trampas) == 1 and trampas.ultimo_tiempo == 0
+
+
+@pytest.mark.parametrize("con_capa", [True, False])
+def test_colocar_y_eliminar_varias(con_capa):
+    trampas = TrampaManager(*((10, 10) if con_capa else (None, None)), limite=4, espera=5)
+    filas = np.array([0, 1, 1, 2, 3, 4])
+    cols = np.array([0, 1, 1, 2, 3, 4])
+    # Sin espera entre ellas, las repetidas no cuentan y se corta en el límite
+    assert trampas.colocar_varias(zip(filas, cols)) == 4
+    assert trampas.trampas == {(0, 0), (1, 1), (2, 2), (3, 3)}
+    assert all(type(valor) is int for celda in trampas.trampas for valor in celda)
+    assert trampas.colocar_varias([(5, 5)]) == 0
+    assert coincide_capa(trampas)
+
+    trampas.eliminar_varias(zip(np.array([1, 3, 9]), np.array([1, 3, 9])))
+    assert trampas.trampas == {(0, 0), (2, 2)}
+    assert coincide_capa(trampas)
+    trampas.eliminar_trampa(9, 9)         # Celda sin trampa: no pasa nada
+    assert len(trampas) == 2
+
+
+@pytest.mark.parametrize("con_capa", [True, False])
+def test_pisadas(con_capa):
+    trampas = TrampaManager(*((6, 6) if con_capa else (None, None)), limite=3)
+    trampas.colocar_varias([(0, 1), (2, 3), (5, 5)])
+    filas = np.array([0, 0, 2, 5, 5, 2])
+    cols = np.array([1, 2, 3, 5, 4, 3])
+    esperado = [True, False, True, True, False, True]
+    assert trampas.pisadas(filas, cols).tolist() == esperado
+    assert trampas.pisadas(filas[:0], cols[:0]).tolist() == []
@@ -1,55 +1,116 @@
 # trampas.py
 
-import pygame
-import os
 import time
-
-tam_tile = 25
-img_trampa = None
-
-
-def cargar_imagen_trampa():
-    """Cargar imagen de la trampa."""
-    ruta = os.path.join("assets", "trampa.jpeg")
-    return pygame.image.load(ruta)
+import numpy as np
 
 
 class TrampaManager:
     """
     Objetivo:
-        Controlar cuántas trampas hay, cuándo pueden colocarse,
-        y dibujarlas en pantalla.
+        Controlar cuántas trampas hay y cuándo pueden colocarse
+        (el dibujo está en vista.py).
+        Las trampas se guardan por celda: un conjunto de celdas y, si se
+        conoce el tamaño del mapa, una capa booleana del tamaño del mapa.
+        Así saber si hay trampa en una celda es O(1) y se pueden revisar
+        todos los enemigos de una vez.
+    Entrada:
+        filas, columnas - tamaño del mapa (opcional, activa la capa)
+        limite - máximo de trampas activas
+        espera - segundos entre una trampa y la siguiente
+    Restricciones:
+        Una trampa dura hasta que un enemigo la pisa.
+        Los métodos con espera reciben ahora (segundos); si se omite se
+        usa time.time().
+        El juego pasa el tiempo de simulación para no depender de los FPS.
     """
-    def __init__(self):
-        global img_trampa
-        img_trampa = cargar_imagen_trampa()
-        self.lista_trampas = []
-        self.ultimo_tiempo = 0
+    def __init__(self, filas=None, columnas=None, limite=3, espera=5):
+        self.trampas = set()
+        self.capa = None
+        if filas is not None and columnas is not None:
+            self.capa = np.zeros((filas, columnas), dtype=bool)
+        self.limite = limite
+        self.espera = espera
+        self.ultimo_tiempo = float("-inf")  # La primera trampa no tiene espera
+
+    def __len__(self):
+        return len(self.trampas)
+
+    def disponibles(self):
+        """Cuántas trampas más se pueden tener activas."""
+        return max(0, self.limite - len(self.trampas))
 
-    def puede_colocar(self):
+    def puede_colocar(self, ahora=None):
         """Regresa True si se puede poner una trampa ahora."""
-        if len(self.lista_trampas) >= 3:
+        if ahora is None:
+            ahora = time.time()
+        if len(self.trampas) >= self.limite:
             return False
-        if time.time() - self.ultimo_tiempo < 5:
+        if ahora - self.ultimo_tiempo < self.espera:
             return False
         return True
 
-    def colocar_trampa(self, fila, col):
+    def agregar(self, celda):
+        """Guarda la trampa en la celda (sin revisar límite ni espera)."""
+        self.trampas.add(celda)
+        if self.capa is not None:
+            self.capa[celda] = True
+
+    def colocar_trampa(self, fila, col, ahora=None):
         """Coloca una trampa en la posición dada."""
-        if self.puede_colocar():
-            self.lista_trampas.append((fila, col))
-            self.ultimo_tiempo = time.time()
+        if ahora is None:
+            ahora = time.time()
+        if self.puede_colocar(ahora) and (fila, col) not in self.trampas:
+            self.agregar((fila, col))
+            self.ultimo_tiempo = ahora
+
+    def colocar_varias(self, celdas):
+        """
+        Coloca varias trampas de una vez (sin espera entre ellas),
+        hasta llenar el límite. Retorna cuántas se colocaron.
+        """
+        colocadas = 0
+        for celda in celdas:
+            if len(self.trampas) >= self.limite:
+                break
+            celda = (int(celda[0]), int(celda[1]))
+            if celda not in self.trampas:
+                self.agregar(celda)
+                colocadas += 1
+        return colocadas
 
     def eliminar_trampa(self, fila, col):
         """Elimina una trampa si está en la posición dada."""
-        if (fila, col) in self.lista_trampas:
-            self.lista_trampas.remove((fila, col))
+        if (fila, col) in self.trampas:
+            self.trampas.remove((fila, col))
+            if self.capa is not None:
+                self.capa[fila, col] = False
+
+    def eliminar_varias(self, celdas):
+        """Elimina las trampas de todas las celdas dadas."""
+        for fila, col in celdas:
+            self.eliminar_trampa(int(fila), int(col))
+
+    def hay_trampa(self, fila, col):
+        """Regresa True si hay una trampa en la celda."""
+        return (fila, col) in self.trampas
 
-    def dibujar(self, window):
-        """Dibuja todas las trampas activas."""
-        for fila, col in self.lista_trampas:
-            x = col * tam_tile
-            y = fila * tam_tile
-            img = pygame.transform.scale(img_trampa, (tam_tile, tam_tile))
-            window.blit(img, (x, y))
+    def pisadas(self, filas, cols):
+        """
+        Objetivo:
+            Revisar muchas posiciones a la vez (por ejemplo todos los
+            enemigos de un EnemigoPool).
+        Salida: arreglo booleano, True donde la posición tiene trampa
+        """
+        if self.capa is not None:
+            return self.capa[filas, cols]
+        return np.array([(f, c) in self.trampas for f, c in zip(np.asarray(filas).tolist(),
+                                                                np.asarray(cols).tolist())], dtype=bool)
 
+    def celdas_visibles(self, camara):
+        """Conjunto de celdas con trampa dentro de la vista."""
+        if self.capa is None:
+            return {celda for celda in self.trampas if camara.visible(*celda)}
+        vista = self.capa[camara.fila0:camara.fila0 + camara.filas_vista,
+                          camara.col0:camara.col0 + camara.columnas_vista]
+        filas, cols = np.nonzero(vista)
+        return set(zip((filas + camara.fila0).tolist(), (cols + camara.col0).tolist()))
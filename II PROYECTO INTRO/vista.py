@@ -0,0 +1,80 @@
+# vista.py
+
+import pygame
+from recursos import obtener_sprite
+from mapa import tam_tile, crear_fondo_mapa, restaurar_celdas
+
+# Objetivo:
+#   Dibujar con pygame el estado de una partida (motor.EstadoJuego).
+#   La vista no cambia el estado: solo lo lee. Cada frame copia desde
+#   un fondo pre-renderizado las celdas que cambiaron y dibuja encima
+#   trampas, enemigos y jugador (ver restaurar_celdas en mapa.py).
+# Restricciones:
+#   Necesita una ventana creada con pygame.display.set_mode.
+
+
+class VistaJuego:
+    """
+    Objetivo:
+        Dibujar el mapa y las entidades de un EstadoJuego en la ventana,
+        solo en la región de la cámara.
+    """
+    def __init__(self, ventana, estado, camara):
+        self.ventana = ventana
+        self.estado = estado
+        self.camara = camara
+
+        # Imágenes compartidas, ya del tamaño del tile (del paquete de
+        # assets si existe; si no, cada JPEG se decodifica una sola vez)
+        self.sprite_jugador = obtener_sprite("jugador.jpeg", tam_tile)
+        self.sprite_enemigo = obtener_sprite("enemigo.jpeg", tam_tile)
+        self.sprite_trampa = obtener_sprite("trampa.jpeg", tam_tile)
+
+        self.rect_vista = pygame.Rect(0, 0, camara.ancho, camara.alto)
+        self.celdas_previas = set()  # Celdas ocupadas por entidades en el frame anterior
+        self.fondo = None
+
+    def rehacer_fondo(self):
+        """Vuelve a pre-renderizar la vista del mapa y la copia a la ventana."""
+        salida_fila, salida_col = self.estado.salida
+        self.fondo = crear_fondo_mapa(self.estado.grilla, salida_fila, salida_col, self.camara)
+        self.ventana.blit(self.fondo, (0, 0))
+        self.celdas_previas = set()
+
+    def iniciar(self):
+        """Centra la cámara en el jugador y dibuja el fondo completo."""
+        jugador = self.estado.jugador
+        self.camara.centrar(jugador.fila, jugador.col)
+        self.rehacer_fondo()
+
+    def dibujar(self):
+        """
+        Objetivo:
+            Dibujar solo lo que cambió en la zona del mapa.
+        Salida: lista de rectángulos modificados, para display.update
+        """
+        estado = self.estado
+        camara = self.camara
+        ventana = self.ventana
+
+        # 1. Si la cámara se desplazó, rehacer el fondo de la vista (costo según la pantalla)
+        if camara.seguir(estado.jugador.fila, estado.jugador.col):
+            self.rehacer_fondo()
+            rects_sucios = [self.rect_vista]
+        else:
+            rects_sucios = []
+
+        # 2. Borrar entidades del frame anterior y limpiar sus nuevas celdas
+        celdas_trampas = estado.trampas.celdas_visibles(camara)
+        celdas_enemigos = estado.enemigos.celdas_visibles(camara)
+        celdas_actuales = {(estado.jugador.fila, estado.jugador.col)} | celdas_trampas | celdas_enemigos
+        rects_sucios += restaurar_celdas(ventana, self.fondo, self.celdas_previas | celdas_actuales, camara)
+        self.celdas_previas = celdas_actuales
+
+        # 3. Entidades visibles en orden: trampas, enemigos, jugador (sobre otros)
+        ventana.blits([(self.sprite_trampa, camara.a_pantalla(fila, col))
+                       for fila, col in celdas_trampas], False)
+        ventana.blits([(self.sprite_enemigo, camara.a_pantalla(fila, col))
+                       for fila, col in celdas_enemigos], False)
+        ventana.blit(self.sprite_jugador, camara.a_pantalla(estado.jugador.fila, estado.jugador.col))
+        return rects_sucios